@@ -3,8 +3,9 @@ from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from sqlalchemy.orm import Session
 from app.db.session import SessionLocal
-from app.db.models import User
+from app.db.models import User, Patient
 from app.core.config import settings
+from app.core.executors import run_db
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
@@ -35,8 +36,43 @@ async def get_current_user(
         print(f"❌ JWT decode error: {e}")  # ← Add this
         raise credentials_exception
     
-    user = db.query(User).filter(User.id == int(user_id)).first()
+    # Sync SQLAlchemy query: keep it off the event loop
+    user = await run_db(lambda: db.query(User).filter(User.id == int(user_id)).first())
     if user is None:
         print(f"❌ User not found: {user_id}")  # ← Add this
         raise credentials_exception
-    return user
\ No newline at end of file
+    return user
+
+async def get_current_admin(current_user: User = Depends(get_current_user)):
+    """Only users with the "admin" role (operations, e.g. model management)."""
+    if current_user.role != "admin":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Access denied: Admins only")
+    return current_user
+
+def resolve_patient_id(current_user: User, patient_id: int | None) -> int | None:
+    """
+    Work out which patient an upload belongs to.
+    - Patients without an explicit patient_id are auto-linked to their own profile
+    - An explicit patient_id must exist, and patients may only use their own
+    """
+    db = SessionLocal()
+    try:
+        # 🧩 Auto-link to user's patient if patient_id not provided
+        if current_user.role == "patient" and not patient_id:
+            patient = db.query(Patient).filter(Patient.user_id == current_user.id).first()
+            if patient:
+                patient_id = patient.id
+                print(f"🔗 Auto-linked patient ID: {patient_id}")
+
+        # Validate patient_id if provided
+        if patient_id:
+            patient = db.query(Patient).filter(Patient.id == patient_id).first()
+            if not patient:
+                raise HTTPException(status_code=404, detail="Patient not found")
+
+            # Patients can only upload to their own profile
+            if current_user.role == "patient" and patient.user_id != current_user.id:
+                raise HTTPException(status_code=403, detail="Invalid patient ID")
+    finally:
+        db.close()
+    return patient_id
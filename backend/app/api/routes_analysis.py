@@ -1,18 +1,21 @@
 from fastapi import APIRouter, File, UploadFile, HTTPException, Depends, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from app.utils.text_cleaner import clean_text, extract_structured_fields
-from app.utils.report_analyzer import analyze_report
 from app.db.session import SessionLocal
 from app.db.models import ReportLog, Patient, User
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, resolve_patient_id
+from app.api.sse import SSE_HEADERS, sse_event
+from app.services.ocr_cache import ocr_cache
+from app.api.uploads import spool_upload, read_upload
+from app.services.report_pipeline import (
+    analyze_text, extract_text, extract_text_from_path, patient_profile, process_report_batch,
+    report_response, save_report_log, stream_report_file
+)
+from app.core.config import settings
+from app.core.executors import iterate_ocr, run_batch, run_db, run_ml, run_ocr
 from sqlalchemy.orm import Session
-import pytesseract
-import easyocr
-import io
-from PIL import Image
 import json
-import numpy as np
-from pdf2image import convert_from_bytes
+import os
 
 router = APIRouter()
 
@@ -25,26 +28,9 @@ async def analyze_report_endpoint(
     current_user: User = Depends(get_current_user)
 ):
     try:
-        cleaned = clean_text(report.text)
-        structured = extract_structured_fields(cleaned)
-        results = analyze_report(structured)
-
-        db = SessionLocal()
-        try:
-            log = ReportLog(
-                filename="raw_text_input",
-                raw_text=report.text,
-                cleaned_text=cleaned,
-                structured_output=json.dumps(structured),
-                analysis=json.dumps(results),
-                patient_id=None  # No patient for raw text
-            )
-            db.add(log)
-            db.commit()
-            db.refresh(log)
-            print(f"✅ Saved raw text log ID: {log.id}")
-        finally:
-            db.close()
+        cleaned, structured, results = await run_ml(analyze_text, report.text)
+        log = await run_db(save_report_log, "raw_text_input", report.text, cleaned, structured, results, None)  # No patient for raw text
+        print(f"✅ Saved raw text log ID: {log.id}")
 
         return {
             "raw_text": report.text,
@@ -65,95 +51,128 @@ async def clean_and_analyze(
     current_user: User = Depends(get_current_user)
 ):
     print("🚀 NEW CODE: File upload endpoint triggered!")
-    contents = await file.read()
+    # 💾 Streaming mode spools the upload to disk instead of holding it in RAM
+    if settings.UPLOAD_STREAMING:
+        spool_path, digest = await spool_upload(file)
+    else:
+        contents = await read_upload(file)
 
     try:
         print(f"📄 Uploading file: '{file.filename}'")
         print(f"🩺 Patient ID (before auto-link): {patient_id}")
         print(f"👤 User role: {current_user.role}")
 
-        db = SessionLocal()
-        try:
-            # 🧩 Auto-link to user's patient if patient_id not provided
-            if current_user.role == "patient" and not patient_id:
-                patient = db.query(Patient).filter(Patient.user_id == current_user.id).first()
-                if patient:
-                    patient_id = patient.id
-                    print(f"🔗 Auto-linked patient ID: {patient_id}")
-
-            # Validate patient_id if provided
-            if patient_id:
-                patient = db.query(Patient).filter(Patient.id == patient_id).first()
-                if not patient:
-                    raise HTTPException(status_code=404, detail="Patient not found")
-                
-                # Patients can only upload to their own profile
-                if current_user.role == "patient" and patient.user_id != current_user.id:
-                    raise HTTPException(status_code=403, detail="Invalid patient ID")
-        finally:
-            db.close()
+        patient_id = await run_db(resolve_patient_id, current_user, patient_id)
+        filename = file.filename or "unnamed_file"
 
-        # 🧠 Handle PDF or image input
-        if file.filename.lower().endswith(".pdf"):
-            print("📄 Converting PDF to images...")
-            images = convert_from_bytes(contents)
-            raw_text = ""
-            for img in images:
-                if use_easyocr:
-                    reader = easyocr.Reader(["en"], gpu=False)
-                    result = reader.readtext(np.array(img))
-                    text = " ".join([res[1] for res in result])
-                else:
-                    text = pytesseract.image_to_string(img)
-                raw_text += text + "\n"
+        # Each stage runs on its own pool, never on the event loop
+        if settings.UPLOAD_STREAMING:
+            raw_text, pages = await run_ocr(extract_text_from_path, spool_path, filename, digest, use_easyocr)
         else:
-            image = Image.open(io.BytesIO(contents))
-            if use_easyocr:
-                reader = easyocr.Reader(["en"], gpu=False)
-                result = reader.readtext(np.array(image))
-                raw_text = " ".join([res[1] for res in result])
-            else:
-                raw_text = pytesseract.image_to_string(image)
-
+            raw_text, pages = await run_ocr(extract_text, contents, filename, use_easyocr)
         print(f"🔤 Extracted text (first 200 chars): {raw_text[:200]}...")
 
-        cleaned = clean_text(raw_text)
-        structured = extract_structured_fields(cleaned)
-        results = analyze_report(structured)
+        profile = await run_db(patient_profile, patient_id)
+        cleaned, structured, results = await run_ml(analyze_text, raw_text, **profile)
+        log = await run_db(save_report_log, filename, raw_text, cleaned, structured, results, patient_id)
+        print(f"✅ Saved uploaded file log ID: {log.id} for patient ID: {log.patient_id}")
+        return report_response(raw_text, pages, cleaned, structured, results, log)
 
-        db = SessionLocal()
-        try:
-            log = ReportLog(
-                filename=file.filename or "unnamed_file",
-                raw_text=raw_text,
-                cleaned_text=cleaned,
-                structured_output=json.dumps(structured),
-                analysis=json.dumps(results),
-                patient_id=patient_id  # ← Link to patient
-            )
-            db.add(log)
-            db.commit()
-            db.refresh(log)
-            print(f"✅ Saved uploaded file log ID: {log.id} for patient ID: {log.patient_id}")
-        finally:
-            db.close()
+    except Exception as e:
+        print(f"❌ Error in /clean_and_analyze: {e}")
+        raise HTTPException(status_code=500, detail=f"Pipeline error: {str(e)}")
+    finally:
+        if settings.UPLOAD_STREAMING:
+            os.remove(spool_path)
+
+
+@router.post("/clean_and_analyze/batch")
+async def clean_and_analyze_batch(
+    files: list[UploadFile] = File(...),
+    patient_id: int | None = Query(None, description="Link all reports to this patient"),
+    use_easyocr: bool = False,
+    current_user: User = Depends(get_current_user)
+):
+    """Upload a patient's folder of reports in one request; results are per file."""
+    if len(files) > settings.BATCH_MAX_FILES:
+        raise HTTPException(status_code=400, detail=f"At most {settings.BATCH_MAX_FILES} files per batch")
 
+    # Validate the patient once for the whole batch
+    patient_id = await run_db(resolve_patient_id, current_user, patient_id)
+
+    spooled = []
+    try:
+        for file in files:
+            spool_path, digest = await spool_upload(file)
+            spooled.append((spool_path, file.filename or "unnamed_file", digest))
+
+        # The coordinator waits on the batch OCR pool; keep it off the "ocr" pool single uploads use
+        results = await run_batch(process_report_batch, spooled, patient_id=patient_id, use_easyocr=use_easyocr)
         return {
-            "raw_text": raw_text,
-            "cleaned_text": cleaned,
-            "structured_output": structured,
-            "analysis": results,
-            "log_id": log.id,
-            "patient_id": log.patient_id,
+            "patient_id": patient_id,
+            "processed": sum(1 for r in results if r["status"] == "ok"),
+            "failed": sum(1 for r in results if r["status"] == "error"),
+            "results": results,
         }
-
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"❌ Error in /clean_and_analyze: {e}")
+        print(f"❌ Error in /clean_and_analyze/batch: {e}")
         raise HTTPException(status_code=500, detail=f"Pipeline error: {str(e)}")
+    finally:
+        for spool_path, _, _ in spooled:
+            os.remove(spool_path)
+
+
+@router.post("/clean_and_analyze/stream")
+async def clean_and_analyze_stream(
+    file: UploadFile = File(...),
+    patient_id: int | None = Query(None, description="Link report to patient"),
+    use_easyocr: bool = False,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Server-sent-events variant of /clean_and_analyze.
+    Events: page (per-page text), partial (fields so far), analysis, done, error.
+    """
+    spool_path, digest = await spool_upload(file)
+    try:
+        patient_id = await run_db(resolve_patient_id, current_user, patient_id)
+    except HTTPException:
+        os.remove(spool_path)
+        raise
+    filename = file.filename or "unnamed_file"
+
+    async def event_stream():
+        # Each page is read on the OCR pool, off the event loop
+        try:
+            async for event, data in iterate_ocr(stream_report_file(
+                spool_path, filename, digest, patient_id=patient_id, use_easyocr=use_easyocr
+            )):
+                yield sse_event(event, data)
+        except Exception as e:
+            print(f"❌ Error in /clean_and_analyze/stream: {e}")
+            yield sse_event("error", {"detail": f"Pipeline error: {str(e)}"})
+        finally:
+            os.remove(spool_path)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
+
+@router.get("/ocr_cache/stats")
+async def ocr_cache_stats(
+    current_user: User = Depends(get_current_user)
+):
+    """Hit/miss/eviction counters for sizing the OCR result cache."""
+    return ocr_cache.stats()
 
 
 @router.get("/logs")
-async def fetch_logs(
+def fetch_logs(
     current_user: User = Depends(get_current_user)
 ):
     try:
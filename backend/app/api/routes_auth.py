@@ -1,4 +1,5 @@
 from datetime import timedelta
+from typing import Literal
 from fastapi import APIRouter, HTTPException, Depends, status
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
@@ -13,7 +14,8 @@ router = APIRouter()
 class UserCreate(BaseModel):
     email: str
     password: str
-    role: str = "patient"
+    # Self-service roles only; admins are created with app/db/create_admin.py
+    role: Literal["patient", "doctor"] = "patient"
 
 class UserLogin(BaseModel):
     email: str
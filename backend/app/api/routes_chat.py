@@ -1,6 +1,11 @@
+import asyncio
+import threading
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from app.utils.genai_service import generate_health_response
+from app.api.sse import SSE_HEADERS, sse_event
+from app.core.executors import run_db, run_llm
+from app.utils.genai_service import FALLBACK_RESPONSE, generate_health_response, stream_health_response
 from app.db.session import SessionLocal
 from app.db.models import Patient
 
@@ -10,26 +15,77 @@ class ChatMessage(BaseModel):
     message: str
     patient_id: int | None = None  # Optional patient context
 
+
+def _patient_context(patient_id: int | None) -> str:
+    if not patient_id:
+        return ""
+    db = SessionLocal()
+    try:
+        patient = db.query(Patient).filter(Patient.id == patient_id).first()
+        return f"Patient: {patient.name}, Age: {patient.age}, Gender: {patient.gender}" if patient else ""
+    finally:
+        db.close()
+
+
 @router.post("/chat")
 def chat(message: ChatMessage):
     try:
         # Get patient context if provided
-        patient_context = ""
-        if message.patient_id:
-            db = SessionLocal()
-            try:
-                patient = db.query(Patient).filter(Patient.id == message.patient_id).first()
-                if patient:
-                    patient_context = f"Patient: {patient.name}, Age: {patient.age}, Gender: {patient.gender}"
-            finally:
-                db.close()
+        patient_context = _patient_context(message.patient_id)
 
         # Generate GenAI response
         response = generate_health_response(message.message, patient_context)
         return {"response": response}
-    
+
     except Exception as e:
         print(f"❌ GenAI error: {e}")
         return {
             "response": "I'm experiencing technical difficulties. For health concerns, please consult a doctor directly."
-        }
\ No newline at end of file
+        }
+
+
+@router.post("/chat/stream")
+async def chat_stream(message: ChatMessage):
+    """
+    Server-sent-events variant of /chat: tokens are sent as llama.cpp produces them.
+    Events: token ({"text"}), done (tokens, time_to_first_token_ms, tokens_per_sec, ...), error.
+    Closing the connection stops generation after the current token.
+    """
+    if not message.message.strip():
+        raise HTTPException(status_code=400, detail="Message is empty")
+    patient_context = await run_db(_patient_context, message.patient_id)
+
+    loop = asyncio.get_running_loop()
+    events = asyncio.Queue()
+    cancel = threading.Event()
+
+    def generate():
+        # Runs on the bounded LLM pool and holds a worker for the whole generation;
+        # further streams wait in the pool's queue
+        try:
+            for event, data in stream_health_response(message.message, patient_context, cancel):
+                loop.call_soon_threadsafe(events.put_nowait, (event, data))
+        except Exception as e:
+            print(f"❌ GenAI stream error: {e}")
+            loop.call_soon_threadsafe(events.put_nowait, ("error", {"detail": str(e), "response": FALLBACK_RESPONSE}))
+        finally:
+            loop.call_soon_threadsafe(events.put_nowait, None)
+
+    async def event_stream():
+        producer = asyncio.ensure_future(run_llm(generate))
+        try:
+            while (item := await events.get()) is not None:
+                event, data = item
+                if event == "done":
+                    print(
+                        f"💬 Chat stream: {data['tokens']} tokens, first token {data['time_to_first_token_ms']} ms, "
+                        f"{data['tokens_per_sec']} tok/s ({data['finish_reason']})"
+                    )
+                yield sse_event(event, data)
+        finally:
+            # Client disconnected (the response task is cancelled) or the stream ended:
+            # a queued generation is dropped, a running one stops after the current token
+            cancel.set()
+            producer.cancel()
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
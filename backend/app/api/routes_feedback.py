@@ -1,7 +1,6 @@
-from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from app.db.session import SessionLocal
+from app.db import log_sink
 from app.db.models import FeedbackLog
 
 router = APIRouter()
@@ -14,15 +13,8 @@ class FeedbackRequest(BaseModel):
     report_log_id: int | None = None
     symptom_log_id: int | None = None
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 @router.post("/feedback")
-def submit_feedback(feedback: FeedbackRequest, db: Session = Depends(get_db)):
+def submit_feedback(feedback: FeedbackRequest):
     try:
         # Validate log_type
         if feedback.log_type not in ["symptom", "report"]:
@@ -42,12 +34,10 @@ def submit_feedback(feedback: FeedbackRequest, db: Session = Depends(get_db)):
             report_log_id=feedback.report_log_id,
             symptom_log_id=feedback.symptom_log_id
         )
-        db.add(feedback_log)
-        db.commit()
-        db.refresh(feedback_log)
+        # Batched with other log writes; returns once the row is committed and has its id
+        feedback_log = log_sink.write(feedback_log).result()
         
         return {"message": "Feedback recorded successfully", "feedback_id": feedback_log.id}
     
     except Exception as e:
-        db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to record feedback: {str(e)}")
\ No newline at end of file
@@ -0,0 +1,87 @@
+from fastapi import APIRouter, File, UploadFile, HTTPException, Depends, Query
+from fastapi.responses import JSONResponse
+import os
+from app.db.models import User
+from app.api.deps import get_current_user, resolve_patient_id
+from app.api.uploads import spool_upload
+from app.core.config import settings
+from app.core.executors import run_db
+from app.services.job_queue import get_broker, enqueue_report, DONE, FAILED
+
+router = APIRouter()
+
+
+async def _get_own_job(job_id: str, current_user: User) -> dict:
+    job = await run_db(get_broker().get, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    # Doctors can see every job, patients only their own
+    if current_user.role != "doctor" and job["payload"].get("user_id") != current_user.id:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.post("/jobs/clean_and_analyze", status_code=202)
+async def submit_report_job(
+    file: UploadFile = File(...),
+    patient_id: int | None = Query(None, description="Link report to patient"),
+    use_easyocr: bool = False,
+    current_user: User = Depends(get_current_user)
+):
+    """Queue an upload for background OCR + analysis and return its job id right away."""
+    # Spool straight into the job spool dir; the worker reads it from there
+    spool_path, digest = await spool_upload(file, spool_dir=settings.JOB_SPOOL_DIR)
+    try:
+        patient_id = await run_db(resolve_patient_id, current_user, patient_id)
+    except HTTPException:
+        os.remove(spool_path)
+        raise
+
+    try:
+        job_id = await run_db(
+            enqueue_report,
+            spool_path,
+            digest,
+            file.filename or "unnamed_file",
+            patient_id=patient_id,
+            use_easyocr=use_easyocr,
+            user_id=current_user.id,
+        )
+    except Exception as e:
+        os.remove(spool_path)
+        print(f"❌ Failed to queue report job: {e}")
+        raise HTTPException(status_code=500, detail=f"Queue error: {str(e)}")
+
+    print(f"📥 Queued report job {job_id} for patient ID: {patient_id}")
+    return {"job_id": job_id, "status": "queued"}
+
+
+@router.get("/jobs/{job_id}")
+async def get_job_status(
+    job_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    job = await _get_own_job(job_id, current_user)
+    return {
+        "job_id": job["id"],
+        "status": job["status"],
+        "filename": job["payload"].get("filename"),
+        "patient_id": job["payload"].get("patient_id"),
+        "error": job["error"],
+        "created_at": job["created_at"],
+        "updated_at": job["updated_at"],
+    }
+
+
+@router.get("/jobs/{job_id}/result")
+async def get_job_result(
+    job_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    """Same body as /cv/clean_and_analyze once done; 202 while queued/running."""
+    job = await _get_own_job(job_id, current_user)
+    if job["status"] == DONE:
+        return job["result"]
+    if job["status"] == FAILED:
+        raise HTTPException(status_code=500, detail=f"Pipeline error: {job['error']}")
+    return JSONResponse(status_code=202, content={"job_id": job["id"], "status": job["status"]})
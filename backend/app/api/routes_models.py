@@ -0,0 +1,67 @@
+from fastapi import APIRouter, Depends, HTTPException
+from pydantic import BaseModel
+from app.api.deps import get_current_admin
+from app.db.models import User
+from app.ml.batcher import batcher_stats
+from app.ml.model_store import handles, model_watcher, registry
+from ml.registry import RegistryError
+
+router = APIRouter()
+
+
+class PinRequest(BaseModel):
+    version: str
+
+
+def _model_state(name: str, entry: dict | None) -> dict:
+    loaded = next((h.status() for h in handles() if h.name == name), None)
+    return {
+        "name": name,
+        "current": entry.get("current") if entry else None,
+        "pinned": entry.get("pinned", False) if entry else False,
+        "versions": entry.get("versions", []) if entry else [],
+        # What this API process serves right now ("legacy" = un-versioned file)
+        "loaded_version": loaded["loaded_version"] if loaded else None,
+        "failed_version": loaded["failed_version"] if loaded else None,
+    }
+
+
+def _change(name: str, action, *args) -> dict:
+    try:
+        entry = action(name, *args)
+    except RegistryError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    # Load in the background; requests keep using the old version until the swap
+    model_watcher.trigger()
+    return _model_state(name, entry)
+
+
+@router.get("")
+def list_models(current_user: User = Depends(get_current_admin)):
+    manifest = registry.models()
+    names = list(manifest) + [h.name for h in handles() if h.name not in manifest]
+    return {"models": [_model_state(name, manifest.get(name)) for name in names]}
+
+
+@router.get("/batching")
+def batching_stats(current_user: User = Depends(get_current_admin)):
+    """Batch fill and queueing delay per batcher (models and the DB log sink), for tuning window and size."""
+    return {"batchers": batcher_stats()}
+
+
+@router.post("/{name}/pin")
+def pin_model(name: str, request: PinRequest, current_user: User = Depends(get_current_admin)):
+    """Serve a specific version, ignoring newer publishes until unpinned."""
+    return _change(name, registry.pin, request.version)
+
+
+@router.post("/{name}/unpin")
+def unpin_model(name: str, current_user: User = Depends(get_current_admin)):
+    """Follow the latest published version again."""
+    return _change(name, registry.unpin)
+
+
+@router.post("/{name}/rollback")
+def rollback_model(name: str, current_user: User = Depends(get_current_admin)):
+    """Pin the version before the current one."""
+    return _change(name, registry.rollback)
@@ -1,42 +1,88 @@
 import pickle
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.db.session import SessionLocal  # ✅ Same as report route
+import numpy as np
+from fastapi import APIRouter, HTTPException
+from app.db import log_sink                # ✅ Same DB as reports, written in batches
 from app.db.models import SymptomLog       # ✅ Defined in models.py
+from app.core.config import settings
+from app.ml.batcher import MicroBatcher
+from app.ml.flat_forest import FLAT_FOREST_MAX_ROWS
+from app.ml.mapped_artifacts import load_mapped
+from app.ml.model_store import ModelHandle
+from app.ml.prediction_cache import PredictionCache, canonical_symptoms
 from pydantic import BaseModel
 
 router = APIRouter()
 
-# ✅ Load model ONCE at startup
+# ✅ Loaded once, on first use (or by the startup warm-up); later versions from the model registry are hot-swapped in
 MODEL_PATH = "ml/models/symptom_model.pkl"
-vectorizer = None
-model = None
 
-try:
-    with open(MODEL_PATH, "rb") as f:
+
+def _load_symptom_model(path: str) -> dict:
+    # Memory-mapped export (shared between worker processes) when present; the pickle isn't read at all
+    mapped = load_mapped(path)
+    if mapped is not None and mapped["vectorizer"] is not None:
+        return {"vectorizer": mapped["vectorizer"], "model": mapped["model"], "flat_model": mapped["model"]}
+
+    # Not exported yet (see ml/training/export_forests.py): plain sklearn
+    with open(path, "rb") as f:
         vectorizer, model = pickle.load(f)
-    print("✅ Symptom prediction model loaded successfully.")
-except Exception as e:
-    print(f"❌ Failed to load model from {MODEL_PATH}: {e}")
+    return {"vectorizer": vectorizer, "model": model, "flat_model": None}
+
+
+symptom_model = ModelHandle("symptom_model", MODEL_PATH, _load_symptom_model)
+
+
+def _classifier(bundle: dict, rows: int):
+    # Flattened forest skips sklearn's per-call overhead; sklearn is faster on big batches
+    if bundle["flat_model"] is not None and rows <= FLAT_FOREST_MAX_ROWS:
+        return bundle["flat_model"]
+    return bundle["model"]
+
+
+def _predict_symptoms(texts: list[str]) -> list[str]:
+    """One vectorizer.transform + predict for a whole micro-batch of requests."""
+    bundle = symptom_model.get()  # one consistent version for the batch, even if a reload lands meanwhile
+    if bundle is None:
+        raise RuntimeError("Symptom model not available")
+    X = bundle["vectorizer"].transform(texts)
+    return list(_classifier(bundle, len(texts)).predict(X))
+
+
+def top_k_predictions(bundle: dict, texts: list[str], k: int) -> list[list[dict]]:
+    """One transform + predict_proba for all texts → k most likely diseases per text, best first."""
+    X = bundle["vectorizer"].transform(texts)
+    classifier = _classifier(bundle, len(texts))
+    proba = np.asarray(classifier.predict_proba(X))
+    classes = np.asarray(classifier.classes_)
+    k = min(k, len(classes))
+    # Top k per row without a full sort, then order those k
+    top = np.argpartition(-proba, k - 1, axis=1)[:, :k]
+    order = np.take_along_axis(proba, top, axis=1).argsort(axis=1)[:, ::-1]
+    top = np.take_along_axis(top, order, axis=1)
+    return [
+        [{"disease": str(classes[j]), "probability": round(float(row[j]), 4)} for j in indexes]
+        for row, indexes in zip(proba, top)
+    ]
+
+
+symptom_batcher = MicroBatcher("symptom_model", _predict_symptoms)
+
+# Intake forms repeat the same symptom sets; emptied when the model version changes
+prediction_cache = PredictionCache(settings.SYMPTOM_CACHE_ENTRIES)
 
 
 class SymptomRequest(BaseModel):
     symptoms: str
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+class SymptomBatchRequest(BaseModel):
+    symptoms: list[str]
+    top_k: int = 3
 
 
 @router.post("/predict")
-def predict_symptom(request: SymptomRequest, db: Session = Depends(get_db)):
-    global vectorizer, model
-
-    if vectorizer is None or model is None:
+def predict_symptom(request: SymptomRequest):
+    if symptom_model.get() is None:
         raise HTTPException(status_code=500, detail="Symptom model not available")
 
     try:
@@ -44,18 +90,66 @@ def predict_symptom(request: SymptomRequest, db: Session = Depends(get_db)):
         if not symptoms_text:
             raise HTTPException(status_code=400, detail="Symptoms text is empty")
 
-        # Predict
-        X = vectorizer.transform([symptoms_text])
-        prediction = model.predict(X)[0]
+        # Cached per model version under the normalised tokens, batched with concurrent requests
+        key = canonical_symptoms(symptoms_text)
+        prediction = prediction_cache.predict(
+            key, symptom_model.version, lambda: symptom_batcher.predict(symptoms_text)
+        )
 
-        # Save to same DB as reports
-        log = SymptomLog(symptoms=symptoms_text, predicted_disease=prediction)
-        db.add(log)
-        db.commit()
-        db.refresh(log)
+        # Save to same DB as reports; no id in the response, so don't wait for the write
+        log_sink.write(SymptomLog(symptoms=symptoms_text, predicted_disease=str(prediction)))
 
         return {"prediction": prediction}
 
     except Exception as e:
         print(f"❌ Symptom prediction error: {e}")
-        raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
+
+
+@router.get("/cache/stats")
+def prediction_cache_stats():
+    """Hit ratio and inference time saved by the /predict cache."""
+    return prediction_cache.stats()
+
+
+@router.post("/predict_batch")
+def predict_symptom_batch(request: SymptomBatchRequest):
+    """
+    Screen many symptom descriptions at once: one transform + predict_proba
+    for the whole list, top_k diseases with probabilities per input, and all
+    SymptomLog rows written in one bulk insert and transaction. Results are
+    in input order.
+    """
+    texts = [text.strip() for text in request.symptoms]
+    if not texts:
+        raise HTTPException(status_code=400, detail="No symptoms provided")
+    if len(texts) > settings.SYMPTOM_BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {settings.SYMPTOM_BATCH_MAX_ITEMS} inputs per batch")
+    empty = [i for i, text in enumerate(texts) if not text]
+    if empty:
+        raise HTTPException(status_code=400, detail=f"Symptoms text is empty at index {empty}")
+    if request.top_k < 1:
+        raise HTTPException(status_code=400, detail="top_k must be at least 1")
+
+    bundle = symptom_model.get()  # one model version for the whole batch
+    if bundle is None:
+        raise HTTPException(status_code=500, detail="Symptom model not available")
+
+    try:
+        ranked = top_k_predictions(bundle, texts, request.top_k)
+
+        logs = log_sink.write_all(
+            [SymptomLog(symptoms=text, predicted_disease=top[0]["disease"]) for text, top in zip(texts, ranked)]
+        )
+        log_ids = [log.id for log in logs]
+
+        return {
+            "results": [
+                {"symptoms": text, "prediction": top[0]["disease"], "top_k": top, "log_id": log_id}
+                for text, top, log_id in zip(texts, ranked, log_ids)
+            ]
+        }
+
+    except Exception as e:
+        print(f"❌ Batch symptom prediction error: {e}")
+        raise HTTPException(status_code=500, detail=f"Batch prediction failed: {str(e)}")
@@ -0,0 +1,10 @@
+# backend/app/api/sse.py
+"""Server-sent events helpers shared by the streaming endpoints."""
+import json
+
+# Keep proxies (nginx) from buffering the stream
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
@@ -0,0 +1,50 @@
+# backend/app/api/uploads.py
+import hashlib
+import os
+import tempfile
+
+from fastapi import HTTPException, UploadFile
+
+from app.core.config import settings
+
+
+def _too_large():
+    return HTTPException(status_code=413, detail=f"File exceeds the {settings.MAX_UPLOAD_MB} MB upload limit")
+
+
+async def spool_upload(file: UploadFile, spool_dir: str | None = None) -> tuple[str, str]:
+    """
+    Copy an upload to a temp file in fixed-size chunks.
+    Returns (path, sha256 hex digest); the caller deletes the file.
+    Raises 413 as soon as the upload passes MAX_UPLOAD_MB.
+    """
+    max_bytes = settings.MAX_UPLOAD_MB * 1024 * 1024
+    chunk_size = settings.UPLOAD_CHUNK_KB * 1024
+    spool_dir = spool_dir or settings.UPLOAD_SPOOL_DIR or None
+    if spool_dir:
+        os.makedirs(spool_dir, exist_ok=True)
+
+    ext = os.path.splitext(file.filename or "")[1].lower()
+    digest = hashlib.sha256()
+    size = 0
+    fd, path = tempfile.mkstemp(suffix=ext, dir=spool_dir)
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while chunk := await file.read(chunk_size):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise _too_large()
+                digest.update(chunk)
+                out.write(chunk)
+    except BaseException:
+        os.remove(path)
+        raise
+    return path, digest.hexdigest()
+
+
+async def read_upload(file: UploadFile) -> bytes:
+    """Read a whole upload into memory, still enforcing MAX_UPLOAD_MB."""
+    contents = await file.read(settings.MAX_UPLOAD_MB * 1024 * 1024 + 1)
+    if len(contents) > settings.MAX_UPLOAD_MB * 1024 * 1024:
+        raise _too_large()
+    return contents
@@ -5,4 +5,70 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
-settings = Settings()
\ No newline at end of file
+    # Executor pools for blocking work in async endpoints
+    EXECUTOR_OCR_WORKERS: int = 4
+    EXECUTOR_ML_WORKERS: int = 2
+    EXECUTOR_LLM_WORKERS: int = 1
+    EXECUTOR_DB_WORKERS: int = 8
+    EXECUTOR_BATCH_WORKERS: int = 4  # concurrent /clean_and_analyze/batch requests being coordinated
+
+    # OCR
+    EASYOCR_POOL_SIZE: int = 1       # max number of easyocr.Reader instances kept alive
+    EASYOCR_WARM_READERS: int = 0    # readers to preload at startup (0 = load on first use)
+    EASYOCR_BATCH_SIZE: int = 8      # recognition batch size passed to easyocr
+    EASYOCR_PDF_PAGE_GROUP: int = 4  # PDF pages rasterized and read per batched easyocr call
+    OCR_PARALLEL_PAGES: bool = True  # fan tesseract pages out to a process pool
+    OCR_PROCESS_WORKERS: int = 0     # 0 = one worker per CPU core
+    OCR_PARALLEL_MIN_PAGES: int = 2  # below this, OCR inline (pool overhead not worth it)
+    PDF_RASTER_DPI: int = 200        # pdf2image default
+    PDF_TEXT_LAYER: bool = True      # use embedded PDF text, OCR only pages without it
+    PDF_TEXT_MIN_CHARS: int = 20     # alphanumeric chars for a page's text layer to count
+    OCR_PREPROCESS: bool = True      # grayscale/binarize/deskew before tesseract
+    OCR_TARGET_DPI: int = 300
+    OCR_DESKEW: bool = True
+
+    # Uploads
+    MAX_UPLOAD_MB: int = 50
+    UPLOAD_STREAMING: bool = True    # spool uploads to disk and OCR PDFs one page at a time
+    UPLOAD_CHUNK_KB: int = 1024
+    UPLOAD_SPOOL_DIR: str = ""       # empty = system temp dir
+    BATCH_MAX_FILES: int = 50
+    BATCH_OCR_CONCURRENCY: int = 4   # files OCR'd at once, shared by all batch requests
+    SYMPTOM_BATCH_MAX_ITEMS: int = 1000  # inputs per /symptoms/predict_batch request
+
+    # OCR result cache
+    OCR_CACHE_ENABLED: bool = True
+    OCR_CACHE_MEMORY_ENTRIES: int = 256
+    OCR_CACHE_DIR: str = "outputs/ocr_cache"  # empty = memory only
+    OCR_CACHE_DISK_MAX_MB: int = 512
+
+    # Background report jobs
+    JOB_BROKER: str = "sqlite"              # "sqlite", "redis" or "memory"
+    JOB_SQLITE_PATH: str = "outputs/jobs.db"
+    JOB_REDIS_URL: str = "redis://localhost:6379/0"
+    JOB_SPOOL_DIR: str = "outputs/job_uploads"
+    JOB_WORKERS: int = 1                    # embedded workers started with the API (0 = run them separately)
+    JOB_VISIBILITY_TIMEOUT_SECONDS: float = 1800.0  # running jobs not finished by then are requeued (worker died)
+
+    # Model registry (versioned artifacts + manifest, see ml/registry.py)
+    MODEL_REGISTRY_DIR: str = "ml/models/registry"
+    MODEL_REGISTRY_POLL_SECONDS: float = 5.0  # manifest check interval for hot-reload (0 = off)
+
+    # Models load on first use; these are loaded in the background right after startup
+    # (names from /ready, comma separated; "all" = every model, "" = none)
+    WARM_UP_MODELS: str = "report_classifier,symptom_model"
+
+    # Micro-batching of single-item model inference (see app/ml/batcher.py)
+    INFERENCE_BATCHING: bool = True
+    INFERENCE_BATCH_WINDOW_MS: float = 2.0   # max wait after the first queued item
+    INFERENCE_MAX_BATCH: int = 64            # run as soon as this many are queued
+
+    # Write-behind sink for log rows (see app/db/log_sink.py); False = commit per request
+    LOG_SINK_ENABLED: bool = True
+    LOG_SINK_FLUSH_MS: float = 20.0   # max time a row waits for its batch
+    LOG_SINK_MAX_BATCH: int = 500     # flush as soon as this many rows are queued
+
+    # /symptoms/predict result cache, keyed on the normalised symptom set (0 = off)
+    SYMPTOM_CACHE_ENTRIES: int = 2048
+
+settings = Settings()
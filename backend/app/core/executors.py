@@ -0,0 +1,113 @@
+# backend/app/core/executors.py
+"""
+Dedicated thread pools for blocking work called from async endpoints.
+
+Each kind of work gets its own, separately sized pool so a burst of OCR
+can't starve DB lookups or LLM generation, and none of them run on the
+event loop:
+    ocr  - pytesseract / EasyOCR / PDF rasterization
+    ml   - text cleaning, extraction and classifier inference
+    llm  - text generation (one at a time by default; models aren't thread-safe)
+    db   - synchronous SQLAlchemy sessions
+    batch - coordinators of multi-file uploads; they mostly wait on the batch
+            OCR pool (report_pipeline), so they must not hold "ocr" threads
+"""
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.config import settings
+
+_executors = {}
+_lock = threading.Lock()
+_DONE = object()
+
+
+def _pool_sizes() -> dict:
+    return {
+        "ocr": settings.EXECUTOR_OCR_WORKERS,
+        "ml": settings.EXECUTOR_ML_WORKERS,
+        "llm": settings.EXECUTOR_LLM_WORKERS,
+        "db": settings.EXECUTOR_DB_WORKERS,
+        "batch": settings.EXECUTOR_BATCH_WORKERS,
+    }
+
+
+def get_executor(name: str) -> ThreadPoolExecutor:
+    with _lock:
+        if name not in _executors:
+            sizes = _pool_sizes()
+            if name not in sizes:
+                raise ValueError(f"Unknown executor '{name}' (expected one of {', '.join(sizes)})")
+            _executors[name] = ThreadPoolExecutor(max_workers=max(1, sizes[name]), thread_name_prefix=f"{name}-pool")
+        return _executors[name]
+
+
+async def run_in(name: str, fn, *args, **kwargs):
+    """Await a blocking call on the named pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(name), functools.partial(fn, *args, **kwargs))
+
+
+async def iterate_in(name: str, iterable):
+    """
+    Async iteration over a blocking iterator (e.g. a generator OCR-ing page by
+    page): every next() runs on the named pool. Closing the async generator
+    closes the iterator, after the step in flight (if any) has finished.
+    """
+    iterator = iter(iterable)
+    pending = None
+    try:
+        while True:
+            pending = get_executor(name).submit(next, iterator, _DONE)
+            item = await asyncio.wrap_future(pending)
+            if item is _DONE:
+                return
+            yield item
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            if pending is not None and not pending.done():
+                pending.add_done_callback(lambda _: close())
+            else:
+                close()
+
+
+async def run_ocr(fn, *args, **kwargs):
+    return await run_in("ocr", fn, *args, **kwargs)
+
+
+def iterate_ocr(iterable):
+    return iterate_in("ocr", iterable)
+
+
+async def run_ml(fn, *args, **kwargs):
+    return await run_in("ml", fn, *args, **kwargs)
+
+
+async def run_llm(fn, *args, **kwargs):
+    return await run_in("llm", fn, *args, **kwargs)
+
+
+async def run_db(fn, *args, **kwargs):
+    return await run_in("db", fn, *args, **kwargs)
+
+
+async def run_batch(fn, *args, **kwargs):
+    return await run_in("batch", fn, *args, **kwargs)
+
+
+def executor_stats() -> dict:
+    with _lock:
+        return {
+            name: {"max_workers": pool._max_workers, "queued": pool._work_queue.qsize()}
+            for name, pool in _executors.items()
+        }
+
+
+def shutdown_executors():
+    with _lock:
+        for pool in _executors.values():
+            pool.shutdown(wait=True, cancel_futures=True)
+        _executors.clear()
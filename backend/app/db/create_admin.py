@@ -0,0 +1,42 @@
+# backend/app/db/create_admin.py
+"""
+Create an admin user, or promote an existing one. Admins can manage the
+served models (/admin/models), so the role can't be picked at /auth/signup.
+
+Run from backend/:  python -m app.db.create_admin admin@example.com
+"""
+import argparse
+import getpass
+
+from app.db.session import SessionLocal
+from app.db.models import User
+
+
+def create_admin(email: str, password: str | None = None) -> User:
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.email == email).first()
+        if user:
+            user.role = "admin"
+            print(f"🔑 Promoted {email} to admin")
+        else:
+            if not password:
+                raise ValueError("A password is needed to create a new user")
+            user = User(email=email, hashed_password=User.hash_password(password), role="admin")
+            db.add(user)
+            print(f"🔑 Created admin {email}")
+        db.commit()
+        db.refresh(user)
+        return user
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("email")
+    args = parser.parse_args()
+    db = SessionLocal()
+    exists = db.query(User).filter(User.email == args.email).first() is not None
+    db.close()
+    create_admin(args.email, None if exists else getpass.getpass("Password: "))
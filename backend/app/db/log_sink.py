@@ -0,0 +1,75 @@
+# backend/app/db/log_sink.py
+"""
+Write-behind sink for SymptomLog / ReportLog / FeedbackLog rows.
+
+Instead of one session + commit per request, rows are queued and written
+by a single thread: everything queued within LOG_SINK_FLUSH_MS (or up to
+LOG_SINK_MAX_BATCH rows) goes out as one multi-row INSERT and one commit.
+
+write(row) returns a Future resolving to the same row once it is
+committed, with its id set. Endpoints that return an id wait on it (their
+wait is at most one flush interval, shared with every concurrent caller);
+endpoints that don't can return straight away. Queued rows are flushed on
+shutdown (stop_batchers). write_all(rows) queues its rows as one item:
+they are never split across commits, and commit or fail together. A
+failing batch is retried item by item, each in its own transaction, so
+one bad item only fails its own caller.
+"""
+from concurrent.futures import Future
+
+from ..core.config import settings
+from ..ml.batcher import ItemError, MicroBatcher
+from .session import SessionLocal
+
+
+def _commit(rows: list):
+    # Rows stay readable (id, columns) after the session closes
+    db = SessionLocal(expire_on_commit=False)
+    try:
+        db.add_all(rows)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def _rows(item) -> list:
+    # An item is one row (write) or a list of rows that commit together (write_all)
+    return item if isinstance(item, list) else [item]
+
+
+def _write_rows(items: list) -> list:
+    try:
+        _commit([row for item in items for row in _rows(item)])
+        return items
+    except Exception as e:
+        if len(items) == 1:
+            print(f"❌ Failed to write {len(_rows(items[0]))} {type(_rows(items[0])[0]).__name__} row(s): {e}")
+            return [ItemError(e)]
+    return [_write_rows([item])[0] for item in items]
+
+
+log_sink = MicroBatcher(
+    "log_sink",
+    _write_rows,
+    max_batch_size=settings.LOG_SINK_MAX_BATCH,
+    window_ms=settings.LOG_SINK_FLUSH_MS,
+    enabled=settings.LOG_SINK_ENABLED,
+)
+
+
+def write(row) -> Future:
+    """Queue one new ORM row; the Future resolves to the committed row."""
+    return log_sink.submit(row)
+
+
+def write_all(rows: list) -> list:
+    """
+    Queue rows as one item and wait for them: they are committed in a single
+    transaction (all or none). Returns the committed rows (ids set) in order.
+    """
+    if not rows:
+        return []
+    return log_sink.submit(list(rows)).result()
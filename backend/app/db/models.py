@@ -14,7 +14,7 @@ class User(Base):
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String, unique=True, index=True, nullable=False)
     hashed_password = Column(String, nullable=False)
-    role = Column(String, default="patient")  # "patient" or "doctor"
+    role = Column(String, default="patient")  # "patient", "doctor" or "admin" (create_admin.py)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     patients = relationship("Patient", back_populates="user")
@@ -1,4 +1,5 @@
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.api import (
     routes_symptoms,
@@ -9,14 +10,24 @@ from app.api import (
     routes_auth,
     routes_feedback,
     routes_doctor,
+    routes_jobs,
+    routes_models,
 )
 from app.db.base import Base
 from app.db.session import engine
 from app.db.models import User, Patient, ReportLog, SymptomLog, FeedbackLog
-from ml.model_loader import generate_response
+from app.core.config import settings
+from app.core.executors import run_llm, shutdown_executors
+from app.services.ocr_service import easyocr_pool, shutdown_ocr_workers
+from app.utils.text_cleaner import shutdown_batch_workers
+from app.services.job_worker import WorkerGroup
+from app.ml.batcher import stop_batchers
+from app.ml.model_store import model_tasks, model_watcher, readiness, start_warm_up
+from app.ml.model_loader import generate_response
 
 
 app = FastAPI(title="AI Wellness Assistant")
+report_workers = WorkerGroup(settings.JOB_WORKERS)
 
 @app.get("/")
 async def root():
@@ -29,6 +40,31 @@ def startup_event():
     Base.metadata.create_all(bind=engine)
     print("✅ Database tables created.")
 
+    # Models load lazily; warm the configured ones (and EasyOCR readers) in the
+    # background so the first request doesn't pay for loading. See /ready.
+    tasks = model_tasks(settings.WARM_UP_MODELS.split(","))
+    if settings.EASYOCR_WARM_READERS > 0:
+        tasks.append(("easyocr", lambda: easyocr_pool.warm_up(settings.EASYOCR_WARM_READERS)))
+    start_warm_up(tasks)
+
+    if settings.JOB_WORKERS > 0:
+        report_workers.start()
+        print(f"✅ Started {settings.JOB_WORKERS} report worker(s).")
+
+    # Pick up newly published model versions without a restart
+    model_watcher.start()
+
+
+@app.on_event("shutdown")
+def shutdown_event():
+    model_watcher.stop()
+    report_workers.stop()
+    stop_batchers()
+    shutdown_ocr_workers()
+    shutdown_batch_workers()
+    shutdown_executors()
+
+
 # CORS
 app.add_middleware(
     CORSMiddleware,
@@ -47,13 +83,22 @@ app.include_router(routes_patients.router, prefix="/cv", tags=["Patients"])
 app.include_router(routes_dashboard.router, prefix="/cv", tags=["Dashboard"])
 app.include_router(routes_feedback.router, prefix="/cv", tags=["Feedback"])
 app.include_router(routes_doctor.router, prefix="/doctor", tags=["Doctor"])
+app.include_router(routes_jobs.router, prefix="/cv", tags=["Jobs"])
+app.include_router(routes_models.router, prefix="/admin/models", tags=["Models"])
 
 @app.get("/health")
 async def health_check():
     return {"status": "ok", "message": "Backend is running 🚀"}
 
+@app.get("/ready")
+async def ready_check():
+    """Per-model load state; 503 until the startup warm-up has finished."""
+    state = readiness()
+    state["models"]["easyocr"] = {"name": "easyocr", "state": "ready" if easyocr_pool.stats()["created"] else "not_loaded", **easyocr_pool.stats()}
+    return JSONResponse(state, status_code=200 if state["ready"] else 503)
+
 @app.post("/generate")
 async def generate_text(data: dict):
     prompt = data.get("prompt", "")
-    result = generate_response(prompt)
+    result = await run_llm(generate_response, prompt)
     return {"response": result}
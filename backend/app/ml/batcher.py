@@ -0,0 +1,179 @@
+# backend/app/ml/batcher.py
+"""
+Micro-batching for single-item model inference.
+
+Callers submit one item and get a Future. A scheduler thread collects items
+for up to `window_ms` after the first one arrives (or until `max_batch_size`
+are queued), runs one vectorized predict over the batch and resolves every
+caller's Future. Under load this turns N single-row predicts into a few
+batch predicts; when idle it adds at most `window_ms` of latency.
+
+With batching disabled (INFERENCE_BATCHING=False) predict() runs the batch
+function inline on a one-item list, so callers don't change.
+"""
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+from ..core.config import settings
+
+_batchers = []
+_STOP = object()
+
+
+class ItemError:
+    """Returned by run_batch in place of a result to fail only that item's Future."""
+
+    def __init__(self, exception: Exception):
+        self.exception = exception
+
+
+class MicroBatcher:
+    def __init__(self, name: str, run_batch, max_batch_size: int | None = None,
+                 window_ms: float | None = None, enabled: bool | None = None):
+        """
+        run_batch(items) → list of results, one per item, in order
+        (an ItemError for items that failed on their own).
+        Sizes default to INFERENCE_MAX_BATCH / INFERENCE_BATCH_WINDOW_MS.
+        """
+        self.name = name
+        self.run_batch = run_batch
+        self.max_batch_size = max(1, max_batch_size or settings.INFERENCE_MAX_BATCH)
+        self.window = (settings.INFERENCE_BATCH_WINDOW_MS if window_ms is None else window_ms) / 1000
+        self.enabled = settings.INFERENCE_BATCHING if enabled is None else enabled
+        self._queue = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+        self._stats_lock = threading.Lock()
+        self._batches = 0
+        self._items = 0
+        self._errors = 0
+        self._delay_total = 0.0
+        self._delay_max = 0.0
+        self._recent_delays = deque(maxlen=1000)
+        self._fill_counts = {}  # batch size → number of batches
+        _batchers.append(self)
+
+    # ---------- callers ----------
+
+    def submit(self, item) -> Future:
+        future = Future()
+        if not self.enabled:
+            self._run([(item, future, time.perf_counter())])
+            return future
+        self._ensure_started()
+        self._queue.put((item, future, time.perf_counter()))
+        return future
+
+    def predict(self, item, timeout: float | None = None):
+        """Blocking submit(item).result(); re-raises the batch's exception."""
+        return self.submit(item).result(timeout)
+
+    # ---------- scheduler ----------
+
+    def _ensure_started(self):
+        if self._thread and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if not (self._thread and self._thread.is_alive()):
+                self._thread = threading.Thread(target=self._loop, daemon=True, name=f"{self.name}-batcher")
+                self._thread.start()
+
+    def _loop(self):
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+            batch = [first]
+            deadline = first[2] + self.window
+            stopping = False
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                try:
+                    entry = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if entry is _STOP:
+                    stopping = True
+                    break
+                batch.append(entry)
+            self._run(batch)
+            if stopping:
+                return
+
+    def _run(self, batch: list):
+        started = time.perf_counter()
+        # Skip callers that cancelled while queued
+        live = [(item, future) for item, future, _ in batch if future.set_running_or_notify_cancel()]
+        items = [item for item, _ in live]
+        futures = [future for _, future in live]
+        delays = [started - queued for _, _, queued in batch]
+        try:
+            results = self.run_batch(items) if items else []
+            if len(results) != len(items):
+                raise RuntimeError(f"{self.name}: batch returned {len(results)} results for {len(items)} items")
+        except Exception as e:
+            with self._stats_lock:
+                self._errors += 1
+            for future in futures:
+                future.set_exception(e)
+        else:
+            for future, result in zip(futures, results):
+                if isinstance(result, ItemError):
+                    future.set_exception(result.exception)
+                else:
+                    future.set_result(result)
+        self._record(len(batch), delays)
+
+    def _record(self, size: int, delays: list):
+        with self._stats_lock:
+            self._batches += 1
+            self._items += size
+            self._fill_counts[size] = self._fill_counts.get(size, 0) + 1
+            self._delay_total += sum(delays)
+            self._delay_max = max(self._delay_max, *delays)
+            self._recent_delays.extend(delays)
+
+    def stop(self):
+        """Run what is queued, then end the scheduler thread."""
+        if self._thread and self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join(timeout=10)
+        self._thread = None
+
+    # ---------- metrics ----------
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            recent = sorted(self._recent_delays)
+            p95 = recent[int(len(recent) * 0.95) - 1] if recent else 0.0
+            return {
+                "name": self.name,
+                "enabled": self.enabled,
+                "window_ms": self.window * 1000,
+                "max_batch_size": self.max_batch_size,
+                "batches": self._batches,
+                "items": self._items,
+                "errors": self._errors,
+                "queued": self._queue.qsize(),
+                # Batch fill: how close batches get to max_batch_size
+                "avg_batch_size": round(self._items / self._batches, 2) if self._batches else 0.0,
+                "avg_fill": round(self._items / (self._batches * self.max_batch_size), 3) if self._batches else 0.0,
+                "batch_sizes": dict(sorted(self._fill_counts.items())),
+                # Queueing delay: submit → start of the batch's predict
+                "avg_queue_ms": round(self._delay_total / self._items * 1000, 3) if self._items else 0.0,
+                "p95_queue_ms": round(p95 * 1000, 3),
+                "max_queue_ms": round(self._delay_max * 1000, 3),
+            }
+
+
+def batcher_stats() -> list[dict]:
+    return [batcher.stats() for batcher in list(_batchers)]
+
+
+def stop_batchers():
+    for batcher in list(_batchers):
+        batcher.stop()
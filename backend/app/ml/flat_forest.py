@@ -0,0 +1,114 @@
+# backend/app/ml/flat_forest.py
+"""
+NumPy evaluator for random forests flattened by ml/training/export_forests.py.
+
+sklearn spends most of a single-row predict on input validation and thread
+dispatch across trees. Here every tree of a forest lives in a few
+contiguous arrays and all trees are walked together, one level per step:
+
+    nodes = roots
+    repeat depth times: nodes = children[nodes, x[feature[nodes]] > threshold[nodes]]
+
+Leaves point back to themselves, so trees of different depth need no masking.
+Predictions match sklearn (inputs are compared as float32, like sklearn's trees).
+The win is per-call overhead: for large batches sklearn's compiled traversal
+is faster, so callers should keep using it there.
+
+Array layout, per output i of the model (stored as forest/<key>.npy in the
+memory-mapped artifact, see mapped_artifacts.py):
+    {i}.feature    int32   (n_nodes,)     split feature (0 for leaves)
+    {i}.threshold  float64 (n_nodes,)     split threshold (+inf for leaves)
+    {i}.children   int32   (n_nodes, 2)   [left, right] node ids, global across trees
+    {i}.value      float64 (n_nodes, n_classes)  leaf class probabilities
+    {i}.roots      int32   (n_trees,)
+    {i}.depth      int     max tree depth
+    {i}.classes    class labels
+plus n_outputs, n_features and format_version.
+"""
+import numpy as np
+
+FORMAT_VERSION = 1
+
+# Above this many rows sklearn's compiled tree walk beats the flattened evaluator
+FLAT_FOREST_MAX_ROWS = 128
+
+
+class FlatForest:
+    """One flattened RandomForestClassifier (or one output of a MultiOutputClassifier)."""
+
+    def __init__(self, feature, threshold, children, value, roots, depth, classes):
+        self.feature = feature
+        self.threshold = threshold
+        self.children = children
+        self.value = value
+        self.roots = roots
+        self.depth = int(depth)
+        self.classes = classes
+
+    def leaves(self, X: np.ndarray) -> np.ndarray:
+        """(n_samples, n_features) float32 → leaf node id per sample and tree."""
+        if X.shape[0] == 1:
+            # Single row (the API's common case): plain 1-D gathers, no row broadcasting
+            x, nodes = X[0], self.roots
+            for _ in range(self.depth):
+                nodes = self.children[nodes, (x[self.feature[nodes]] > self.threshold[nodes]).view(np.uint8)]
+            return nodes[None, :]
+        nodes = np.broadcast_to(self.roots, (X.shape[0], len(self.roots)))
+        rows = np.arange(X.shape[0])[:, None]
+        for _ in range(self.depth):
+            go_right = X[rows, self.feature[nodes]] > self.threshold[nodes]
+            nodes = self.children[nodes, go_right.view(np.uint8)]
+        return nodes
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        return self.value[self.leaves(X)].sum(axis=1) / len(self.roots)
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return self.classes[np.argmax(self.predict_proba(X), axis=1)]
+
+
+class FlatForestModel:
+    """
+    Drop-in for the predict / predict_proba of a RandomForestClassifier or a
+    MultiOutputClassifier of them. Accepts dense arrays or scipy sparse rows.
+    """
+
+    def __init__(self, forests: list[FlatForest], n_features: int, multi_output: bool):
+        self.forests = forests
+        self.n_features = n_features
+        self.multi_output = multi_output
+
+    @classmethod
+    def from_arrays(cls, data, source: str = "arrays") -> "FlatForestModel":
+        """Build from the exporter's arrays: flatten_model() output or any mapping of the same keys (e.g. memory-mapped .npy)."""
+        version = int(data["format_version"])
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported forest format {version} in {source}")
+        forests = [
+            FlatForest(*(data[f"{i}.{key}"] for key in ("feature", "threshold", "children", "value", "roots", "depth", "classes")))
+            for i in range(int(data["n_outputs"]))
+        ]
+        return cls(forests, int(data["n_features"]), multi_output=bool(data["multi_output"]))
+
+    def _as_array(self, X) -> np.ndarray:
+        if hasattr(X, "toarray"):
+            X = X.toarray()
+        X = np.asarray(X, dtype=np.float32)
+        return X.reshape(1, -1) if X.ndim == 1 else X
+
+    def predict(self, X) -> np.ndarray:
+        X = self._as_array(X)
+        if not self.multi_output:
+            return self.forests[0].predict(X)
+        return np.column_stack([forest.predict(X) for forest in self.forests])
+
+    def predict_proba(self, X):
+        """Array for a single forest; list of arrays (one per output) for multi-output, like sklearn."""
+        X = self._as_array(X)
+        if not self.multi_output:
+            return self.forests[0].predict_proba(X)
+        return [forest.predict_proba(X) for forest in self.forests]
+
+    @property
+    def classes_(self):
+        return self.forests[0].classes if not self.multi_output else [forest.classes for forest in self.forests]
@@ -0,0 +1,146 @@
+# backend/app/ml/mapped_artifacts.py
+"""
+Memory-mapped model artifacts, written by ml/training/export_forests.py
+(export_mapped) next to the pickle: model.pkl → model.mmap/
+
+    meta.json                 format version, label names, vectorizer settings
+    forest/<key>.npy          flattened forest arrays (see flat_forest.py)
+    vectorizer/terms.npy      TF-IDF vocabulary, sorted = column order
+    vectorizer/idf.npy
+
+Arrays are opened with mmap_mode="r": loading reads only meta.json, and
+every worker process maps the same files, so the pages live once in the OS
+page cache instead of once per worker as with pickle.load. Nothing in the
+artifact is pickled.
+"""
+import json
+import os
+import re
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from .flat_forest import FlatForestModel
+
+FORMAT_VERSION = 1
+
+
+def mapped_path(pickle_path: str) -> str:
+    """Where the exporter puts the mapped artifact for a pickled model: model.pkl → model.mmap."""
+    return os.path.splitext(pickle_path)[0] + ".mmap"
+
+
+class MappedArrays:
+    """Read-only mapping of array name → memory-mapped .npy from a mapped artifact directory."""
+
+    def __init__(self, directory: str, prefix: str = ""):
+        self.directory = directory
+        self.prefix = prefix
+
+    def __getitem__(self, key: str) -> np.ndarray:
+        path = os.path.join(self.directory, f"{self.prefix}{key}.npy")
+        array = np.load(path, mmap_mode="r", allow_pickle=False)
+        # 0-d arrays (counts, flags) aren't worth a mapping
+        return np.asarray(array) if array.ndim == 0 else array
+
+
+class LabelSet:
+    """inverse_transform of a fitted MultiLabelBinarizer, from its class names."""
+
+    def __init__(self, classes: list):
+        self.classes_ = np.asarray(classes)
+
+    def inverse_transform(self, Y) -> list[tuple]:
+        Y = np.asarray(Y).astype(bool)
+        return [tuple(self.classes_[row]) for row in Y]
+
+
+class MappedTfidf:
+    """
+    transform() of a fitted word-unigram TfidfVectorizer over a mapped, sorted
+    vocabulary: tokens are looked up with a binary search instead of a
+    per-process vocabulary dict.
+    """
+
+    def __init__(self, terms: np.ndarray, idf: np.ndarray | None, settings: dict):
+        self.terms = terms
+        self.max_term_length = terms.dtype.itemsize // np.dtype("U1").itemsize
+        self.idf = idf
+        self.lowercase = settings["lowercase"]
+        self.token_re = re.compile(settings["token_pattern"])
+        self.binary = settings["binary"]
+        self.sublinear_tf = settings["sublinear_tf"]
+        self.norm = settings["norm"]
+
+    def transform(self, texts: list[str]) -> csr_matrix:
+        indptr, indices, data = [0], [], []
+        for text in texts:
+            tokens = self.token_re.findall(text.lower() if self.lowercase else text)
+            # The vocabulary is a fixed-width string array: a longer token isn't in it,
+            # and casting would truncate it into a false match
+            tokens = [token for token in tokens if len(token) <= self.max_term_length]
+            if tokens:
+                tokens = np.asarray(tokens, dtype=self.terms.dtype)
+                positions = np.searchsorted(self.terms, tokens)
+                in_range = positions < len(self.terms)
+                positions, tokens = positions[in_range], tokens[in_range]
+                known = positions[self.terms[positions] == tokens]  # out-of-vocabulary tokens are dropped
+                columns, counts = np.unique(known, return_counts=True)
+                values = self._weights(columns, counts.astype(np.float64))
+                indices.append(columns)
+                data.append(values)
+                indptr.append(indptr[-1] + len(columns))
+            else:
+                indptr.append(indptr[-1])
+        n_features = len(self.terms)
+        if not indices:
+            return csr_matrix((len(texts), n_features), dtype=np.float64)
+        return csr_matrix((np.concatenate(data), np.concatenate(indices), indptr), shape=(len(texts), n_features))
+
+    def _weights(self, columns: np.ndarray, counts: np.ndarray) -> np.ndarray:
+        if self.binary:
+            counts = np.ones_like(counts)
+        elif self.sublinear_tf:
+            counts = np.log(counts) + 1
+        if self.idf is not None:
+            counts = counts * self.idf[columns]
+        if self.norm == "l2":
+            norm = np.sqrt((counts ** 2).sum())
+        elif self.norm == "l1":
+            norm = np.abs(counts).sum()
+        else:
+            norm = 0.0
+        return counts / norm if norm > 0 else counts
+
+
+def load_mapped(pickle_path: str) -> dict | None:
+    """
+    Mapped artifact exported from `pickle_path` as {"model", "labels", "vectorizer"}
+    (labels / vectorizer None when the model has none), or None when there is
+    none or it is older than the pickle (retrained but not re-exported).
+    """
+    directory = mapped_path(pickle_path)
+    meta_path = os.path.join(directory, "meta.json")
+    if not os.path.exists(meta_path):
+        return None
+    if os.path.exists(pickle_path) and os.path.getmtime(meta_path) < os.path.getmtime(pickle_path):
+        print(f"⚠️ {directory} is older than {pickle_path}; loading the pickle until it is re-exported")
+        return None
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"unsupported format {meta.get('format_version')}")
+        vectorizer = None
+        if "vectorizer" in meta:
+            arrays = MappedArrays(directory, "vectorizer/")
+            idf = arrays["idf"] if "vectorizer/idf" in meta["arrays"] else None
+            vectorizer = MappedTfidf(arrays["terms"], idf, meta["vectorizer"])
+        return {
+            "model": FlatForestModel.from_arrays(MappedArrays(directory, "forest/"), directory),
+            "labels": LabelSet(meta["labels"]) if "labels" in meta else None,
+            "vectorizer": vectorizer,
+        }
+    except Exception as e:
+        print(f"⚠️ Failed to load mapped model {directory}: {e}")
+        return None
@@ -0,0 +1,276 @@
+# backend/app/ml/model_store.py
+"""
+Hot-swappable handles on registry-managed models (see ml/registry.py).
+
+Request code calls handle.get() and gets whatever version is loaded right
+now. A background watcher polls the registry manifest; when a model's
+current version changes it loads the new one on the watcher thread and
+swaps it in with a single reference assignment, so requests never wait on
+a load and never see a half-loaded model. Models that were never published
+to the registry are loaded from their legacy path (e.g. ml/models/*.pkl).
+
+Nothing is loaded at import time: a handle loads on first get() (or in the
+startup warm-up, see start_warm_up), and LazyModel does the same for models
+outside the registry (TinyLlama, the GGUF chat model). readiness() reports
+the state of every model for the /ready endpoint.
+"""
+import os
+import threading
+import time
+
+from ml.registry import ModelRegistry
+
+from ..core.config import settings
+
+LEGACY = "legacy"
+
+registry = ModelRegistry(settings.MODEL_REGISTRY_DIR)
+_handles = []
+_lazy_models = []
+
+
+class ModelUnavailable(RuntimeError):
+    pass
+
+
+class ModelHandle:
+    def __init__(self, name: str, legacy_path: str, loader):
+        """
+        loader(path) → loaded bundle, where path is the model's pickle: either
+        <registry version dir>/<basename of legacy_path> or legacy_path itself.
+        """
+        self.name = name
+        self.legacy_path = legacy_path
+        self.filename = os.path.basename(legacy_path)
+        self.loader = loader
+        self._current = (None, None)  # (version, bundle), replaced as a whole
+        self._failed_version = None
+        self._attempted = False  # first load happens on first use, not at import
+        self._load_seconds = None
+        self._load_lock = threading.Lock()
+        _handles.append(self)
+
+    @property
+    def current(self) -> tuple:
+        return self._current
+
+    def get(self):
+        """Loaded bundle, or None if no version could be loaded."""
+        if not self._attempted:
+            self.refresh()
+        return self._current[1]
+
+    @property
+    def attempted(self) -> bool:
+        return self._attempted
+
+    @property
+    def version(self) -> str | None:
+        return self._current[0]
+
+    def set(self, version: str, bundle):
+        self._current = (version, bundle)
+
+    def _target(self) -> tuple[str, str] | None:
+        resolved = registry.resolve(self.name)
+        if resolved:
+            version, directory = resolved
+            return version, os.path.join(directory, self.filename)
+        if os.path.exists(self.legacy_path):
+            return LEGACY, self.legacy_path
+        return None
+
+    def refresh(self) -> bool:
+        """Load the registry's current version if it isn't the one being served. True if swapped."""
+        with self._load_lock:
+            self._attempted = True
+            target = self._target()
+            if target is None:
+                return False
+            version, path = target
+            if version == self.version or version == self._failed_version:
+                return False
+            start = time.perf_counter()
+            try:
+                bundle = self.loader(path)
+            except Exception as e:
+                # Keep serving the old version; retry only once the manifest points elsewhere
+                self._failed_version = version
+                print(f"⚠️ Failed to load {self.name} {version}: {e}")
+                return False
+            previous = self.version
+            self._current = (version, bundle)
+            self._failed_version = None
+            self._load_seconds = round(time.perf_counter() - start, 3)
+            print(f"✅ {self.name} {version} loaded" + (f" (was {previous})" if previous else ""))
+            return True
+
+    def state(self) -> str:
+        if self._current[1] is not None:
+            return "ready"
+        if not self._attempted:
+            return "not_loaded"
+        return "failed" if self._failed_version else "unavailable"  # unavailable = no artifact anywhere
+
+    def status(self) -> dict:
+        return {
+            "name": self.name,
+            "state": self.state(),
+            "loaded_version": self.version,
+            "failed_version": self._failed_version,
+            "load_seconds": self._load_seconds,
+        }
+
+
+class LazyModel:
+    """
+    A model outside the registry, loaded on first get() and kept for the
+    process lifetime. A failed load raises ModelUnavailable and is retried
+    only after `retry_seconds`, so a missing file fails fast and doesn't
+    take the rest of the API down with it.
+    """
+
+    def __init__(self, name: str, loader, retry_seconds: float = 30.0):
+        self.name = name
+        self.loader = loader
+        self.retry_seconds = retry_seconds
+        self._model = None
+        self._state = "not_loaded"
+        self._error = None
+        self._failed_at = 0.0
+        self._load_seconds = None
+        self._lock = threading.Lock()
+        _lazy_models.append(self)
+
+    def get(self):
+        model = self._model
+        if model is not None:
+            return model
+        with self._lock:
+            if self._model is None:
+                if self._state == "failed" and time.monotonic() - self._failed_at < self.retry_seconds:
+                    raise ModelUnavailable(f"{self.name} unavailable: {self._error}")
+                self._state = "loading"
+                start = time.perf_counter()
+                try:
+                    self._model = self.loader()
+                except Exception as e:
+                    self._state, self._error, self._failed_at = "failed", str(e), time.monotonic()
+                    print(f"❌ Failed to load {self.name}: {e}")
+                    raise ModelUnavailable(f"{self.name} unavailable: {e}") from e
+                self._state, self._error = "ready", None
+                self._load_seconds = round(time.perf_counter() - start, 3)
+                print(f"✅ {self.name} loaded in {self._load_seconds}s")
+        return self._model
+
+    def status(self) -> dict:
+        return {"name": self.name, "state": self._state, "error": self._error, "load_seconds": self._load_seconds}
+
+
+class ModelWatcher:
+    """Polls the registry manifest and refreshes every handle when it changes."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread = None
+        self._manifest_mtime = None
+
+    def check_now(self) -> list[str]:
+        """Refresh loaded handles immediately; returns the names that were swapped."""
+        # Handles nobody has used yet load the current version on first use anyway
+        return [handle.name for handle in list(_handles) if handle.attempted and handle.refresh()]
+
+    def _manifest_changed(self) -> bool:
+        try:
+            mtime = os.path.getmtime(registry.manifest_path)
+        except OSError:
+            mtime = None
+        changed = mtime != self._manifest_mtime
+        self._manifest_mtime = mtime
+        return changed
+
+    def _run(self):
+        self._manifest_changed()
+        self.check_now()  # catch publishes between import-time loading and start()
+        while not self._stop.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            if not self._stop.is_set() and self._manifest_changed():
+                self.check_now()
+
+    def trigger(self):
+        """Check the manifest now instead of at the next poll, without blocking the caller."""
+        if self._thread and self._thread.is_alive():
+            self._wake.set()
+        else:
+            threading.Thread(target=self.check_now, daemon=True, name="model-reload").start()
+
+    def start(self):
+        if self.interval <= 0 or (self._thread and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="model-watcher")
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+model_watcher = ModelWatcher(settings.MODEL_REGISTRY_POLL_SECONDS)
+
+
+def handles() -> list[ModelHandle]:
+    return list(_handles)
+
+
+# ---------- warm-up / readiness ----------
+
+_warm_up = {"state": "idle", "pending": [], "done": []}
+
+
+def model_tasks(names) -> list[tuple]:
+    """(name, load function) for the given handle / lazy model names ("all" = every one)."""
+    models = {model.name: model for model in list(_handles) + list(_lazy_models)}
+    names = list(models) if "all" in names else [name for name in names if name]
+    unknown = [name for name in names if name not in models]
+    if unknown:
+        print(f"⚠️ Unknown models in warm-up list: {', '.join(unknown)}")
+    return [(name, models[name].get) for name in names if name in models]
+
+
+def start_warm_up(tasks: list[tuple]) -> threading.Thread | None:
+    """Run (name, fn) load tasks one after another on a background thread."""
+    if not tasks:
+        _warm_up["state"] = "done"
+        return None
+
+    def run():
+        for name, load in tasks:
+            try:
+                load()
+            except Exception as e:
+                print(f"⚠️ Warm-up of {name} failed: {e}")
+            _warm_up["pending"].remove(name)
+            _warm_up["done"].append(name)
+        _warm_up["state"] = "done"
+
+    _warm_up.update(state="running", pending=[name for name, _ in tasks], done=[])
+    thread = threading.Thread(target=run, daemon=True, name="model-warm-up")
+    thread.start()
+    return thread
+
+
+def readiness() -> dict:
+    """Per-model state; ready once the startup warm-up has finished (loads that failed are reported, not fatal)."""
+    models = {model.name: model.status() for model in list(_handles) + list(_lazy_models)}
+    return {
+        "ready": _warm_up["state"] == "done",
+        "warm_up": dict(_warm_up),
+        "models": models,
+    }
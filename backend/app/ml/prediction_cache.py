@@ -0,0 +1,95 @@
+# backend/app/ml/prediction_cache.py
+"""
+Bounded LRU cache of model predictions, tied to one model version.
+
+Entries remember the version that produced them; the first lookup with a
+different version (after a hot-reload, pin or rollback) empties the cache.
+Each entry also keeps what its prediction cost, so hits can be reported
+as inference time saved.
+"""
+import re
+import threading
+import time
+from collections import OrderedDict
+
+# Same tokens the symptom TfidfVectorizer uses (default token_pattern, lowercased)
+_TOKEN_RE = re.compile(r"(?u)\b\w\w+\b")
+
+
+def canonical_symptoms(text: str) -> str:
+    """
+    Cache key: 'Cough, FEVER and cough' → 'and cough cough fever'. Lowercased,
+    tokenised and sorted, repeats kept: texts with the same key have the
+    same TF-IDF vector, so they get the same prediction.
+    """
+    return " ".join(sorted(_TOKEN_RE.findall(text.lower())))
+
+
+class PredictionCache:
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max(0, max_entries)
+        self._entries = OrderedDict()  # key → (prediction, seconds it took)
+        self._version = None
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0, "invalidations": 0}
+        self._saved_seconds = 0.0
+
+    def _check_version(self, version):
+        if version != self._version:
+            if self._entries:
+                self._counters["invalidations"] += 1
+            self._entries.clear()
+            self._version = version
+
+    def get(self, key: str, version):
+        """Cached prediction for key under `version`, or None."""
+        with self._lock:
+            self._check_version(version)
+            entry = self._entries.get(key)
+            if entry is None:
+                self._counters["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counters["hits"] += 1
+            self._saved_seconds += entry[1]
+            return entry[0]
+
+    def put(self, key: str, version, prediction, seconds: float):
+        if self.max_entries == 0:
+            return
+        with self._lock:
+            if version != self._version:
+                return  # computed by a model that is no longer current
+            self._entries[key] = (prediction, seconds)
+            self._entries.move_to_end(key)
+            self._counters["stores"] += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def predict(self, key: str, version, compute):
+        """get(), or compute() → put() on a miss."""
+        if self.max_entries == 0:
+            return compute()
+        prediction = self.get(key, version)
+        if prediction is None:
+            start = time.perf_counter()
+            prediction = compute()
+            self.put(key, version, prediction, time.perf_counter() - start)
+        return prediction
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            return {
+                **self._counters,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "version": self._version,
+                "hit_ratio": round(self._counters["hits"] / lookups, 4) if lookups else 0.0,
+                "saved_inference_ms": round(self._saved_seconds * 1000, 3),
+            }
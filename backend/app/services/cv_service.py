@@ -1,9 +1,7 @@
 import os
 import uuid
 from datetime import datetime
-from PIL import Image
-import pytesseract
-from pdf2image import convert_from_path
+from .ocr_service import ocr_pages, open_image, read_pdf
 
 # Configure upload directory
 UPLOAD_DIR = "backend/app/uploads"
@@ -23,15 +21,12 @@ def save_uploaded_file(file, original_filename: str) -> str:
     return file_path
 
 def extract_text_from_image(image_path: str) -> str:
-    image = Image.open(image_path)
-    return pytesseract.image_to_string(image).strip()
+    with open_image(image_path) as image:
+        return ocr_pages([image])[0].strip()
 
 def extract_text_from_pdf(pdf_path: str) -> str:
     try:
-        images = convert_from_path(pdf_path, dpi=300, poppler_path=POPPLER_PATH)
-        text = ""
-        for img in images:
-            text += pytesseract.image_to_string(img)
+        text = "".join(page_text for page_text, _ in read_pdf(pdf_path, dpi=300, poppler_path=POPPLER_PATH))
         return text.strip()
     except Exception as e:
         raise RuntimeError(f"PDF OCR failed: {str(e)}")
@@ -0,0 +1,481 @@
+# backend/app/services/job_queue.py
+"""
+Background job queue for report processing.
+
+Brokers share one small interface (submit / claim / heartbeat / complete / fail / get):
+- SQLiteBroker: default, a single SQLite file shared by the API and local worker processes
+- RedisBroker: for multi-node deployments; works with any client exposing
+  lpush / rpush / brpoplpush / lrange / delete / set / pexpire / exists /
+  sadd / srem / smembers / hset / hget / hgetall (redis-py, or InMemoryRedis below)
+
+A claim returns a token and leases the job for `visibility_timeout` seconds.
+The worker renews the lease with heartbeat() while it runs the job; if it
+dies, the lease runs out and the job goes back to the queue instead of
+staying "running" forever. complete/fail only count with the current token,
+so a worker that lost its lease can't overwrite the rerun's outcome.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import deque
+
+from ..core.config import settings
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+# How often RedisBroker scans its processing list for expired leases
+REQUEUE_CHECK_SECONDS = 30.0
+
+
+class JobBroker:
+    """Interface every broker implements."""
+
+    def submit(self, payload: dict) -> str:
+        raise NotImplementedError
+
+    def claim(self, timeout: float = 1.0) -> tuple[str, dict, str] | None:
+        """
+        Take the oldest queued job and mark it running, first putting jobs whose
+        lease expired back on the queue. Returns (job_id, payload, claim token),
+        or None if nothing arrived in time.
+        """
+        raise NotImplementedError
+
+    def heartbeat(self, job_id: str, token: str) -> bool:
+        """Renew a claim's lease. False if the claim was lost (lease expired, job requeued)."""
+        raise NotImplementedError
+
+    def complete(self, job_id: str, token: str, result: dict) -> bool:
+        """Mark a running job done. False (and no change) if `token` no longer holds the claim."""
+        raise NotImplementedError
+
+    def fail(self, job_id: str, token: str, error: str) -> bool:
+        raise NotImplementedError
+
+    def get(self, job_id: str) -> dict | None:
+        """Job record: id, status, payload, result, error, created_at, updated_at."""
+        raise NotImplementedError
+
+
+# ==============================
+# 🔹 SQLITE BROKER (default)
+# ==============================
+
+class SQLiteBroker(JobBroker):
+    def __init__(self, path: str, poll_interval: float = 0.2, lock_timeout: float = 30.0, visibility_timeout: float = 1800.0):
+        self.path = path
+        self.poll_interval = poll_interval
+        self.lock_timeout = lock_timeout  # how long a call waits for another connection's write lock
+        self.visibility_timeout = visibility_timeout
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    result TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    claim_token TEXT
+                )
+            """)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+            if "claim_token" not in columns:  # job databases created before claim tokens
+                conn.execute("ALTER TABLE jobs ADD COLUMN claim_token TEXT")
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_jobs_status_created ON jobs (status, created_at)")
+        finally:
+            conn.close()
+
+    def _connect(self):
+        # One short-lived connection per call: safe across threads and processes
+        conn = sqlite3.connect(self.path, timeout=self.lock_timeout, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def submit(self, payload: dict) -> str:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT INTO jobs (id, status, payload, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, QUEUED, json.dumps(payload), now, now),
+            )
+        finally:
+            conn.close()
+        return job_id
+
+    def _try_claim(self):
+        conn = self._connect()
+        try:
+            # BEGIN IMMEDIATE takes the write lock, so two workers can't claim the same row
+            conn.execute("BEGIN IMMEDIATE")
+            now = time.time()
+            # Requeue jobs whose lease ran out (no heartbeat); created_at order puts them first again
+            conn.execute(
+                "UPDATE jobs SET status = ?, claim_token = NULL, updated_at = ? WHERE status = ? AND updated_at < ?",
+                (QUEUED, now, RUNNING, now - self.visibility_timeout),
+            )
+            row = conn.execute(
+                "SELECT id, payload FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1", (QUEUED,)
+            ).fetchone()
+            token = uuid.uuid4().hex
+            if row:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, claim_token = ?, updated_at = ? WHERE id = ?", (RUNNING, token, now, row[0])
+                )
+            conn.execute("COMMIT")
+            return (row[0], json.loads(row[1]), token) if row else None
+        except Exception:
+            # BEGIN IMMEDIATE itself may have failed (database is locked): nothing to roll back
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def claim(self, timeout: float = 1.0):
+        deadline = time.monotonic() + timeout
+        while True:
+            job = self._try_claim()
+            if job or time.monotonic() >= deadline:
+                return job
+            time.sleep(self.poll_interval)
+
+    def heartbeat(self, job_id: str, token: str) -> bool:
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                "UPDATE jobs SET updated_at = ? WHERE id = ? AND claim_token = ? AND status = ?",
+                (time.time(), job_id, token, RUNNING),
+            )
+            return cursor.rowcount == 1
+        finally:
+            conn.close()
+
+    def _finish(self, job_id: str, token: str, status: str, result=None, error=None) -> bool:
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, updated_at = ? WHERE id = ? AND claim_token = ? AND status = ?",
+                (status, json.dumps(result) if result is not None else None, error, time.time(), job_id, token, RUNNING),
+            )
+            return cursor.rowcount == 1
+        finally:
+            conn.close()
+
+    def complete(self, job_id: str, token: str, result: dict) -> bool:
+        return self._finish(job_id, token, DONE, result=result)
+
+    def fail(self, job_id: str, token: str, error: str) -> bool:
+        return self._finish(job_id, token, FAILED, error=error)
+
+    def get(self, job_id: str):
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT id, status, payload, result, error, created_at, updated_at FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        finally:
+            conn.close()
+        if not row:
+            return None
+        return {
+            "id": row[0],
+            "status": row[1],
+            "payload": json.loads(row[2]),
+            "result": json.loads(row[3]) if row[3] else None,
+            "error": row[4],
+            "created_at": row[5],
+            "updated_at": row[6],
+        }
+
+
+# ==============================
+# 🔹 REDIS BROKER (multi-node)
+# ==============================
+
+class RedisBroker(JobBroker):
+    """
+    Each claim creates a lease key with a TTL and then moves the job id with
+    BRPOPLPUSH into a list owned by that claim, so a job is always either
+    queued or held by a live-or-expired lease. Claims whose lease key expired
+    are put back on the queue by the next worker that checks.
+    """
+
+    def __init__(self, client, prefix: str = "wellness:jobs", visibility_timeout: float = 1800.0):
+        self.client = client
+        self.prefix = prefix
+        self.queue_key = f"{prefix}:queue"
+        self.claims_key = f"{prefix}:claims"  # set of claim tokens, live or expired
+        self.visibility_timeout = visibility_timeout
+        self._next_requeue_check = 0.0
+
+    def _job_key(self, job_id: str) -> str:
+        return f"{self.prefix}:{job_id}"
+
+    def _lease_key(self, token: str) -> str:
+        return f"{self.prefix}:lease:{token}"
+
+    def _claimed_key(self, token: str) -> str:
+        return f"{self.prefix}:claimed:{token}"
+
+    def _lease_ms(self) -> int:
+        return max(1, int(self.visibility_timeout * 1000))
+
+    @staticmethod
+    def _decode(value):
+        return value.decode("utf-8") if isinstance(value, bytes) else value
+
+    def submit(self, payload: dict) -> str:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        self.client.hset(self._job_key(job_id), mapping={
+            "status": QUEUED,
+            "payload": json.dumps(payload),
+            "created_at": now,
+            "updated_at": now,
+        })
+        self.client.lpush(self.queue_key, job_id)
+        return job_id
+
+    def _release(self, token: str):
+        self.client.delete(self._claimed_key(token), self._lease_key(token))
+        self.client.srem(self.claims_key, token)
+
+    def _requeue_expired(self):
+        for raw_token in self.client.smembers(self.claims_key):
+            token = self._decode(raw_token)
+            if self.client.exists(self._lease_key(token)):
+                continue
+            # Only the worker whose SREM removed the token requeues its jobs
+            if not self.client.srem(self.claims_key, token):
+                continue
+            for raw_id in self.client.lrange(self._claimed_key(token), 0, -1):
+                job_key = self._job_key(self._decode(raw_id))
+                if self._decode(self.client.hget(job_key, "claim_token")) != token:
+                    continue  # finished before its lease ran out
+                self.client.hset(job_key, mapping={"status": QUEUED, "claim_token": "", "updated_at": time.time()})
+                self.client.rpush(self.queue_key, raw_id)  # BRPOP end: claimed next
+            self.client.delete(self._claimed_key(token))
+
+    def claim(self, timeout: float = 1.0):
+        if time.monotonic() >= self._next_requeue_check:
+            self._requeue_expired()
+            self._next_requeue_check = time.monotonic() + min(REQUEUE_CHECK_SECONDS, self.visibility_timeout)
+        # The lease exists before the job moves, so it is never unowned in between
+        token = uuid.uuid4().hex
+        self.client.set(self._lease_key(token), 1, px=self._lease_ms())
+        self.client.sadd(self.claims_key, token)
+        # Redis BRPOPLPUSH only takes whole seconds (0 would block forever)
+        raw_id = self.client.brpoplpush(self.queue_key, self._claimed_key(token), timeout=max(1, int(timeout)))
+        if raw_id is None:
+            self._release(token)
+            return None
+        job_id = self._decode(raw_id)
+        self.client.hset(self._job_key(job_id), mapping={"status": RUNNING, "claim_token": token, "updated_at": time.time()})
+        payload = self._decode(self.client.hget(self._job_key(job_id), "payload"))
+        return job_id, json.loads(payload), token
+
+    def heartbeat(self, job_id: str, token: str) -> bool:
+        if self._decode(self.client.hget(self._job_key(job_id), "claim_token")) != token:
+            return False
+        return bool(self.client.pexpire(self._lease_key(token), self._lease_ms()))
+
+    def _finish(self, job_id: str, token: str, fields: dict) -> bool:
+        recorded = self._decode(self.client.hget(self._job_key(job_id), "claim_token")) == token
+        if recorded:
+            self.client.hset(self._job_key(job_id), mapping={**fields, "claim_token": "", "updated_at": time.time()})
+        self._release(token)
+        return recorded
+
+    def complete(self, job_id: str, token: str, result: dict) -> bool:
+        return self._finish(job_id, token, {"status": DONE, "result": json.dumps(result)})
+
+    def fail(self, job_id: str, token: str, error: str) -> bool:
+        return self._finish(job_id, token, {"status": FAILED, "error": error})
+
+    def get(self, job_id: str):
+        raw = self.client.hgetall(self._job_key(job_id))
+        if not raw:
+            return None
+        data = {self._decode(k): self._decode(v) for k, v in raw.items()}
+        return {
+            "id": job_id,
+            "status": data["status"],
+            "payload": json.loads(data["payload"]),
+            "result": json.loads(data["result"]) if data.get("result") else None,
+            "error": data.get("error"),
+            "created_at": float(data["created_at"]),
+            "updated_at": float(data["updated_at"]),
+        }
+
+
+class InMemoryRedis:
+    """
+    Minimal in-process stand-in for the subset of redis-py used by RedisBroker.
+    Only visible inside one process, so pair it with worker threads.
+    """
+
+    def __init__(self):
+        self._lists = {}
+        self._hashes = {}
+        self._sets = {}
+        self._strings = {}  # key → (value, expiry on the monotonic clock or None)
+        self._cond = threading.Condition()
+
+    def lpush(self, key, *values):
+        with self._cond:
+            items = self._lists.setdefault(key, deque())
+            for value in values:
+                items.appendleft(value)
+            self._cond.notify_all()
+            return len(items)
+
+    def rpush(self, key, *values):
+        with self._cond:
+            items = self._lists.setdefault(key, deque())
+            items.extend(values)
+            self._cond.notify_all()
+            return len(items)
+
+    def brpoplpush(self, src, dst, timeout=0):
+        deadline = None if not timeout else time.monotonic() + timeout
+        with self._cond:
+            while not self._lists.get(src):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+            value = self._lists[src].pop()
+            self._lists.setdefault(dst, deque()).appendleft(value)
+            return value
+
+    def lrange(self, key, start, end):
+        with self._cond:
+            items = list(self._lists.get(key, ()))
+            return items[start:] if end == -1 else items[start:end + 1]
+
+    def delete(self, *keys):
+        with self._cond:
+            removed = 0
+            for key in keys:
+                for store in (self._lists, self._hashes, self._sets, self._strings):
+                    if store.pop(key, None) is not None:
+                        removed += 1
+            return removed
+
+    def _live_string(self, key):
+        # Caller holds the lock; expired keys disappear as in Redis
+        item = self._strings.get(key)
+        if item is not None and item[1] is not None and item[1] <= time.monotonic():
+            del self._strings[key]
+            return None
+        return item
+
+    def set(self, key, value, px=None):
+        with self._cond:
+            self._strings[key] = (str(value), None if px is None else time.monotonic() + px / 1000)
+            return True
+
+    def pexpire(self, key, ms):
+        with self._cond:
+            item = self._live_string(key)
+            if item is None:
+                return False
+            self._strings[key] = (item[0], time.monotonic() + ms / 1000)
+            return True
+
+    def exists(self, *keys):
+        with self._cond:
+            return sum(1 for key in keys if self._live_string(key) is not None)
+
+    def sadd(self, key, *values):
+        with self._cond:
+            members = self._sets.setdefault(key, set())
+            added = len(set(values) - members)
+            members.update(values)
+            return added
+
+    def srem(self, key, *values):
+        with self._cond:
+            members = self._sets.get(key, set())
+            removed = len(members & set(values))
+            members.difference_update(values)
+            return removed
+
+    def smembers(self, key):
+        with self._cond:
+            return set(self._sets.get(key, ()))
+
+    def hset(self, key, field=None, value=None, mapping=None):
+        with self._cond:
+            item = self._hashes.setdefault(key, {})
+            if field is not None:
+                item[field] = str(value)
+            for k, v in (mapping or {}).items():
+                item[k] = str(v)
+
+    def hget(self, key, field):
+        with self._cond:
+            return self._hashes.get(key, {}).get(field)
+
+    def hgetall(self, key):
+        with self._cond:
+            return dict(self._hashes.get(key, {}))
+
+
+# ==============================
+# 🔹 BROKER FACTORY
+# ==============================
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def create_broker(kind: str | None = None) -> JobBroker:
+    kind = (kind or settings.JOB_BROKER).lower()
+    if kind == "sqlite":
+        return SQLiteBroker(settings.JOB_SQLITE_PATH, visibility_timeout=settings.JOB_VISIBILITY_TIMEOUT_SECONDS)
+    if kind == "redis":
+        import redis  # optional dependency, only needed for multi-node setups
+        return RedisBroker(
+            redis.Redis.from_url(settings.JOB_REDIS_URL, decode_responses=True),
+            visibility_timeout=settings.JOB_VISIBILITY_TIMEOUT_SECONDS,
+        )
+    if kind == "memory":
+        return RedisBroker(InMemoryRedis(), visibility_timeout=settings.JOB_VISIBILITY_TIMEOUT_SECONDS)
+    raise ValueError(f"Unknown JOB_BROKER '{kind}' (expected sqlite, redis or memory)")
+
+
+def get_broker() -> JobBroker:
+    """Process-wide broker built from settings."""
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            _broker = create_broker()
+        return _broker
+
+
+def enqueue_report(spool_path: str, digest: str, filename: str, patient_id: int | None, use_easyocr: bool, user_id: int) -> str:
+    """
+    Queue an upload already spooled to disk (see JOB_SPOOL_DIR) for a worker.
+    With the Redis broker the spool dir must be shared storage visible to all nodes.
+    """
+    return get_broker().submit({
+        "spool_path": spool_path,
+        "digest": digest,
+        "filename": filename,
+        "patient_id": patient_id,
+        "use_easyocr": use_easyocr,
+        "user_id": user_id,
+    })
@@ -0,0 +1,186 @@
+# backend/app/services/job_worker.py
+"""
+Report-processing workers.
+
+Run standalone (e.g. on extra nodes, PYTHONPATH pointing at backend/):
+    python -m app.services.job_worker --workers 2
+or let the API start JOB_WORKERS embedded worker processes on startup.
+"""
+import argparse
+import multiprocessing
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from ..core.config import settings
+from .job_queue import create_broker, get_broker
+from .report_pipeline import process_report_file
+
+# Waits after a failed broker call (broker unreachable, database locked), doubling up to the max
+CLAIM_RETRY_SECONDS = 0.5
+CLAIM_RETRY_MAX_SECONDS = 30.0
+# Lease renewals per visibility timeout, so one missed heartbeat doesn't lose the job
+HEARTBEATS_PER_LEASE = 3
+
+
+def handle_job(payload: dict) -> dict:
+    """Run the upload pipeline for one queued report and drop the spooled file."""
+    spool_path = payload["spool_path"]
+    try:
+        return process_report_file(
+            spool_path,
+            payload["filename"],
+            payload["digest"],
+            patient_id=payload.get("patient_id"),
+            use_easyocr=payload.get("use_easyocr", False),
+        )
+    finally:
+        if os.path.exists(spool_path):
+            os.remove(spool_path)
+
+
+def _wait(stop_event, seconds: float):
+    if stop_event is not None:
+        stop_event.wait(seconds)
+    else:
+        time.sleep(seconds)
+
+
+@contextmanager
+def _heartbeat(broker, job_id: str, token: str):
+    """Renew the job's lease in the background while the body runs."""
+    done = threading.Event()
+
+    def beat():
+        while not done.wait(broker.visibility_timeout / HEARTBEATS_PER_LEASE):
+            try:
+                if not broker.heartbeat(job_id, token):
+                    print(f"⚠️ Lost the lease on job {job_id}; its outcome will not be recorded")
+                    return
+            except Exception as e:
+                print(f"⚠️ Heartbeat for job {job_id} failed: {e}")
+
+    thread = threading.Thread(target=beat, daemon=True, name=f"job-heartbeat-{job_id}")
+    thread.start()
+    try:
+        yield
+    finally:
+        done.set()
+        thread.join()
+
+
+def _record(stop_event, action: str, job_id: str, call, *args) -> bool:
+    """
+    Store a job's outcome, retrying broker errors with backoff. False if it
+    wasn't stored, including when the claim had been lost.
+    Gives up only once the worker is stopping; the job then stays running
+    until the broker's visibility timeout puts it back on the queue.
+    """
+    retry_in = CLAIM_RETRY_SECONDS
+    while True:
+        try:
+            if call(job_id, *args):
+                return True
+            print(f"⚠️ Job {job_id} was requeued after its lease ran out; not recording this run")
+            return False
+        except Exception as e:
+            if stop_event is not None and stop_event.is_set():
+                print(f"⚠️ Could not {action} job {job_id} before shutdown: {e}")
+                return False
+            print(f"⚠️ Could not {action} job {job_id}, retrying in {retry_in:.1f}s: {e}")
+            _wait(stop_event, retry_in)
+            retry_in = min(retry_in * 2, CLAIM_RETRY_MAX_SECONDS)
+
+
+def run_worker(stop_event=None, broker=None):
+    """Claim and process jobs until stop_event is set. Broker errors are retried with backoff."""
+    broker = broker or get_broker()
+    print(f"👷 Report worker started (pid {os.getpid()})")
+    retry_in = CLAIM_RETRY_SECONDS
+    while stop_event is None or not stop_event.is_set():
+        try:
+            job = broker.claim(timeout=1.0)
+        except Exception as e:
+            print(f"⚠️ Claiming a job failed, retrying in {retry_in:.1f}s: {e}")
+            _wait(stop_event, retry_in)
+            retry_in = min(retry_in * 2, CLAIM_RETRY_MAX_SECONDS)
+            continue
+        retry_in = CLAIM_RETRY_SECONDS
+        if job is None:
+            continue
+        job_id, payload, token = job
+        try:
+            with _heartbeat(broker, job_id, token):
+                result = handle_job(payload)
+        except Exception as e:
+            print(f"❌ Job {job_id} failed: {e}")
+            _record(stop_event, "fail", job_id, broker.fail, token, str(e))
+            continue
+        if _record(stop_event, "complete", job_id, broker.complete, token, result):
+            print(f"✅ Job {job_id} done (log ID: {result['log_id']})")
+
+
+def _worker_process(stop_event):
+    # Each worker process serves models too, so it follows registry updates itself
+    from ..ml.model_store import model_watcher
+    model_watcher.start()
+    # Fresh broker per process: connections must not be shared across fork/spawn
+    run_worker(stop_event, create_broker())
+
+
+class WorkerGroup:
+    """Embedded workers started with the API: processes, or threads for the in-memory broker."""
+
+    def __init__(self, count: int):
+        self.count = count
+        self.in_process = settings.JOB_BROKER.lower() == "memory"
+        if self.in_process:
+            self._stop = threading.Event()
+        else:
+            self._ctx = multiprocessing.get_context("spawn")
+            self._stop = self._ctx.Event()
+        self._workers = []
+
+    def start(self):
+        for i in range(self.count):
+            if self.in_process:
+                worker = threading.Thread(target=run_worker, args=(self._stop,), daemon=True, name=f"report-worker-{i}")
+            else:
+                # Not daemonic: workers fan OCR pages out to their own process pool
+                worker = self._ctx.Process(target=_worker_process, args=(self._stop,), name=f"report-worker-{i}")
+            worker.start()
+            self._workers.append(worker)
+
+    def join(self):
+        for worker in self._workers:
+            worker.join()
+
+    def stop(self, timeout: float = 30.0):
+        self._stop.set()
+        for worker in self._workers:
+            worker.join(timeout)
+        self._workers = []
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run report-processing workers")
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+
+    if args.workers == 1:
+        from ..ml.model_store import model_watcher
+        model_watcher.start()
+        run_worker()
+        return
+
+    group = WorkerGroup(args.workers)
+    group.start()
+    try:
+        group.join()
+    except KeyboardInterrupt:
+        group.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+# backend/app/services/ocr_cache.py
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+from ..core.config import settings
+
+
+def content_digest(contents: bytes) -> str:
+    return hashlib.sha256(contents).hexdigest()
+
+
+def cache_key(digest: str, engine: str, options: dict | None = None) -> str:
+    """
+    Build the cache key for one upload.
+    The same bytes OCR'd with a different engine or settings get a different key.
+    """
+    options_part = json.dumps(options or {}, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(f"{digest}|{engine}|{options_part}".encode("utf-8")).hexdigest()
+
+
+class OCRCache:
+    """
+    Two-tier cache for OCR output.
+    - Tier 1: bounded in-memory LRU (OrderedDict)
+    - Tier 2: size-capped directory of JSON files, least recently used evicted first
+    Disk hits are promoted back into memory. Sizes and recency of the disk
+    entries are tracked in memory; file reads, writes and deletes happen
+    outside the lock, so lookups never wait on another thread's disk I/O.
+    """
+
+    def __init__(self, max_entries: int = 256, disk_dir: str | None = None, disk_max_bytes: int = 0):
+        self.max_entries = max(0, max_entries)
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes
+        self._memory = OrderedDict()
+        self._disk = OrderedDict()  # key → file size, least recently used first
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        self._counters = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "memory_evictions": 0,
+            "disk_evictions": 0,
+        }
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            self._load_disk_index()
+
+    # ---------- memory tier ----------
+
+    def _remember(self, key: str, value: dict):
+        if self.max_entries == 0:
+            return
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._counters["memory_evictions"] += 1
+
+    # ---------- disk tier ----------
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.json")
+
+    def _load_disk_index(self):
+        # Entries left by earlier runs, oldest access (mtime) first
+        entries = []
+        for entry in os.scandir(self.disk_dir):
+            if entry.name.endswith(".json"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, entry.name[:-len(".json")], stat.st_size))
+        for _, key, size in sorted(entries):
+            self._disk[key] = size
+            self._disk_bytes += size
+
+    def _read_disk(self, key: str) -> tuple[dict, int] | None:
+        """(value, file size), or None."""
+        if not self.disk_dir:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                value = json.load(f)
+                size = os.fstat(f.fileno()).st_size
+            os.utime(path)  # mtime orders the index after a restart
+            return value, size
+        except (OSError, ValueError):
+            return None
+
+    def _write_disk(self, key: str, value: dict) -> int:
+        # Write to a temp file then rename, so readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.disk_dir, suffix=".tmp")
+        replaced = False
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(value, f)
+                f.flush()
+                size = os.fstat(f.fileno()).st_size
+            os.replace(tmp_path, self._path(key))
+            replaced = True
+        finally:
+            if not replaced:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+        return size
+
+    def _track_disk(self, key: str, size: int | None) -> list[str]:
+        """Record (size) or forget (None) a disk entry; returns keys evicted to stay under the cap. Caller holds the lock."""
+        self._disk_bytes -= self._disk.pop(key, 0)
+        if size is not None:
+            self._disk[key] = size
+            self._disk_bytes += size
+        evicted = []
+        while self.disk_max_bytes > 0 and self._disk_bytes > self.disk_max_bytes and self._disk:
+            victim, victim_size = self._disk.popitem(last=False)
+            self._disk_bytes -= victim_size
+            self._counters["disk_evictions"] += 1
+            evicted.append(victim)
+        return evicted
+
+    def _remove_files(self, keys: list[str]):
+        for key in keys:
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    # ---------- public API ----------
+
+    def get(self, key: str) -> dict | None:
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+                self._counters["memory_hits"] += 1
+                return value
+
+        # The directory may be shared with other worker processes: look even if we didn't write it
+        found = self._read_disk(key)
+
+        evicted = []
+        with self._lock:
+            if found is None:
+                if key in self._disk:
+                    self._track_disk(key, None)  # file vanished or is unreadable
+                self._counters["misses"] += 1
+                return None
+            value, size = found
+            if key in self._disk and self._disk[key] == size:
+                self._disk.move_to_end(key)
+            else:
+                evicted = self._track_disk(key, size)
+            self._remember(key, value)
+            self._counters["disk_hits"] += 1
+        self._remove_files(evicted)
+        return value
+
+    def set(self, key: str, value: dict):
+        with self._lock:
+            self._remember(key, value)
+            self._counters["stores"] += 1
+        if not self.disk_dir:
+            return
+        try:
+            size = self._write_disk(key, value)
+        except (OSError, TypeError, ValueError) as e:
+            print(f"⚠️ OCR cache disk write failed: {e}")
+            return
+        with self._lock:
+            evicted = self._track_disk(key, size)
+        self._remove_files(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._disk.clear()
+            self._disk_bytes = 0
+        if self.disk_dir:
+            for entry in os.scandir(self.disk_dir):
+                if entry.name.endswith(".json"):
+                    os.remove(entry.path)
+
+    def stats(self) -> dict:
+        with self._lock:
+            counters = dict(self._counters)
+            memory_entries = len(self._memory)
+            disk_entries, disk_bytes = len(self._disk), self._disk_bytes
+        hits = counters["memory_hits"] + counters["disk_hits"]
+        lookups = hits + counters["misses"]
+        return {
+            **counters,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            "memory_entries": memory_entries,
+            "memory_max_entries": self.max_entries,
+            "disk_entries": disk_entries,
+            "disk_bytes": disk_bytes,
+            "disk_max_bytes": self.disk_max_bytes,
+        }
+
+
+# Shared cache for the whole process
+ocr_cache = OCRCache(
+    max_entries=settings.OCR_CACHE_MEMORY_ENTRIES,
+    disk_dir=settings.OCR_CACHE_DIR or None,
+    disk_max_bytes=settings.OCR_CACHE_DISK_MAX_MB * 1024 * 1024,
+)
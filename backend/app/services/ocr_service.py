@@ -0,0 +1,333 @@
+# backend/app/services/ocr_service.py
+import os
+import queue
+import subprocess
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+import numpy as np
+import pytesseract
+from PIL import Image
+from pdf2image import convert_from_path, pdfinfo_from_path
+
+from ..core.config import settings
+from ..utils.image_preprocessor import load_image, preprocess_for_ocr
+
+
+class EasyOCRPool:
+    """
+    Long-lived pool of easyocr.Reader instances.
+    - Readers are created lazily (or preloaded with warm_up) and never rebuilt
+    - At most `size` readers exist; extra callers wait for a free one
+    - All pages of a document go through one reader in batched calls
+    """
+
+    def __init__(self, size: int = 1, languages=("en",), gpu: bool = False, batch_size: int = 8):
+        self.size = max(1, size)
+        self.languages = list(languages)
+        self.gpu = gpu
+        self.batch_size = max(1, batch_size)
+        self._idle = queue.Queue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _new_reader(self):
+        import easyocr  # heavy import (torch), only pay for it when OCR is used
+        return easyocr.Reader(self.languages, gpu=self.gpu)
+
+    def _reserve_slot(self) -> bool:
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                return True
+            return False
+
+    def _create(self):
+        try:
+            return self._new_reader()
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+
+    def warm_up(self, count: int | None = None) -> int:
+        """Preload up to `count` readers (default: pool size). Returns readers created."""
+        target = self.size if count is None else min(count, self.size)
+        created = 0
+        while self._created < target and self._reserve_slot():
+            self._idle.put(self._create())
+            created += 1
+        return created
+
+    @contextmanager
+    def reader(self, timeout: float | None = None):
+        """Borrow a reader from the pool, creating one if the pool is not full yet."""
+        try:
+            reader = self._idle.get_nowait()
+        except queue.Empty:
+            if self._reserve_slot():
+                reader = self._create()
+            else:
+                reader = self._idle.get(timeout=timeout)
+        try:
+            yield reader
+        finally:
+            self._idle.put(reader)
+
+    def read_pages(self, images) -> list[str]:
+        """
+        OCR a list of PIL images with a single borrowed reader.
+        Pages with the same shape are detected in one batched call; the
+        text is returned in the original page order.
+        """
+        arrays = [np.array(img) for img in images]
+        if not arrays:
+            return []
+
+        # Group page indexes by shape: readtext_batched needs equal-sized inputs
+        groups = {}
+        for idx, arr in enumerate(arrays):
+            groups.setdefault(arr.shape, []).append(idx)
+
+        texts = [""] * len(arrays)
+        with self.reader() as reader:
+            for indexes in groups.values():
+                if len(indexes) == 1:
+                    results = [reader.readtext(arrays[indexes[0]], batch_size=self.batch_size)]
+                else:
+                    results = reader.readtext_batched(
+                        [arrays[i] for i in indexes], batch_size=self.batch_size
+                    )
+                for idx, page_result in zip(indexes, results):
+                    texts[idx] = " ".join([res[1] for res in page_result])
+        return texts
+
+    def stats(self) -> dict:
+        return {"size": self.size, "created": self._created, "idle": self._idle.qsize()}
+
+
+# Shared pool for the whole process
+easyocr_pool = EasyOCRPool(
+    size=settings.EASYOCR_POOL_SIZE,
+    batch_size=settings.EASYOCR_BATCH_SIZE,
+)
+
+
+# ==============================
+# 🔹 PAGE-PARALLEL TESSERACT
+# ==============================
+
+_process_pool = None
+_process_pool_lock = threading.Lock()
+
+
+def _init_ocr_worker():
+    # Each worker handles one page; stop tesseract's OpenMP threads from
+    # oversubscribing the cores the other workers are using.
+    os.environ["OMP_THREAD_LIMIT"] = "1"
+
+
+def prepare_for_tesseract(image):
+    if not settings.OCR_PREPROCESS:
+        return image
+    return preprocess_for_ocr(image, target_dpi=settings.OCR_TARGET_DPI, do_deskew=settings.OCR_DESKEW)
+
+
+def open_image(path_or_file, use_easyocr: bool = False):
+    """Open an uploaded image; for tesseract, JPEGs get reduced-scale grayscale decoding."""
+    if use_easyocr or not settings.OCR_PREPROCESS:
+        return Image.open(path_or_file)
+    return load_image(path_or_file, settings.OCR_TARGET_DPI)
+
+
+def ocr_options(use_easyocr: bool = False) -> dict:
+    """Settings that change OCR output, for cache keys."""
+    if use_easyocr or not settings.OCR_PREPROCESS:
+        return {"preprocess": False}
+    return {"preprocess": True, "target_dpi": settings.OCR_TARGET_DPI, "deskew": settings.OCR_DESKEW}
+
+
+def _tesseract_page(image) -> str:
+    # Runs inside pool workers too, so preprocessing is parallelised with OCR
+    return pytesseract.image_to_string(prepare_for_tesseract(image))
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Lazily create the bounded process pool shared by all OCR callers."""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            workers = settings.OCR_PROCESS_WORKERS or os.cpu_count() or 1
+            _process_pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_ocr_worker)
+        return _process_pool
+
+
+def shutdown_ocr_workers():
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=True, cancel_futures=True)
+            _process_pool = None
+
+
+def ocr_pages(images, use_easyocr: bool = False, parallel: bool | None = None) -> list[str]:
+    """
+    Run OCR over a list of page images and return one text per page, in page order.
+    - EasyOCR: batched through the shared reader pool
+    - Tesseract: fanned out to the process pool when there are enough pages
+    """
+    if use_easyocr:
+        return easyocr_pool.read_pages(images)
+
+    if parallel is None:
+        parallel = settings.OCR_PARALLEL_PAGES
+    if parallel and len(images) >= settings.OCR_PARALLEL_MIN_PAGES:
+        # map() yields results in submission order, so pages stay in order
+        return list(get_process_pool().map(_tesseract_page, images))
+    return [_tesseract_page(img) for img in images]
+
+
+# ==============================
+# 🔹 PAGE-AT-A-TIME PDF OCR
+# ==============================
+
+def pdf_page_count(pdf_path: str, poppler_path: str | None = None) -> int:
+    return int(pdfinfo_from_path(pdf_path, poppler_path=poppler_path)["Pages"])
+
+
+def rasterize_page(pdf_path: str, page_number: int, dpi: int, poppler_path: str | None = None):
+    """Render a single 1-based page, so only one page bitmap is alive at a time."""
+    image = convert_from_path(
+        pdf_path, dpi=dpi, first_page=page_number, last_page=page_number, poppler_path=poppler_path
+    )[0]
+    image.info["dpi"] = (dpi, dpi)
+    return image
+
+
+def _ocr_pdf_page(pdf_path: str, page_number: int, dpi: int, poppler_path: str | None) -> str:
+    image = rasterize_page(pdf_path, page_number, dpi, poppler_path)
+    try:
+        return _tesseract_page(image)
+    finally:
+        image.close()
+
+
+def iter_ocr_pdf_file(
+    pdf_path: str,
+    use_easyocr: bool = False,
+    dpi: int | None = None,
+    poppler_path: str | None = None,
+    parallel: bool | None = None,
+    page_numbers: list[int] | None = None,
+):
+    """
+    OCR a PDF on disk without holding every page bitmap in memory, yielding
+    each page's text in page order as soon as it is ready.
+    Tesseract pages are rasterized, OCR'd and released one at a time; in
+    parallel mode each pool worker rasterizes its own page, so peak memory is
+    bounded by the worker count rather than the page count. EasyOCR pages go
+    through the reader in groups of EASYOCR_PDF_PAGE_GROUP to keep batched
+    inference, so at most that many page bitmaps are alive at once.
+    `page_numbers` (1-based) limits OCR to those pages.
+    """
+    dpi = dpi or settings.PDF_RASTER_DPI
+    pages = page_numbers if page_numbers is not None else range(1, pdf_page_count(pdf_path, poppler_path) + 1)
+
+    if use_easyocr:
+        pages = list(pages)
+        group_size = max(1, settings.EASYOCR_PDF_PAGE_GROUP)
+        for start in range(0, len(pages), group_size):
+            images = [rasterize_page(pdf_path, n, dpi, poppler_path) for n in pages[start:start + group_size]]
+            try:
+                texts = easyocr_pool.read_pages(images)
+            finally:
+                for image in images:
+                    image.close()
+            yield from texts
+        return
+
+    if parallel is None:
+        parallel = settings.OCR_PARALLEL_PAGES
+    if parallel and len(pages) >= settings.OCR_PARALLEL_MIN_PAGES:
+        n = len(pages)
+        # map() submits every page up front and yields results in page order
+        yield from get_process_pool().map(_ocr_pdf_page, [pdf_path] * n, pages, [dpi] * n, [poppler_path] * n)
+        return
+    for page_number in pages:
+        yield _ocr_pdf_page(pdf_path, page_number, dpi, poppler_path)
+
+
+def ocr_pdf_file(pdf_path: str, **kwargs) -> list[str]:
+    """List form of iter_ocr_pdf_file."""
+    return list(iter_ocr_pdf_file(pdf_path, **kwargs))
+
+
+# ==============================
+# 🔹 EMBEDDED TEXT-LAYER FAST PATH
+# ==============================
+
+TEXT_LAYER = "text_layer"
+OCR = "ocr"
+
+
+def extract_text_layer(pdf_path: str, poppler_path: str | None = None) -> list[str] | None:
+    """
+    Per-page embedded text via poppler's pdftotext (installed alongside pdf2image).
+    Returns None if pdftotext is unavailable or fails, so callers fall back to OCR.
+    """
+    exe = "pdftotext.exe" if os.name == "nt" else "pdftotext"
+    cmd = [os.path.join(poppler_path, exe) if poppler_path else exe, "-layout", "-enc", "UTF-8", pdf_path, "-"]
+    try:
+        proc = subprocess.run(cmd, capture_output=True, timeout=60, check=True)
+    except (OSError, subprocess.SubprocessError) as e:
+        print(f"⚠️ pdftotext failed, using OCR: {e}")
+        return None
+    # pdftotext ends every page with a form feed
+    pages = proc.stdout.decode("utf-8", errors="ignore").split("\f")
+    if pages and pages[-1].strip() == "":
+        pages = pages[:-1]
+    return pages
+
+
+def has_usable_text(text: str) -> bool:
+    return sum(ch.isalnum() for ch in text) >= settings.PDF_TEXT_MIN_CHARS
+
+
+def iter_pdf(
+    pdf_path: str,
+    use_easyocr: bool = False,
+    dpi: int | None = None,
+    poppler_path: str | None = None,
+    parallel: bool | None = None,
+    use_text_layer: bool | None = None,
+):
+    """
+    Yield (page_number, text, source) for every page of a PDF, in order;
+    source is "text_layer" or "ocr". Digital PDFs are read from their embedded
+    text; only pages without usable text are rasterized and OCR'd.
+    """
+    if use_text_layer is None:
+        use_text_layer = settings.PDF_TEXT_LAYER
+    page_count = pdf_page_count(pdf_path, poppler_path)
+
+    layer = extract_text_layer(pdf_path, poppler_path) if use_text_layer else None
+    if layer is None or len(layer) != page_count:
+        layer = [""] * page_count
+
+    missing = [i + 1 for i, text in enumerate(layer) if not has_usable_text(text)]
+    ocr_texts = iter_ocr_pdf_file(
+        pdf_path, use_easyocr=use_easyocr, dpi=dpi, poppler_path=poppler_path,
+        parallel=parallel, page_numbers=missing,
+    ) if missing else iter(())
+
+    for page_number, text in enumerate(layer, start=1):
+        if has_usable_text(text):
+            yield page_number, text, TEXT_LAYER
+        else:
+            yield page_number, next(ocr_texts), OCR
+
+
+def read_pdf(pdf_path: str, **kwargs) -> list[tuple[str, str]]:
+    """(text, source) for every page of a PDF; see iter_pdf."""
+    return [(text, source) for _, text, source in iter_pdf(pdf_path, **kwargs)]
@@ -0,0 +1,205 @@
+# backend/app/services/report_backfill.py
+"""
+Re-run cleaning, extraction and analysis over stored ReportLog rows, e.g.
+after the extractor or the classifier improves.
+
+Run from backend/ (DATABASE_URL set as for the API):
+    python -m app.services.report_backfill --workers 4 --batch-size 500
+
+- Rows are read by keyset pagination (WHERE id > last ORDER BY id LIMIT n),
+  so memory stays flat however many rows there are
+- Each page is processed on a process pool while the next one is read
+- Results are written back with one executemany UPDATE per page
+- The last committed id goes to a checkpoint file; rerunning resumes there
+  (--restart starts over)
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from sqlalchemy import bindparam, select, update
+
+from ..db.models import Patient, ReportLog
+from ..utils.report_analyzer import analyze_reports_batch
+from ..utils.text_cleaner import clean_text, extract_structured_fields
+
+DEFAULT_CHECKPOINT = "outputs/report_backfill.json"
+
+_table = ReportLog.__table__
+_patients = Patient.__table__
+
+
+def reanalyze_rows(rows: list[tuple]) -> list[dict]:
+    """
+    (id, raw_text, cleaned_text, patient gender, patient age) rows → update
+    parameters for each row. Runs inside pool workers, so it only touches the
+    pure text/ML helpers; the page is classified as one batch.
+    """
+    rows = [row for row in rows if row[1] is not None or row[2] is not None]
+    cleaned = [clean_text(raw_text if raw_text is not None else cleaned_text) for _, raw_text, cleaned_text, _, _ in rows]
+    structured = [extract_structured_fields(text) for text in cleaned]
+    analyses = analyze_reports_batch(structured, sexes=[row[3] for row in rows], ages=[row[4] for row in rows])
+    return [
+        {
+            "b_id": row[0],
+            "cleaned_text": text,
+            "structured_output": json.dumps(fields),
+            "analysis": json.dumps(analysis),
+        }
+        for row, text, fields, analysis in zip(rows, cleaned, structured, analyses)
+    ]
+
+
+# ==============================
+# 🔹 CHECKPOINT
+# ==============================
+
+def load_checkpoint(path: str) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"last_id": 0, "rows_read": 0, "rows_updated": 0}
+
+
+def save_checkpoint(path: str, state: dict):
+    # Temp file + rename so a crash never leaves a half-written checkpoint
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+
+# ==============================
+# 🔹 BACKFILL
+# ==============================
+
+def _read_page(conn, after_id: int, batch_size: int, max_id: int | None) -> list[tuple]:
+    query = (
+        select(_table.c.id, _table.c.raw_text, _table.c.cleaned_text, _patients.c.gender, _patients.c.age)
+        .select_from(_table.outerjoin(_patients, _table.c.patient_id == _patients.c.id))
+        .where(_table.c.id > after_id)
+    )
+    if max_id is not None:
+        query = query.where(_table.c.id <= max_id)
+    return [tuple(row) for row in conn.execute(query.order_by(_table.c.id).limit(batch_size))]
+
+
+def _write_updates(engine, updates: list[dict]):
+    if not updates:
+        return
+    statement = (
+        update(_table)
+        .where(_table.c.id == bindparam("b_id"))
+        .values(
+            cleaned_text=bindparam("cleaned_text"),
+            structured_output=bindparam("structured_output"),
+            analysis=bindparam("analysis"),
+        )
+    )
+    with engine.begin() as conn:
+        conn.execute(statement, updates)
+
+
+def run_backfill(
+    engine,
+    batch_size: int = 500,
+    workers: int = 1,
+    checkpoint_path: str = DEFAULT_CHECKPOINT,
+    restart: bool = False,
+    max_id: int | None = None,
+    max_batches: int | None = None,
+    dry_run: bool = False,
+) -> dict:
+    """
+    Backfill report_logs from the checkpoint onwards. Returns the final checkpoint state.
+    max_batches stops early (the next run resumes); dry_run computes but writes nothing.
+    """
+    state = {"last_id": 0, "rows_read": 0, "rows_updated": 0} if restart else load_checkpoint(checkpoint_path)
+    print(f"🔁 Report backfill from id > {state['last_id']} (batch {batch_size}, {workers} workers)")
+
+    pool = None
+    if workers > 1:
+        # spawn: workers must not inherit the parent's DB connections
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+    start = time.perf_counter()
+    pending = deque()  # (last id of page, row count, future or result), in id order
+    cursor_id = state["last_id"]
+    batches = 0
+    exhausted = False
+
+    try:
+        while True:
+            # Keep every worker busy, plus one page queued, without reading ahead further
+            while not exhausted and len(pending) < max(1, workers) + 1:
+                if max_batches is not None and batches >= max_batches:
+                    exhausted = True
+                    break
+                with engine.connect() as conn:
+                    rows = _read_page(conn, cursor_id, batch_size, max_id)
+                if not rows:
+                    exhausted = True
+                    break
+                cursor_id = rows[-1][0]
+                batches += 1
+                work = pool.submit(reanalyze_rows, rows) if pool else reanalyze_rows(rows)
+                pending.append((cursor_id, len(rows), work))
+
+            if not pending:
+                break
+
+            # Commit pages strictly in id order so the checkpoint never skips rows
+            last_id, row_count, work = pending.popleft()
+            updates = work.result() if pool else work
+            if not dry_run:
+                _write_updates(engine, updates)
+            state["last_id"] = last_id
+            state["rows_read"] += row_count
+            state["rows_updated"] += 0 if dry_run else len(updates)
+            if not dry_run:
+                save_checkpoint(checkpoint_path, state)
+
+            elapsed = time.perf_counter() - start
+            print(f"📦 Up to id {last_id}: {state['rows_read']} rows read, {state['rows_updated']} updated "
+                  f"({state['rows_read'] / elapsed if elapsed else 0:.0f} rows/s)")
+    finally:
+        if pool:
+            pool.shutdown(cancel_futures=True)
+
+    print(f"✅ Report backfill finished at id {state['last_id']} in {time.perf_counter() - start:.1f}s")
+    return state
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recompute structured_output and analysis for stored reports")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT)
+    parser.add_argument("--restart", action="store_true", help="ignore the checkpoint and start from the first row")
+    parser.add_argument("--max-id", type=int, default=None, help="only rows with id <= this (e.g. rows existing at start)")
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    from ..db.session import engine  # needs DATABASE_URL; imported here so the helpers stay testable
+
+    run_backfill(
+        engine,
+        batch_size=args.batch_size,
+        workers=args.workers,
+        checkpoint_path=args.checkpoint,
+        restart=args.restart,
+        max_id=args.max_id,
+        dry_run=args.dry_run,
+    )
+
+
+if __name__ == "__main__":
+    main()
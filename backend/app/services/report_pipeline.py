@@ -0,0 +1,272 @@
+# backend/app/services/report_pipeline.py
+import io
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from ..core.config import settings
+from ..db import log_sink
+from ..db.models import Patient, ReportLog
+from ..db.session import SessionLocal
+from ..utils.report_analyzer import analyze_report
+from ..utils.text_cleaner import clean_text, extract_structured_fields
+from .ocr_cache import cache_key, content_digest, ocr_cache
+from .ocr_service import iter_pdf, ocr_options, ocr_pages, open_image, read_pdf
+
+
+def _ocr_cache_key(digest: str, filename: str, use_easyocr: bool) -> str:
+    is_pdf = filename.lower().endswith(".pdf")
+    options = {"kind": "pdf" if is_pdf else "image", **ocr_options(use_easyocr)}
+    if is_pdf:
+        options["text_layer"] = settings.PDF_TEXT_LAYER
+        options["text_min_chars"] = settings.PDF_TEXT_MIN_CHARS
+        options["raster_dpi"] = settings.PDF_RASTER_DPI
+    return cache_key(digest, "easyocr" if use_easyocr else "tesseract", options)
+
+
+def _cached_ocr(key: str, run_ocr) -> tuple[str, list[dict]]:
+    # ♻️ Repeat uploads of the same bytes skip rasterization and OCR
+    cached = ocr_cache.get(key) if settings.OCR_CACHE_ENABLED else None
+    if cached is not None:
+        print("♻️ OCR cache hit")
+        return cached["raw_text"], cached.get("pages", [])
+
+    raw_text, pages = run_ocr()
+    if settings.OCR_CACHE_ENABLED:
+        ocr_cache.set(key, {"raw_text": raw_text, "pages": pages})
+    return raw_text, pages
+
+
+def _read_pdf_file(path: str, use_easyocr: bool) -> tuple[str, list[dict]]:
+    results = read_pdf(path, use_easyocr=use_easyocr)
+    pages = [{"page": i + 1, "source": source} for i, (_, source) in enumerate(results)]
+    ocr_count = sum(1 for page in pages if page["source"] == "ocr")
+    print(f"📄 PDF pages: {len(pages)} ({len(pages) - ocr_count} text layer, {ocr_count} OCR)")
+    return "".join(text + "\n" for text, _ in results), pages
+
+
+def extract_text(contents: bytes, filename: str, use_easyocr: bool = False) -> tuple[str, list[dict]]:
+    """
+    OCR an uploaded PDF or image held in memory, going through the OCR result cache.
+    Returns (raw_text, pages) where pages records the source of each page's text.
+    """
+    def run_ocr():
+        # 🧠 Handle PDF or image input
+        if filename.lower().endswith(".pdf"):
+            # poppler's text-layer and per-page tools work on files
+            fd, tmp_path = tempfile.mkstemp(suffix=".pdf")
+            try:
+                with os.fdopen(fd, "wb") as tmp:
+                    tmp.write(contents)
+                return _read_pdf_file(tmp_path, use_easyocr)
+            finally:
+                os.remove(tmp_path)
+        image = open_image(io.BytesIO(contents), use_easyocr=use_easyocr)
+        return ocr_pages([image], use_easyocr=use_easyocr)[0], [{"page": 1, "source": "ocr"}]
+
+    return _cached_ocr(_ocr_cache_key(content_digest(contents), filename, use_easyocr), run_ocr)
+
+
+def extract_text_from_path(path: str, filename: str, digest: str, use_easyocr: bool = False) -> tuple[str, list[dict]]:
+    """
+    Same as extract_text for a spooled upload on disk. PDFs use their embedded
+    text where present and are otherwise rasterized one page at a time, so
+    memory stays flat regardless of page count.
+    """
+    def run_ocr():
+        if filename.lower().endswith(".pdf"):
+            return _read_pdf_file(path, use_easyocr)
+        with open_image(path, use_easyocr=use_easyocr) as image:
+            return ocr_pages([image], use_easyocr=use_easyocr)[0], [{"page": 1, "source": "ocr"}]
+
+    return _cached_ocr(_ocr_cache_key(digest, filename, use_easyocr), run_ocr)
+
+
+def analyze_text(raw_text: str, sex: str | None = None, age: int | None = None):
+    """clean_text → extract_structured_fields → analyze_report (sex/age pick reference ranges)"""
+    cleaned = clean_text(raw_text)
+    structured = extract_structured_fields(cleaned)
+    results = analyze_report(structured, sex=sex, age=age)
+    return cleaned, structured, results
+
+
+def patient_profile(patient_id: int | None) -> dict:
+    """Patient sex and age as analyze_text keyword arguments ({} when unknown)."""
+    if patient_id is None:
+        return {}
+    db = SessionLocal()
+    try:
+        patient = db.query(Patient).filter(Patient.id == patient_id).first()
+        return {"sex": patient.gender, "age": patient.age} if patient else {}
+    finally:
+        db.close()
+
+
+def save_report_log(filename: str, raw_text: str, cleaned: str, structured: dict, results, patient_id: int | None) -> ReportLog:
+    """Store one ReportLog through the write-behind sink; returns once it has an id."""
+    log = ReportLog(
+        filename=filename,
+        raw_text=raw_text,
+        cleaned_text=cleaned,
+        structured_output=json.dumps(structured),
+        analysis=json.dumps(results),
+        patient_id=patient_id
+    )
+    return log_sink.write(log).result()
+
+
+def save_report_logs(rows: list[dict]) -> list[ReportLog]:
+    """Insert many ReportLog rows in one transaction (one write_all item in the sink)."""
+    return log_sink.write_all([
+        ReportLog(
+            filename=row["filename"],
+            raw_text=row["raw_text"],
+            cleaned_text=row["cleaned_text"],
+            structured_output=json.dumps(row["structured_output"]),
+            analysis=json.dumps(row["analysis"]),
+            patient_id=row["patient_id"],
+        )
+        for row in rows
+    ])
+
+
+def report_response(raw_text: str, pages: list[dict], cleaned: str, structured: dict, results, log: ReportLog) -> dict:
+    """Response body shared by /clean_and_analyze and job results."""
+    return {
+        "raw_text": raw_text,
+        "cleaned_text": cleaned,
+        "structured_output": structured,
+        "analysis": results,
+        "log_id": log.id,
+        "patient_id": log.patient_id,
+        "pages": pages,
+    }
+
+
+def _finish_report(raw_text: str, pages: list[dict], filename: str, patient_id: int | None) -> dict:
+    print(f"🔤 Extracted text (first 200 chars): {raw_text[:200]}...")
+
+    cleaned, structured, results = analyze_text(raw_text, **patient_profile(patient_id))
+    log = save_report_log(filename, raw_text, cleaned, structured, results, patient_id)
+    print(f"✅ Saved uploaded file log ID: {log.id} for patient ID: {log.patient_id}")
+    return report_response(raw_text, pages, cleaned, structured, results, log)
+
+
+def process_report(contents: bytes, filename: str, patient_id: int | None = None, use_easyocr: bool = False) -> dict:
+    """Full upload pipeline: OCR, clean, extract, analyze and store the ReportLog."""
+    raw_text, pages = extract_text(contents, filename, use_easyocr=use_easyocr)
+    return _finish_report(raw_text, pages, filename, patient_id)
+
+
+def process_report_file(path: str, filename: str, digest: str, patient_id: int | None = None, use_easyocr: bool = False) -> dict:
+    """Same as process_report, for an upload spooled to disk."""
+    raw_text, pages = extract_text_from_path(path, filename, digest, use_easyocr=use_easyocr)
+    return _finish_report(raw_text, pages, filename, patient_id)
+
+
+def stream_report_file(path: str, filename: str, digest: str, patient_id: int | None = None, use_easyocr: bool = False):
+    """
+    Incremental version of process_report_file. Yields (event, data) pairs:
+    - "page": text of one page (with its source) as soon as it is read
+    - "partial": structured fields found in the pages read so far (each page
+      is extracted once and merged; the first mention of an analyte wins, as
+      in extract_structured_fields)
+    - "analysis": final cleaned text, structured fields and findings
+    - "done": log id plus time_to_first_result_ms and total_ms
+    """
+    start = time.perf_counter()
+    first_result_ms = None
+
+    def mark_first_result():
+        nonlocal first_result_ms
+        if first_result_ms is None:
+            first_result_ms = round((time.perf_counter() - start) * 1000, 1)
+
+    key = _ocr_cache_key(digest, filename, use_easyocr)
+    cached = ocr_cache.get(key) if settings.OCR_CACHE_ENABLED else None
+    if cached is not None:
+        print("♻️ OCR cache hit")
+        raw_text, pages = cached["raw_text"], cached.get("pages", [])
+        mark_first_result()
+        yield "page", {"page": None, "source": "cache", "text": raw_text}
+    else:
+        if filename.lower().endswith(".pdf"):
+            page_iter = iter_pdf(path, use_easyocr=use_easyocr)
+        else:
+            def page_iter_image():
+                with open_image(path, use_easyocr=use_easyocr) as image:
+                    yield 1, ocr_pages([image], use_easyocr=use_easyocr)[0], "ocr"
+            page_iter = page_iter_image()
+
+        raw_text, pages, fields_so_far = "", [], {}
+        for page_number, text, source in page_iter:
+            raw_text += text + "\n"
+            pages.append({"page": page_number, "source": source})
+            mark_first_result()
+            yield "page", {"page": page_number, "source": source, "text": text}
+            for name, field in extract_structured_fields(clean_text(text)).items():
+                fields_so_far.setdefault(name, field)
+            yield "partial", {"page": page_number, "structured_output": dict(fields_so_far)}
+
+        if settings.OCR_CACHE_ENABLED:
+            ocr_cache.set(key, {"raw_text": raw_text, "pages": pages})
+
+    cleaned, structured, results = analyze_text(raw_text, **patient_profile(patient_id))
+    yield "analysis", {"cleaned_text": cleaned, "structured_output": structured, "analysis": results, "pages": pages}
+
+    log = save_report_log(filename, raw_text, cleaned, structured, results, patient_id)
+    total_ms = round((time.perf_counter() - start) * 1000, 1)
+    print(f"✅ Streamed report log ID: {log.id} (first result {first_result_ms} ms, total {total_ms} ms)")
+    yield "done", {
+        "log_id": log.id,
+        "patient_id": log.patient_id,
+        "time_to_first_result_ms": first_result_ms,
+        "total_ms": total_ms,
+    }
+
+
+_batch_executor = ThreadPoolExecutor(max_workers=settings.BATCH_OCR_CONCURRENCY, thread_name_prefix="batch-ocr")
+
+
+def process_report_batch(files: list[tuple[str, str, str]], patient_id: int | None = None, use_easyocr: bool = False) -> list[dict]:
+    """
+    Pipeline for many spooled uploads of one patient.
+    `files` is a list of (path, filename, digest). Files are OCR'd concurrently
+    on a pool shared by all batch requests; every successful report is stored
+    in a single transaction. Returns one result per file, in input order, with
+    status "ok" or "error".
+    """
+    profile = patient_profile(patient_id)
+    futures = [
+        _batch_executor.submit(extract_text_from_path, path, filename, digest, use_easyocr)
+        for path, filename, digest in files
+    ]
+
+    results, rows = [], []
+    for (_, filename, _), future in zip(files, futures):
+        try:
+            raw_text, pages = future.result()
+            cleaned, structured, analysis = analyze_text(raw_text, **profile)
+        except Exception as e:
+            print(f"❌ Batch file '{filename}' failed: {e}")
+            results.append({"filename": filename, "status": "error", "error": str(e)})
+            continue
+        row = {
+            "filename": filename,
+            "raw_text": raw_text,
+            "cleaned_text": cleaned,
+            "structured_output": structured,
+            "analysis": analysis,
+            "patient_id": patient_id,
+        }
+        rows.append(row)
+        results.append({"status": "ok", **row, "pages": pages})
+
+    logs = save_report_logs(rows) if rows else []
+    ok_results = [result for result in results if result["status"] == "ok"]
+    for result, log in zip(ok_results, logs):
+        result["log_id"] = log.id
+    print(f"✅ Saved {len(logs)} batch report logs for patient ID: {patient_id}")
+    return results
@@ -1,25 +1,41 @@
-from llama_cpp import Llama
 import os
+import threading
+import time
+
+from ..ml.model_store import LazyModel
 
-# Load model once at startup
 MODEL_PATH = "models/llama-2-7b-chat.Q4_K_M.gguf"
-if not os.path.exists(MODEL_PATH):
-    raise FileNotFoundError(f"GenAI model not found at {MODEL_PATH}")
 
-llm = Llama(
-    model_path=MODEL_PATH,
-    n_ctx=2048,        # Context window
-    n_threads=4,       # CPU threads
-    n_gpu_layers=0,    # 0 = CPU only
-    verbose=False
-)
 
-def generate_health_response(user_message: str, patient_context: str = "") -> str:
-    """
-    Generate a health-focused response using Llama-2.
-    """
+def _load_llm():
+    # Imported here: llama_cpp is only needed once chat is actually used
+    from llama_cpp import Llama
+
+    if not os.path.exists(MODEL_PATH):
+        raise FileNotFoundError(f"GenAI model not found at {MODEL_PATH}")
+    return Llama(
+        model_path=MODEL_PATH,
+        n_ctx=2048,        # Context window
+        n_threads=4,       # CPU threads
+        n_gpu_layers=0,    # 0 = CPU only
+        verbose=False
+    )
+
+
+# Loaded on first chat request (or by the startup warm-up); a missing GGUF only disables chat
+llm = LazyModel("llama_chat", _load_llm)
+
+# llama.cpp contexts aren't thread-safe: one generation at a time, streamed or not
+_generation_lock = threading.Lock()
+
+MAX_TOKENS = 256
+STOP = ["</s>", "[/INST]"]
+FALLBACK_RESPONSE = "I'm here to help with general health information. Please consult a doctor for medical advice."
+
+
+def build_prompt(user_message: str, patient_context: str = "") -> str:
     # Build prompt with health-specific instructions
-    prompt = f"""<s>[INST] <<SYS>>
+    return f"""<s>[INST] <<SYS>>
 You are a helpful, respectful, and honest AI Health Assistant. 
 Always provide safe, general health information. Never diagnose. 
 Always advise consulting a real doctor for medical concerns.
@@ -30,12 +46,66 @@ User message: {user_message}
 
 Provide a concise, empathetic response. [/INST]"""
 
-    output = llm(
-        prompt,
-        max_tokens=256,
-        stop=["</s>", "[/INST]"],
-        echo=False
-    )
+
+def generate_health_response(user_message: str, patient_context: str = "") -> str:
+    """
+    Generate a health-focused response using Llama-2.
+    """
+    model = llm.get()
+    with _generation_lock:
+        output = model(
+            build_prompt(user_message, patient_context),
+            max_tokens=MAX_TOKENS,
+            stop=STOP,
+            echo=False
+        )
     
     response = output["choices"][0]["text"].strip()
-    return response if response else "I'm here to help with general health information. Please consult a doctor for medical advice."
\ No newline at end of file
+    return response if response else FALLBACK_RESPONSE
+
+
+def stream_health_response(user_message: str, patient_context: str = "", cancel: threading.Event | None = None):
+    """
+    Same as generate_health_response, token by token. Yields
+    ("token", {"text"}) as llama.cpp produces them, then ("done", stats)
+    with time_to_first_token_ms and tokens_per_sec. Setting `cancel` (or
+    closing the generator) stops generation after the current token and
+    frees the model for the next request; if it is set while waiting for
+    the model, the prompt is never evaluated.
+    """
+    model = llm.get()
+    requested = time.perf_counter()
+    with _generation_lock:
+        start = time.perf_counter()
+        first_token_at, tokens, finish_reason = None, 0, None
+        # Cancelled while queued behind another generation: don't pay for prompt evaluation
+        cancelled = cancel is not None and cancel.is_set()
+        if not cancelled:
+            chunks = model(build_prompt(user_message, patient_context), max_tokens=MAX_TOKENS, stop=STOP, echo=False, stream=True)
+            try:
+                for chunk in chunks:
+                    if cancel is not None and cancel.is_set():
+                        cancelled = True
+                        break
+                    choice = chunk["choices"][0]
+                    finish_reason = choice.get("finish_reason") or finish_reason
+                    if not choice["text"]:
+                        continue
+                    tokens += 1
+                    if first_token_at is None:
+                        first_token_at = time.perf_counter()
+                    yield "token", {"text": choice["text"]}
+            finally:
+                chunks.close()  # stop llama.cpp right away when the consumer goes away
+        end = time.perf_counter()
+
+    decode_seconds = end - first_token_at if first_token_at is not None else 0.0
+    yield "done", {
+        "tokens": tokens,
+        "finish_reason": "cancelled" if cancelled else finish_reason,
+        "queue_ms": round((start - requested) * 1000, 1),
+        "time_to_first_token_ms": round((first_token_at - start) * 1000, 1) if first_token_at is not None else None,
+        # Decode speed after the first token (prompt processing is in time_to_first_token_ms)
+        "tokens_per_sec": round((tokens - 1) / decode_seconds, 2) if tokens > 1 and decode_seconds > 0 else None,
+        "total_ms": round((end - start) * 1000, 1),
+    }
@@ -0,0 +1,147 @@
+# backend/app/utils/image_preprocessor.py
+import numpy as np
+from PIL import Image, ImageFilter
+
+# Assumed physical size of a lab report page (US letter, long side) when the
+# image carries no usable DPI metadata, e.g. phone photos.
+PAGE_LONG_SIDE_INCHES = 11.0
+# Defaults written by cameras and image editors, not a real scan resolution
+PLACEHOLDER_DPIS = (72, 96)
+# Upscaling past 2x adds pixels without adding detail
+MAX_UPSCALE = 2.0
+# ~1.5 letter pages at 300 DPI: Tesseract time and memory grow with pixel count
+MAX_OCR_PIXELS = 12_000_000
+
+
+def metadata_dpi(image: Image.Image) -> float | None:
+    """DPI from metadata, or None when it is missing or a placeholder."""
+    dpi = image.info.get("dpi")
+    if dpi and dpi[0] and dpi[0] > 1 and round(float(dpi[0])) not in PLACEHOLDER_DPIS:
+        return float(dpi[0])
+    return None
+
+
+def effective_dpi(image: Image.Image) -> float:
+    """DPI from metadata if it looks real, else estimated from the page's long side."""
+    return metadata_dpi(image) or max(image.size) / PAGE_LONG_SIDE_INCHES
+
+
+def target_size(image: Image.Image, target_dpi: int) -> tuple[int, int]:
+    """
+    Size the image should be OCR'd at.
+    - Larger than target DPI → scale down (Tesseract time grows with pixel count)
+    - Far below target DPI (< half) → scale up so glyphs are tall enough, at most MAX_UPSCALE
+    - Otherwise keep as is
+    Never more than MAX_OCR_PIXELS in total.
+    """
+    dpi = effective_dpi(image)
+    scale = 1.0
+    if dpi > target_dpi or dpi < target_dpi / 2:
+        scale = min(target_dpi / dpi, MAX_UPSCALE)
+    pixels = image.width * image.height * scale * scale
+    if pixels > MAX_OCR_PIXELS:
+        scale *= (MAX_OCR_PIXELS / pixels) ** 0.5
+    if scale == 1.0:
+        return image.size
+    return max(1, round(image.width * scale)), max(1, round(image.height * scale))
+
+
+def load_image(path_or_file, target_dpi: int = 300) -> Image.Image:
+    """
+    Open an image for OCR. JPEGs are decoded straight to grayscale at a
+    reduced DCT scale when they are much larger than needed, which skips most
+    of the decode work for phone photos.
+    """
+    image = Image.open(path_or_file)
+    if image.format == "JPEG":
+        original_width, dpi = image.width, metadata_dpi(image)
+        image.draft("L", target_size(image, target_dpi))
+        if dpi and image.width != original_width:
+            # draft() shrinks the pixels but not the metadata; keep DPI in step
+            # so normalize_dpi doesn't downscale a second time
+            scaled = dpi * image.width / original_width
+            image.info["dpi"] = (scaled, scaled)
+    return image
+
+
+def normalize_dpi(image: Image.Image, target_dpi: int = 300) -> Image.Image:
+    size = target_size(image, target_dpi)
+    if size == image.size:
+        return image
+    resized = image.resize(size, Image.LANCZOS if size[0] < image.width else Image.BICUBIC)
+    resized.info["dpi"] = (target_dpi, target_dpi)
+    return resized
+
+
+def to_grayscale(image: Image.Image) -> Image.Image:
+    if image.mode == "L":
+        return image
+    if image.mode in ("RGBA", "LA", "P"):
+        # Flatten transparency onto white so it doesn't turn into black ink
+        background = Image.new("RGB", image.size, "white")
+        rgba = image.convert("RGBA")
+        background.paste(rgba, mask=rgba.split()[-1])
+        if "dpi" in image.info:
+            background.info["dpi"] = image.info["dpi"]
+        image = background
+    return image.convert("L")
+
+
+def binarize(gray: Image.Image, block_size: int = 31, offset: int = 10) -> Image.Image:
+    """
+    Adaptive mean threshold: a pixel is ink if it is `offset` darker than its
+    neighbourhood. Copes with the uneven lighting of phone photos, unlike a
+    single global threshold.
+    """
+    local_mean = np.asarray(gray.filter(ImageFilter.BoxBlur(block_size // 2)), dtype=np.int16)
+    pixels = np.asarray(gray, dtype=np.int16)
+    ink = pixels < (local_mean - offset)
+    return Image.fromarray(np.where(ink, 0, 255).astype(np.uint8), mode="L")
+
+
+def estimate_skew(binary: Image.Image, max_angle: float = 5.0, step: float = 0.25, sample_width: int = 800) -> float:
+    """
+    Skew angle in degrees (PIL rotate convention) that makes text lines horizontal.
+    Projection-profile search on a downsampled copy: the right angle gives the
+    sharpest row histogram.
+    """
+    scale = min(1.0, sample_width / binary.width)
+    small = binary.resize((max(1, int(binary.width * scale)), max(1, int(binary.height * scale))), Image.NEAREST)
+    ys, xs = np.nonzero(np.asarray(small) < 128)
+    if len(xs) < 50:
+        return 0.0
+    if len(xs) > 20000:
+        keep = np.random.default_rng(0).choice(len(xs), 20000, replace=False)
+        xs, ys = xs[keep], ys[keep]
+
+    best_angle, best_score = 0.0, -1.0
+    n_rows = small.height * 2
+    for angle in np.arange(-max_angle, max_angle + step / 2, step):
+        theta = np.deg2rad(angle)
+        rows = (ys * np.cos(theta) - xs * np.sin(theta)).astype(np.int32) + small.height // 2
+        hist = np.bincount(np.clip(rows, 0, n_rows - 1), minlength=n_rows).astype(np.float64)
+        score = float(np.sum(np.diff(hist) ** 2))
+        if score > best_score:
+            best_angle, best_score = float(angle), score
+    return best_angle
+
+
+def deskew(binary: Image.Image, max_angle: float = 5.0, min_angle: float = 0.3) -> Image.Image:
+    angle = estimate_skew(binary, max_angle=max_angle)
+    if abs(angle) < min_angle:
+        return binary
+    return binary.rotate(angle, resample=Image.NEAREST, expand=True, fillcolor=255)
+
+
+def preprocess_for_ocr(image: Image.Image, target_dpi: int = 300, do_binarize: bool = True, do_deskew: bool = True) -> Image.Image:
+    """
+    Shared OCR preprocessing:
+    grayscale → DPI normalisation → adaptive binarization → deskew
+    """
+    image = to_grayscale(image)
+    image = normalize_dpi(image, target_dpi)
+    if do_binarize:
+        image = binarize(image)
+        if do_deskew:
+            image = deskew(image)
+    return image
@@ -0,0 +1,165 @@
+# backend/app/utils/reference_ranges.py
+"""
+Reference-range rule engine.
+
+Every rule is one row of REFERENCE_RANGES; adding an analyte or a sex/age
+specific range is a data change. Values are in canonical units (see
+CANONICAL_UNITS in text_cleaner). For each report and analyte the most
+specific applicable row wins: sex-specific beats "any", an age band beats
+all ages. Reports without sex/age only use the general rows.
+
+The table is compiled into arrays once; evaluate() checks all analytes of
+any number of reports with a handful of array comparisons. A single report
+takes a scalar walk over the same compiled rules, which beats array setup.
+"""
+import math
+
+import numpy as np
+
+ANY = "any"
+
+# (analyte, unit, sex, age_min, age_max, low, high, low message, high message)
+# Age band is [age_min, age_max) in years, None = open. low/high None = no limit.
+# A value is abnormal when value < low or value > high.
+REFERENCE_RANGES = [
+    ("hemoglobin", "g/dL", ANY, None, None, 12.0, 16.5, "Possible anemia risk", "Possible polycythemia"),
+    ("hemoglobin", "g/dL", "male", 18, None, 13.5, 17.5, "Possible anemia risk", "Possible polycythemia"),
+    ("hemoglobin", "g/dL", "female", 18, None, 12.0, 15.5, "Possible anemia risk", "Possible polycythemia"),
+    ("hemoglobin", "g/dL", ANY, None, 12, 11.0, 15.5, "Possible anemia risk", "Possible polycythemia"),
+    ("glucose", "mg/dL", ANY, None, None, 70, 126, "Possible hypoglycemia", "Possible diabetes risk"),
+    ("cholesterol", "mg/dL", ANY, None, None, None, 200, None, "High cholesterol (risk of heart disease)"),
+    ("cholesterol", "mg/dL", ANY, None, 20, None, 170, None, "High cholesterol (risk of heart disease)"),
+    ("wbc", "cells/μL", ANY, None, None, 4000, 11000, "Possible leukopenia (low immunity)", "Possible infection / inflammation"),
+    ("wbc", "cells/μL", ANY, None, 12, 5000, 14500, "Possible leukopenia (low immunity)", "Possible infection / inflammation"),
+    ("hba1c", "%", ANY, None, None, None, 6.4, None, "Possible diabetes risk"),
+    ("creatinine", "mg/dL", ANY, None, None, 0.6, 1.3, "Low creatinine (low muscle mass)", "Possible kidney dysfunction"),
+    ("creatinine", "mg/dL", "male", 18, None, 0.7, 1.3, "Low creatinine (low muscle mass)", "Possible kidney dysfunction"),
+    ("creatinine", "mg/dL", "female", 18, None, 0.6, 1.1, "Low creatinine (low muscle mass)", "Possible kidney dysfunction"),
+    ("tsh", "uIU/mL", ANY, None, None, 0.4, 4.0, "Possible hyperthyroidism", "Possible hypothyroidism"),
+    ("ldl", "mg/dL", ANY, None, None, None, 160, None, "High LDL cholesterol (risk of heart disease)"),
+    ("hdl", "mg/dL", ANY, None, None, 40, None, "Low HDL cholesterol (risk of heart disease)", None),
+    ("hdl", "mg/dL", "female", 18, None, 50, None, "Low HDL cholesterol (risk of heart disease)", None),
+    ("triglycerides", "mg/dL", ANY, None, None, None, 150, None, "High triglycerides (risk of heart disease)"),
+]
+
+# Display names used in messages; analytes not listed are shown by key
+ANALYTE_LABELS = {
+    "hemoglobin": "Hemoglobin",
+    "glucose": "Glucose",
+    "cholesterol": "Cholesterol",
+    "wbc": "WBC",
+    "hba1c": "HbA1c",
+    "creatinine": "Creatinine",
+    "tsh": "TSH",
+    "ldl": "LDL",
+    "hdl": "HDL",
+    "triglycerides": "Triglycerides",
+}
+
+_SEX_ALIASES = {"male": "male", "m": "male", "man": "male", "female": "female", "f": "female", "woman": "female"}
+_SEX_CODES = {"male": 1, "female": 2}
+
+
+def normalize_sex(sex) -> str | None:
+    """'Male' / 'F' / ... → "male" / "female"; anything else → None (general ranges only)."""
+    return _SEX_ALIASES.get(str(sex).strip().lower()) if sex else None
+
+
+class RuleEngine:
+    """REFERENCE_RANGES compiled into arrays, rules grouped by analyte."""
+
+    def __init__(self, rows: list[tuple]):
+        # Group rules by analyte, analytes in order of first appearance (= finding order)
+        self.analytes = list(dict.fromkeys(row[0] for row in rows))
+        rows = sorted(rows, key=lambda row: self.analytes.index(row[0]))
+        self.rows = rows
+
+        def col(i, default):
+            return np.array([default if row[i] is None else row[i] for row in rows], dtype=np.float64)
+
+        self.sex = np.array([_SEX_CODES.get(row[2], 0) for row in rows], dtype=np.int8)
+        self.age_min = col(3, -np.inf)
+        self.age_max = col(4, np.inf)
+        self.low = col(5, -np.inf)
+        self.high = col(6, np.inf)
+        self.has_age_band = np.isfinite(self.age_min) | np.isfinite(self.age_max)
+        # More specific rules score higher; ties go to the later row
+        specificity = (self.sex > 0) * 2 + self.has_age_band
+        self.score = specificity * len(rows) + np.arange(len(rows))
+
+        analyte_of_rule = [self.analytes.index(row[0]) for row in rows]
+        self.group_starts = np.searchsorted(analyte_of_rule, np.arange(len(self.analytes)))
+
+        # Scalar path: per analyte, (sex, age_min, age_max, low, high, banded, rule) most specific first
+        self._ordered = {analyte: [] for analyte in self.analytes}
+        for i in sorted(range(len(rows)), key=lambda i: -self.score[i]):
+            self._ordered[rows[i][0]].append((
+                int(self.sex[i]), float(self.age_min[i]), float(self.age_max[i]),
+                float(self.low[i]), float(self.high[i]), bool(self.has_age_band[i]), i,
+            ))
+
+    def _finding(self, rule: int, value: float, is_low: bool) -> dict:
+        analyte, unit, _, _, _, _, _, low_message, high_message = self.rows[rule]
+        return {
+            "type": analyte,
+            "value": value,
+            "unit": unit,
+            "message": f"{ANALYTE_LABELS.get(analyte, analyte)} {value} → {low_message if is_low else high_message}",
+            "is_abnormal": True
+        }
+
+    def _evaluate_one(self, values: dict, sex, age) -> list:
+        sex = _SEX_CODES.get(normalize_sex(sex), 0)
+        findings = []
+        for analyte, rules in self._ordered.items():
+            value = values.get(analyte)
+            if value is None:
+                continue
+            for rule_sex, age_min, age_max, low, high, banded, rule in rules:
+                if rule_sex and rule_sex != sex:
+                    continue
+                if banded and (age is None or not age_min <= age < age_max):
+                    continue
+                if value < low or value > high:
+                    findings.append(self._finding(rule, float(value), value < low))
+                break
+        return findings
+
+    def evaluate(self, values: list[dict], sexes=None, ages=None) -> list[list]:
+        """
+        values: canonical analyte values per report (see canonical_values).
+        sexes / ages: per-report patient sex and age (None where unknown).
+        Returns the abnormal findings of every report, in input order.
+        """
+        n = len(values)
+        if n == 0:
+            return []
+        sexes = sexes or [None] * n
+        ages = ages or [None] * n
+        if n == 1:
+            return [self._evaluate_one(values[0], sexes[0], ages[0])]
+
+        V = np.array([[row.get(name, math.nan) for name in self.analytes] for row in values], dtype=np.float64)
+        sex = np.array([_SEX_CODES.get(normalize_sex(s), 0) for s in sexes], dtype=np.int8)[:, None]
+        age = np.array([math.nan if a is None else float(a) for a in ages], dtype=np.float64)[:, None]
+
+        # Which rules apply to which report: (n_reports, n_rules)
+        sex_ok = (self.sex == 0) | (self.sex == sex)
+        age_ok = ~self.has_age_band | ((age >= self.age_min) & (age < self.age_max))
+        scores = np.where(sex_ok & age_ok, self.score, -1)
+
+        # Best applicable rule per (report, analyte); every analyte has a general row or none applies
+        best = np.maximum.reduceat(scores, self.group_starts, axis=1)
+        applies = best >= 0
+        rule = np.where(applies, best % len(self.rows), 0)
+
+        is_low = applies & (V < self.low[rule])
+        is_high = applies & (V > self.high[rule])
+
+        findings = [[] for _ in range(n)]
+        for r, a in zip(*np.nonzero(is_low | is_high)):
+            findings[r].append(self._finding(int(rule[r, a]), float(V[r, a]), bool(is_low[r, a])))
+        return findings
+
+
+rule_engine = RuleEngine(REFERENCE_RANGES)
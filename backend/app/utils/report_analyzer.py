@@ -1,143 +1,155 @@
 # backend/app/utils/report_analyzer.py
-import re
 import pickle
 import numpy as np
-import os
+import warnings
+
+from ..ml.batcher import ItemError, MicroBatcher
+from ..ml.flat_forest import FLAT_FOREST_MAX_ROWS
+from ..ml.mapped_artifacts import load_mapped
+from ..ml.model_store import ModelHandle
+from .reference_ranges import rule_engine
+from .text_cleaner import canonical_values
 
 # ==============================
 # 🔹 ML MODEL INTEGRATION (Week-4, Day 1)
 # ==============================
 
-# Load ML model and label binarizer if available
+# Model and label binarizer come from the model registry (hot-reloaded when a
+# new version is published), or from MODEL_PATH if nothing was published yet.
+# Loaded on first use (or by the startup warm-up), not at import.
 MODEL_PATH = "ml/models/report_classifier.pkl"
-model = None
-mlb = None
-MODEL_LOADED = False
 
-if os.path.exists(MODEL_PATH):
-    try:
-        with open(MODEL_PATH, "rb") as f:
-            model, mlb = pickle.load(f)
-        MODEL_LOADED = True
-        print("✅ ML report classifier loaded for analysis.")
-    except Exception as e:
-        print(f"⚠️ Failed to load ML model: {e}")
+
+def _load_report_model(path: str) -> dict:
+    # Memory-mapped export (shared between worker processes) when present; the pickle isn't read at all
+    mapped = load_mapped(path)
+    if mapped is not None and mapped["labels"] is not None:
+        print("⚡ Using memory-mapped report classifier.")
+        return {"model": mapped["model"], "mlb": mapped["labels"], "flat_model": mapped["model"]}
+
+    # Not exported yet (see ml/training/export_forests.py): plain sklearn
+    with open(path, "rb") as f:
+        model, mlb = pickle.load(f)
+    return {"model": model, "mlb": mlb, "flat_model": None}
+
+
+report_model = ModelHandle("report_classifier", MODEL_PATH, _load_report_model)
 
 # ==============================
 # 🔹 CORE ANALYSIS FUNCTION
 # ==============================
 
-def analyze_report(structured_data: dict):
+def analyze_report(structured_data: dict, sex: str | None = None, age: int | None = None):
     """
     Analyze structured lab results.
     - If ML model is available → use classifier
     - Else → fall back to rule-based logic (your original code)
+    sex / age of the patient, when known, select sex/age specific reference ranges.
     Returns list of findings with 'is_abnormal' flag.
     """
-    if MODEL_LOADED:
-        return _analyze_with_ml(structured_data)
+    if report_model.get() is not None:
+        # Concurrent callers share one classifier predict (see app/ml/batcher.py)
+        return report_batcher.predict((structured_data, sex, age))
     else:
-        return _analyze_with_rules(structured_data)
+        return _analyze_with_rules(structured_data, sex, age)
+
+
+def analyze_reports_batch(structured_list: list[dict], sexes: list | None = None, ages: list | None = None) -> list[list]:
+    """
+    analyze_report for many reports: one feature matrix and a single
+    model.predict call (or one rule-table evaluation) for the whole batch.
+    Findings come back in input order.
+    """
+    if not structured_list:
+        return []
+    values = [canonical_values(structured) for structured in structured_list]
+    bundle = report_model.get()  # one version for the whole batch, even if a reload lands meanwhile
+    if bundle is None:
+        return _rule_findings(values, sexes, ages)
+
+    X = _feature_matrix(values)
+    label_sets = bundle["mlb"].inverse_transform(_predict(bundle, X))
+    return [_findings_from_labels(labels, row) for labels, row in zip(label_sets, X)]
+
+
+def _analyze_micro_batch(items: list[tuple]) -> list:
+    # Reports from concurrent callers: if the batch fails, retry one by one so a
+    # malformed report only fails its own caller
+    try:
+        structured_list, sexes, ages = (list(column) for column in zip(*items))
+        return analyze_reports_batch(structured_list, sexes, ages)
+    except Exception as e:
+        if len(items) == 1:
+            print(f"❌ Report analysis failed: {e}")
+            return [ItemError(e)]
+    return [_analyze_micro_batch([item])[0] for item in items]
+
+
+report_batcher = MicroBatcher("report_classifier", _analyze_micro_batch)
 
 
 # ==============================
 # 🔹 ML-BASED ANALYSIS
 # ==============================
 
-def _analyze_with_ml(structured_data: dict):
-    """Use trained ML classifier to predict conditions."""
-    # Extract numeric values from structured_data
-    def extract_value(key):
-        if key not in structured_data:
-            return None
-        val = structured_data[key]
-        if isinstance(val, dict) and "value" in val:
-            return float(val["value"])
-        elif isinstance(val, (int, float)):
-            return float(val)
-        else:
-            # Handle string like "180 mg/dl"
-            try:
-                num = re.findall(r"\d+\.?\d*", str(val))
-                return float(num[0]) if num else None
-            except:
-                return None
-
-    # Build feature vector [glucose, hemoglobin, cholesterol, wbc]
-    features = {
-        "glucose": extract_value("glucose") or 100.0,
-        "hemoglobin": extract_value("hemoglobin") or 14.0,
-        "cholesterol": extract_value("cholesterol") or 200.0,
-        "wbc": extract_value("wbc") or 7000.0,
-    }
-
-    # X = np.array([[features["glucose"], features["hemoglobin"], features["cholesterol"], features["wbc"]]])
-    import pandas as pd
-
-    X = pd.DataFrame([[
-        features["glucose"],
-        features["hemoglobin"],
-        features["cholesterol"],
-        features["wbc"]
-    ]], columns=["glucose", "hemoglobin", "cholesterol", "wbc"])
-
-    # Predict
-    y_pred = model.predict(X)
-    predicted_labels = mlb.inverse_transform(y_pred)[0]
-
-    findings = []
+# Model input columns (canonical units) and the value used when a report lacks one
+ML_FEATURES = ("glucose", "hemoglobin", "cholesterol", "wbc")
+FEATURE_DEFAULTS = (100.0, 14.0, 200.0, 7000.0)
+
+# label → (feature it is reported against, unit, message template)
+LABEL_FINDINGS = {
+    "diabetes": ("glucose", "mg/dL", "Glucose {v} → Possible diabetes risk"),
+    "prediabetes": ("glucose", "mg/dL", "Glucose {v} → Prediabetic range"),
+    "anemia": ("hemoglobin", "g/dL", "Hemoglobin {v} → Possible anemia risk"),
+    "polycythemia": ("hemoglobin", "g/dL", "Hemoglobin {v} → Possible polycythemia"),
+    "high_cholesterol": ("cholesterol", "mg/dL", "Cholesterol {v} → High cholesterol (risk of heart disease)"),
+    "leukopenia": ("wbc", "cells/μL", "WBC {v} → Possible leukopenia (low immunity)"),
+    "infection": ("wbc", "cells/μL", "WBC {v} → Possible infection / inflammation"),
+    "heart_disease": ("cholesterol", "mg/dL", "High cholesterol ({v} mg/dL) → Elevated heart disease risk. Consult a cardiologist."),
+}
+
+
+def _predict(bundle: dict, X: np.ndarray) -> np.ndarray:
+    # Same outputs either way; the flattened forest skips sklearn's per-call overhead
+    if bundle["flat_model"] is not None and len(X) <= FLAT_FOREST_MAX_ROWS:
+        return bundle["flat_model"].predict(X)
+    with warnings.catch_warnings():
+        # The classifier was fitted on a DataFrame; X is a plain array in the
+        # same column order, so sklearn's feature-name check has nothing to compare
+        warnings.filterwarnings("ignore", message="X does not have valid feature names", category=UserWarning)
+        return bundle["model"].predict(X)
+
+
+def _feature_matrix(values: list[dict]) -> np.ndarray:
+    """Canonical values per report → (n_reports, 4) float matrix, defaults filled in."""
+    return np.array(
+        [[row.get(name) or default for name, default in zip(ML_FEATURES, FEATURE_DEFAULTS)] for row in values],
+        dtype=np.float64,
+    )
+
+
+def _findings_from_labels(predicted_labels, features: np.ndarray) -> list:
     if len(predicted_labels) == 0:
-        findings.append({
+        return [{
             "type": "general",
             "message": "No significant abnormalities detected.",
             "is_abnormal": False
-        })
-    else:
-        # Map labels to user-friendly messages (same style as your rules)
-        message_map = {
-            "diabetes": lambda v: f"Glucose {v} → Possible diabetes risk",
-            "prediabetes": lambda v: f"Glucose {v} → Prediabetic range",
-            "anemia": lambda v: f"Hemoglobin {v} → Possible anemia risk",
-            "polycythemia": lambda v: f"Hemoglobin {v} → Possible polycythemia",
-            "high_cholesterol": lambda v: f"Cholesterol {v} → High cholesterol (risk of heart disease)",
-            "leukopenia": lambda v: f"WBC {v} → Possible leukopenia (low immunity)",
-            "infection": lambda v: f"WBC {v} → Possible infection / inflammation",
-            "heart_disease": lambda v: f"High cholesterol ({v} mg/dL) → Elevated heart disease risk. Consult a cardiologist.",
-        }
-
-        # Get original values for messages
-        orig_vals = {
-            "glucose": extract_value("glucose"),
-            "hemoglobin": extract_value("hemoglobin"),
-            "cholesterol": extract_value("cholesterol"),
-            "wbc": extract_value("wbc"),
-        }
-
-        for label in predicted_labels:
-            val = None
-            unit = "unknown"
-            if label in ["diabetes", "prediabetes"]:
-                val = orig_vals["glucose"] or features["glucose"]
-                unit = "mg/dL"
-            elif label in ["anemia", "polycythemia"]:
-                val = orig_vals["hemoglobin"] or features["hemoglobin"]
-                unit = "g/dL"
-            elif label in ["high_cholesterol", "heart_disease"]:  # ← heart_disease uses cholesterol
-                val = orig_vals["cholesterol"] or features["cholesterol"]
-                unit = "mg/dL"
-            elif label in ["leukopenia", "infection"]:
-                val = orig_vals["wbc"] or features["wbc"]
-                unit = "cells/μL"
-
-            message = message_map.get(label, lambda v: f"Detected condition: {label}")(val)
-            findings.append({
-                "type": label,
-                "value": val,
-                "unit": unit,
-                "message": message,
-                "is_abnormal": True
-            })
+        }]
 
+    findings = []
+    for label in predicted_labels:
+        val, unit, message = None, "unknown", f"Detected condition: {label}"
+        if label in LABEL_FINDINGS:
+            feature, unit, template = LABEL_FINDINGS[label]
+            val = float(features[ML_FEATURES.index(feature)])
+            message = template.format(v=val)
+        findings.append({
+            "type": label,
+            "value": val,
+            "unit": unit,
+            "message": message,
+            "is_abnormal": True
+        })
     return findings
 
 
@@ -145,102 +157,18 @@ def _analyze_with_ml(structured_data: dict):
 # 🔹 RULE-BASED ANALYSIS (Your Original Code)
 # ==============================
 
-def _analyze_with_rules(structured_data: dict):
-    """Fallback to your original rule-based logic."""
-    findings = []
+_NO_FINDINGS = {
+    "type": "general",
+    "message": "No critical issues detected with basic rules. Consult a doctor for detailed analysis.",
+    "is_abnormal": False
+}
+
+
+def _rule_findings(values: list[dict], sexes=None, ages=None) -> list[list]:
+    """Reference-range table lookup (see reference_ranges.py) for many reports."""
+    return [findings or [dict(_NO_FINDINGS)] for findings in rule_engine.evaluate(values, sexes, ages)]
 
-    # --- Hemoglobin ---
-    if "hemoglobin" in structured_data:
-        try:
-            hb_value = float(re.findall(r"\d+\.?\d*", str(structured_data["hemoglobin"]))[0])
-            if hb_value < 12.0:
-                findings.append({
-                    "type": "hemoglobin",
-                    "value": hb_value,
-                    "unit": "g/dL",
-                    "message": f"Hemoglobin {hb_value} → Possible anemia risk",
-                    "is_abnormal": True
-                })
-            elif hb_value > 16.5:
-                findings.append({
-                    "type": "hemoglobin",
-                    "value": hb_value,
-                    "unit": "g/dL",
-                    "message": f"Hemoglobin {hb_value} → Possible polycythemia",
-                    "is_abnormal": True
-                })
-        except Exception:
-            pass
-
-    # --- Glucose / Blood Sugar ---
-    if "glucose" in structured_data or "blood sugar" in structured_data:
-        glucose_value = structured_data.get("glucose") or structured_data.get("blood sugar")
-        try:
-            g_val = float(re.findall(r"\d+\.?\d*", str(glucose_value))[0])
-            if g_val > 126:
-                findings.append({
-                    "type": "glucose",
-                    "value": g_val,
-                    "unit": "mg/dL",
-                    "message": f"Glucose {g_val} → Possible diabetes risk",
-                    "is_abnormal": True
-                })
-            elif g_val < 70:
-                findings.append({
-                    "type": "glucose",
-                    "value": g_val,
-                    "unit": "mg/dL",
-                    "message": f"Glucose {g_val} → Possible hypoglycemia",
-                    "is_abnormal": True
-                })
-        except Exception:
-            pass
-
-    # --- Cholesterol ---
-    if "cholesterol" in structured_data:
-        try:
-            chol_val = float(re.findall(r"\d+\.?\d*", str(structured_data["cholesterol"]))[0])
-            if chol_val > 200:
-                findings.append({
-                    "type": "cholesterol",
-                    "value": chol_val,
-                    "unit": "mg/dL",
-                    "message": f"Cholesterol {chol_val} → High cholesterol (risk of heart disease)",
-                    "is_abnormal": True
-                })
-        except Exception:
-            pass
-
-    # --- WBC ---
-    if "wbc" in structured_data or "white blood cells" in structured_data:
-        wbc_value = structured_data.get("wbc") or structured_data.get("white blood cells")
-        try:
-            w_val = float(re.findall(r"\d+\.?\d*", str(wbc_value))[0])
-            if w_val < 4000:
-                findings.append({
-                    "type": "wbc",
-                    "value": w_val,
-                    "unit": "cells/μL",
-                    "message": f"WBC {w_val} → Possible leukopenia (low immunity)",
-                    "is_abnormal": True
-                })
-            elif w_val > 11000:
-                findings.append({
-                    "type": "wbc",
-                    "value": w_val,
-                    "unit": "cells/μL",
-                    "message": f"WBC {w_val} → Possible infection / inflammation",
-                    "is_abnormal": True
-                })
-        except Exception:
-            pass
-
-    # --- Default: no abnormalities ---
-    if not findings:
-        findings.append({
-            "type": "general",
-            "message": "No critical issues detected with basic rules. Consult a doctor for detailed analysis.",
-            "is_abnormal": False
-        })
 
-    return findings
\ No newline at end of file
+def _analyze_with_rules(structured_data: dict, sex: str | None = None, age: int | None = None):
+    """Fallback to your original rule-based logic, now driven by the reference-range table."""
+    return _rule_findings([canonical_values(structured_data)], [sex], [age])[0]
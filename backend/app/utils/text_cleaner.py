@@ -1,5 +1,16 @@
+import os
 import re
+import threading
 import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+
+# Compiled once at import instead of on every call
+_LINE_BREAKS_RE = re.compile(r"[\r\n\t]+")
+_MULTI_SPACE_RE = re.compile(r"\s{2,}")
+_MG_DL_RE = re.compile(r"mg\s*/\s*dL", re.I)
+_MMOL_L_RE = re.compile(r"mmol\s*/\s*L", re.I)
+_PERCENT_RE = re.compile(r"%\s*")
+
 
 def clean_text(raw_text: str) -> str:
     """
@@ -9,20 +20,22 @@ def clean_text(raw_text: str) -> str:
     - standardize units
     - lowercasing for consistency
     """
-    # normalize unicode
-    text = unicodedata.normalize("NFKD", raw_text)
-    text = text.encode("ascii", "ignore").decode("utf-8")
+    # normalize unicode (pure ASCII input is already normalized)
+    text = raw_text
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text)
+        text = text.encode("ascii", "ignore").decode("utf-8")
 
     # replace multiple newlines/tabs with space
-    text = re.sub(r"[\r\n\t]+", " ", text)
+    text = _LINE_BREAKS_RE.sub(" ", text)
 
     # collapse multiple spaces
-    text = re.sub(r"\s{2,}", " ", text).strip()
+    text = _MULTI_SPACE_RE.sub(" ", text).strip()
 
     # standardize common units
-    text = re.sub(r"mg\s*/\s*dL", "mg/dL", text, flags=re.I)
-    text = re.sub(r"mmol\s*/\s*L", "mmol/L", text, flags=re.I)
-    text = re.sub(r"%\s*", "%", text)
+    text = _MG_DL_RE.sub("mg/dL", text)
+    text = _MMOL_L_RE.sub("mmol/L", text)
+    text = _PERCENT_RE.sub("%", text)
 
     # lowercase for uniformity
     text = text.lower()
@@ -30,35 +43,294 @@ def clean_text(raw_text: str) -> str:
     return text
 
 
+# ==============================
+# 🔹 ANALYTE REGISTRY
+# ==============================
+# analyte key → aliases as they appear in cleaned (lowercased) text, the
+# units we recognise right after the value, the canonical unit every value is
+# stored in, and how to get there from each other unit: factor or
+# (factor, offset). Adding an analyte is a data change.
+ANALYTE_REGISTRY = {
+    "glucose": {
+        "aliases": ["glucose", "blood sugar", "fasting blood sugar", "fbs"],
+        "units": ["mg/dl", "mmol/l"],
+        "canonical": "mg/dl",
+        "conversions": {"mmol/l": 18.016},
+    },
+    "hemoglobin": {
+        "aliases": ["hemoglobin", "haemoglobin", "hgb", "hb"],
+        "units": ["g/dl", "g/l"],
+        "canonical": "g/dl",
+        "conversions": {"g/l": 0.1},
+    },
+    "cholesterol": {
+        "aliases": ["cholesterol", "total cholesterol", "serum cholesterol"],
+        "units": ["mg/dl", "mmol/l"],
+        "canonical": "mg/dl",
+        "conversions": {"mmol/l": 38.67},
+    },
+    "wbc": {
+        "aliases": ["wbc", "wbc count", "white blood cells", "white blood cell count", "total leukocyte count", "tlc"],
+        "units": ["cells/ul", "cells/mm3", "/ul", "/cumm", "x10^3/ul", "10^3/ul", "x10^9/l", "10^9/l"],
+        "canonical": "cells/ul",
+        "conversions": {
+            "cells/mm3": 1.0, "/ul": 1.0, "/cumm": 1.0,
+            "x10^3/ul": 1000.0, "10^3/ul": 1000.0, "x10^9/l": 1000.0, "10^9/l": 1000.0,
+        },
+    },
+    "hba1c": {
+        "aliases": ["hba1c", "hb a1c", "a1c", "glycated hemoglobin", "glycosylated hemoglobin"],
+        "units": ["%", "mmol/mol"],
+        "canonical": "%",
+        "conversions": {"mmol/mol": (0.09148, 2.152)},  # IFCC → NGSP master equation
+    },
+    "creatinine": {
+        "aliases": ["creatinine", "serum creatinine"],
+        "units": ["mg/dl", "umol/l"],
+        "canonical": "mg/dl",
+        "conversions": {"umol/l": 1 / 88.42},
+    },
+    "tsh": {
+        "aliases": ["tsh", "thyroid stimulating hormone"],
+        "units": ["uiu/ml", "miu/l", "mu/l"],
+        "canonical": "uiu/ml",
+        "conversions": {"miu/l": 1.0, "mu/l": 1.0},
+    },
+    "ldl": {
+        "aliases": ["ldl", "ldl cholesterol", "ldl-c", "low density lipoprotein"],
+        "units": ["mg/dl", "mmol/l"],
+        "canonical": "mg/dl",
+        "conversions": {"mmol/l": 38.67},
+    },
+    "hdl": {
+        "aliases": ["hdl", "hdl cholesterol", "hdl-c", "high density lipoprotein"],
+        "units": ["mg/dl", "mmol/l"],
+        "canonical": "mg/dl",
+        "conversions": {"mmol/l": 38.67},
+    },
+    "triglycerides": {
+        "aliases": ["triglycerides", "triglyceride", "serum triglycerides"],
+        "units": ["mg/dl", "mmol/l"],
+        "canonical": "mg/dl",
+        "conversions": {"mmol/l": 88.57},
+    },
+}
+
+
+def _build_scanner(registry: dict):
+    """
+    Compile every alias of every analyte into one alternation (longest first,
+    so "ldl cholesterol" wins over "cholesterol"), plus one value/unit pattern.
+    """
+    alias_to_analyte = {}
+    for name, spec in registry.items():
+        for alias in spec["aliases"]:
+            alias_to_analyte[alias] = name
+    aliases = sorted(alias_to_analyte, key=len, reverse=True)
+    # Leading character-class lookahead lets the engine skip most positions
+    # without trying every alternative
+    first_chars = "".join(sorted({re.escape(a[0]) for a in aliases}))
+    alias_re = re.compile(
+        r"(?=[" + first_chars + r"])(?<![a-z0-9])(?:" + "|".join(re.escape(a) for a in aliases) + r")(?![a-z0-9])",
+        re.I,
+    )
+
+    units = sorted({u for spec in registry.values() for u in spec["units"]}, key=len, reverse=True)
+    value_re = re.compile(r"\D*?(\d+\.?\d*)\s*(" + "|".join(re.escape(u) for u in units) + r")?", re.I)
+
+    allowed_units = {name: set(spec["units"]) for name, spec in registry.items()}
+    return alias_re, value_re, alias_to_analyte, allowed_units
+
+
+_ALIAS_RE, _VALUE_RE, _ALIAS_TO_ANALYTE, _ALLOWED_UNITS = _build_scanner(ANALYTE_REGISTRY)
+
+
+def _build_conversions(registry: dict) -> dict:
+    """(analyte, unit) → (factor, offset) for every recognised unit, canonical included."""
+    table = {}
+    for name, spec in registry.items():
+        table[(name, spec["canonical"])] = (1.0, 0.0)
+        for unit, conversion in spec["conversions"].items():
+            factor, offset = conversion if isinstance(conversion, tuple) else (conversion, 0.0)
+            table[(name, unit)] = (float(factor), float(offset))
+    return table
+
+
+_CONVERSIONS = _build_conversions(ANALYTE_REGISTRY)
+CANONICAL_UNITS = {name: spec["canonical"] for name, spec in ANALYTE_REGISTRY.items()}
+
+
+def to_canonical(name: str, value: float, unit: str | None) -> tuple[float, str]:
+    """
+    Convert one value to its analyte's canonical unit.
+    Unknown units are assumed canonical (reports mostly use them) and stay "unknown".
+    """
+    conversion = _CONVERSIONS.get((name, unit))
+    if conversion is None:
+        return value, "unknown"
+    factor, offset = conversion
+    if factor == 1.0 and offset == 0.0:
+        return value, CANONICAL_UNITS[name]
+    return round(value * factor + offset, 2), CANONICAL_UNITS[name]
+
+
 def extract_structured_fields(cleaned_text: str) -> dict:
     """
     Extract common medical fields as key-value JSON
-    Example: glucose, cholesterol, hemoglobin, etc.
+    Example: glucose, cholesterol, hemoglobin, wbc, hba1c, etc.
+
+    Single pass: one regex finds every analyte alias, then each alias takes
+    the first number between it and the next alias. Cost grows with text
+    length, not with the number of analytes. First mention of an analyte wins.
+
+    Values are converted to the analyte's canonical unit (CANONICAL_UNITS);
+    when that changed anything, the value as printed is kept under "reported".
     """
     structured = {}
+    hits = list(_ALIAS_RE.finditer(cleaned_text))
 
-    # Glucose
-    match = re.search(r"(glucose)\D*(\d+\.?\d*)\s*(mg/dl|mmol/l)?", cleaned_text, re.I)
-    if match:
-        structured["glucose"] = {
-            "value": float(match.group(2)),
-            "unit": match.group(3) if match.group(3) else "unknown"
-        }
-
-    # Hemoglobin
-    match = re.search(r"(hemoglobin|hgb)\D*(\d+\.?\d*)\s*(g/dl)?", cleaned_text, re.I)
-    if match:
-        structured["hemoglobin"] = {
-            "value": float(match.group(2)),
-            "unit": match.group(3) if match.group(3) else "unknown"
-        }
-
-    # Cholesterol
-    match = re.search(r"(cholesterol)\D*(\d+\.?\d*)\s*(mg/dl)?", cleaned_text, re.I)
-    if match:
-        structured["cholesterol"] = {
-            "value": float(match.group(2)),
-            "unit": match.group(3) if match.group(3) else "unknown"
-        }
+    for i, hit in enumerate(hits):
+        name = _ALIAS_TO_ANALYTE[hit.group(0).lower()]
+        if name in structured:
+            continue
+        # Don't let a value search run past the next analyte's name
+        end = hits[i + 1].start() if i + 1 < len(hits) else len(cleaned_text)
+        match = _VALUE_RE.match(cleaned_text, hit.end(), end)
+        if not match:
+            continue
+        raw_value = float(match.group(1))
+        unit = match.group(2).lower() if match.group(2) else None
+        if unit not in _ALLOWED_UNITS[name]:
+            unit = None
+        value, canonical_unit = to_canonical(name, raw_value, unit)
+        structured[name] = {"value": value, "unit": canonical_unit}
+        if unit and unit != canonical_unit:
+            structured[name]["reported"] = {"value": raw_value, "unit": unit}
 
     return structured
+
+
+def canonical_values(structured: dict) -> dict[str, float]:
+    """
+    analyte → value in canonical units, for analysis code.
+    Output of extract_structured_fields is already canonical and passes
+    straight through; bare numbers are taken as canonical; free-text values
+    ("5.5 mmol/L", older callers) are parsed and converted here, once.
+    """
+    values = {}
+    for key, field in structured.items():
+        name = _ALIAS_TO_ANALYTE.get(key.lower(), key) if isinstance(key, str) else key
+        if name in values:
+            continue
+        if isinstance(field, dict):
+            if field.get("value") is None:
+                continue
+            unit = field.get("unit")
+            value, _ = to_canonical(name, float(field["value"]), unit.lower() if isinstance(unit, str) else None)
+        elif isinstance(field, (int, float)):
+            value = float(field)
+        else:
+            match = _VALUE_RE.match(str(field).lower())
+            if not match:
+                continue
+            value, _ = to_canonical(name, float(match.group(1)), match.group(2) and match.group(2).lower())
+        values[name] = value
+    return values
+
+
+# ==============================
+# 🔹 BATCH API
+# ==============================
+# Below this many documents a process pool costs more to start than it saves
+PARALLEL_MIN_DOCS = 2000
+
+
+def _chunks(items: list, n: int) -> list[list]:
+    size = -(-len(items) // n)
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+# Process pools kept alive between batches, by worker count (normally just one)
+_process_pools = {}
+_process_pools_lock = threading.Lock()
+
+
+def _get_process_pool(workers: int) -> ProcessPoolExecutor:
+    """Lazily create the process pool for `workers`, so process startup is paid once, not per batch."""
+    with _process_pools_lock:
+        if workers not in _process_pools:
+            _process_pools[workers] = ProcessPoolExecutor(max_workers=workers)
+        return _process_pools[workers]
+
+
+def shutdown_batch_workers():
+    with _process_pools_lock:
+        for pool in _process_pools.values():
+            pool.shutdown(wait=True, cancel_futures=True)
+        _process_pools.clear()
+
+
+def _run_batched(fn, items: list, workers: int | None, parallel_min: int) -> list:
+    """Apply list-in/list-out `fn` to items, split across processes for large batches."""
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(items) < parallel_min:
+        return fn(items)
+    # A few chunks per worker keeps processes busy when document sizes vary
+    parts = _get_process_pool(workers).map(fn, _chunks(items, workers * 4))
+    return [item for part in parts for item in part]
+
+
+def _clean_list(texts: list[str]) -> list[str]:
+    return [clean_text(text) for text in texts]
+
+
+def _extract_list(texts: list[str]) -> list[dict]:
+    return [extract_structured_fields(text) for text in texts]
+
+
+def clean_texts(raw_texts: list[str], workers: int | None = None, parallel_min: int = PARALLEL_MIN_DOCS) -> list[str]:
+    """clean_text over many documents, in input order."""
+    return _run_batched(_clean_list, list(raw_texts), workers, parallel_min)
+
+
+def to_columns(rows: list[dict]) -> dict:
+    """
+    Per-document extraction results → columnar form:
+    {analyte: {"value": [float | None, ...], "unit": [str | None, ...]}}
+    with one entry per document for every registry analyte.
+    """
+    columns = {}
+    for name in ANALYTE_REGISTRY:
+        values, units = [], []
+        for row in rows:
+            field = row.get(name)
+            values.append(field["value"] if field else None)
+            units.append(field["unit"] if field else None)
+        columns[name] = {"value": values, "unit": units}
+    return columns
+
+
+def from_columns(columns: dict) -> list[dict]:
+    """
+    Inverse of to_columns: back to one extract_structured_fields dict per
+    document (without the "reported" originals, which columns don't carry).
+    """
+    if not columns:
+        return []
+    count = len(next(iter(columns.values()))["value"])
+    rows = [{} for _ in range(count)]
+    for name, column in columns.items():
+        for row, value, unit in zip(rows, column["value"], column["unit"]):
+            if value is not None:
+                row[name] = {"value": value, "unit": unit}
+    return rows
+
+
+def extract_structured_fields_many(cleaned_texts: list[str], workers: int | None = None, parallel_min: int = PARALLEL_MIN_DOCS) -> dict:
+    """
+    extract_structured_fields over many cleaned documents, returned columnar
+    (see to_columns) so callers can build feature matrices without a per-row
+    dict walk. Missing analytes are None.
+    """
+    rows = _run_batched(_extract_list, list(cleaned_texts), workers, parallel_min)
+    return to_columns(rows)
@@ -0,0 +1,64 @@
+# backend/benchmarks/bench_batch_text.py
+"""
+Throughput of batched cleaning + extraction (reports/min): a per-document
+loop vs clean_texts / extract_structured_fields_many, serial and across a
+process pool.
+
+Run from backend/:  python -m benchmarks.bench_batch_text --docs 1000 10000
+"""
+import argparse
+import os
+import random
+import time
+
+from app.utils.text_cleaner import clean_text, clean_texts, extract_structured_fields, extract_structured_fields_many
+
+
+def make_reports(count: int) -> list[str]:
+    """Short OCR-like reports (~2 KB) with a handful of lab values each."""
+    rng = random.Random(7)
+    words = ["Patient", "Report", "Sample", "Collected", "Reference", "Range", "Method", "Lab", "ID", "Page"]
+    reports = []
+    for _ in range(count):
+        filler = " ".join(rng.choice(words) for _ in range(250))
+        reports.append(
+            f"{filler}\nGlucose: {rng.randint(70, 250)} mg / dL\nHemoglobin {rng.uniform(8, 17):.1f} g/dL\n"
+            f"Cholesterol\t{rng.randint(120, 300)} mg/dL\nWBC {rng.randint(3000, 15000)} cells/uL\n"
+        )
+    return reports
+
+
+def per_document(reports: list[str]) -> list[dict]:
+    return [extract_structured_fields(clean_text(text)) for text in reports]
+
+
+def batched(reports: list[str], workers: int, parallel_min: int) -> dict:
+    cleaned = clean_texts(reports, workers=workers, parallel_min=parallel_min)
+    return extract_structured_fields_many(cleaned, workers=workers, parallel_min=parallel_min)
+
+
+def rate(fn, *args) -> float:
+    start = time.perf_counter()
+    fn(*args)
+    return len(args[0]) / (time.perf_counter() - start) * 60
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--docs", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    for count in args.docs:
+        reports = make_reports(count)
+        loop = rate(per_document, reports)
+        serial = rate(batched, reports, 1, count + 1)
+        pooled = rate(batched, reports, args.workers, 0)
+        print(
+            f"📄 {count:>6} docs | loop {loop:>10,.0f}/min | batch {serial:>10,.0f}/min "
+            f"| batch x{args.workers} procs {pooled:>10,.0f}/min"
+        )
+
+
+if __name__ == "__main__":
+    main()
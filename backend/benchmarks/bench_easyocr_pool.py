@@ -0,0 +1,55 @@
+# backend/benchmarks/bench_easyocr_pool.py
+"""
+Compare EasyOCR throughput: a new Reader per page (old behaviour) vs the
+shared EasyOCRPool with batched multi-page inference.
+
+Run from backend/:  python -m benchmarks.bench_easyocr_pool --pages 5
+"""
+import argparse
+import time
+
+import numpy as np
+
+from app.services.ocr_service import EasyOCRPool
+from benchmarks.samples import make_report_pages
+
+
+def per_page_construction(images) -> float:
+    import easyocr
+
+    start = time.perf_counter()
+    for img in images:
+        reader = easyocr.Reader(["en"], gpu=False)
+        reader.readtext(np.array(img))
+    return time.perf_counter() - start
+
+
+def pooled(images, documents: int) -> float:
+    pool = EasyOCRPool(size=1)
+    pool.warm_up()
+    start = time.perf_counter()
+    for _ in range(documents):
+        pool.read_pages(images)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=5)
+    parser.add_argument("--documents", type=int, default=2)
+    args = parser.parse_args()
+
+    images = make_report_pages(args.pages)
+
+    baseline = per_page_construction(images)
+    pool_time = pooled(images, args.documents)
+
+    base_pps = args.pages / baseline
+    pool_pps = args.pages * args.documents / pool_time
+    print(f"📄 Pages per document: {args.pages}")
+    print(f"🐢 Reader per page : {base_pps:.2f} pages/sec")
+    print(f"🚀 Pooled + batched: {pool_pps:.2f} pages/sec ({pool_pps / base_pps:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# backend/benchmarks/bench_extraction.py
+"""
+Microbenchmark: single-pass registry scanner vs one re.search per analyte
+(the previous approach, extended to the same analyte list) on long OCR output.
+
+Run from backend/:  python -m benchmarks.bench_extraction --kb 50 200 1000
+"""
+import argparse
+import random
+import re
+import time
+
+from app.utils.text_cleaner import ANALYTE_REGISTRY, clean_text, extract_structured_fields
+
+
+def per_analyte_search(cleaned_text: str) -> dict:
+    """Old shape: a separate full-text regex search for every analyte."""
+    structured = {}
+    for name, spec in ANALYTE_REGISTRY.items():
+        aliases = "|".join(re.escape(a) for a in sorted(spec["aliases"], key=len, reverse=True))
+        units = "|".join(re.escape(u) for u in spec["units"])
+        match = re.search(rf"({aliases})\D*(\d+\.?\d*)\s*({units})?", cleaned_text, re.I)
+        if match:
+            structured[name] = {"value": float(match.group(2)), "unit": match.group(3) or "unknown"}
+    return structured
+
+
+def make_ocr_text(size_kb: int) -> str:
+    """Noisy OCR-like filler with a few lab values near the end."""
+    rng = random.Random(42)
+    words = ["patient", "report", "sample", "collected", "reference", "range", "method", "lab", "id", "page"]
+    filler, size = [], 0
+    while size < size_kb * 1024:
+        word = rng.choice(words)
+        filler.append(word)
+        size += len(word) + 1
+    tail = " glucose 182 mg/dl hemoglobin 10.4 g/dl wbc 12000 cells/ul hdl 38 mg/dl tsh 2.1 uiu/ml"
+    return clean_text(" ".join(filler) + tail)
+
+
+def timeit(fn, text: str, runs: int) -> float:
+    start = time.perf_counter()
+    for _ in range(runs):
+        fn(text)
+    return (time.perf_counter() - start) / runs * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--kb", type=int, nargs="+", default=[50, 200, 1000])
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"🔬 {len(ANALYTE_REGISTRY)} analytes in registry")
+    for size in args.kb:
+        text = make_ocr_text(size)
+        old_ms = timeit(per_analyte_search, text, args.runs)
+        new_ms = timeit(extract_structured_fields, text, args.runs)
+        print(f"📄 {size:>5} KB | per-analyte {old_ms:8.2f} ms | single pass {new_ms:8.2f} ms | {old_ms / new_ms:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
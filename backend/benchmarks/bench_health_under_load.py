@@ -0,0 +1,115 @@
+# backend/benchmarks/bench_health_under_load.py
+"""
+Load test: /health latency while OCR uploads are in flight.
+With blocking work kept off the event loop, /health should stay flat.
+
+Start the API first, then from backend/:
+    python -m benchmarks.bench_health_under_load --token <JWT> --file ../tests/test_image.png --uploads 8
+
+Every upload gets one pixel changed so its bytes are unique and the OCR
+cache can't answer it; the run is not reported if the server's cache
+counters show hits anyway.
+"""
+import argparse
+import asyncio
+import io
+import os
+import statistics
+import time
+
+import httpx
+from PIL import Image
+
+
+async def probe_health(client: httpx.AsyncClient, stop: asyncio.Event, latencies: list, interval: float):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await client.get("/health")
+        latencies.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(interval)
+
+
+def unique_payloads(path: str, count: int) -> list[bytes]:
+    """`count` copies of the image, each with a different pixel nudged, as PNG bytes."""
+    with Image.open(path) as original:
+        image = original.convert("RGB")
+    payloads = []
+    pixels = image.width * image.height
+    for i in range(count):
+        copy = image.copy()
+        xy = (i % image.width, (i // image.width) % image.height)
+        step = 1 + i // pixels  # tiny images: same pixel, a different amount each time round
+        copy.putpixel(xy, tuple((channel + step) % 256 for channel in copy.getpixel(xy)))
+        buffer = io.BytesIO()
+        copy.save(buffer, format="PNG")
+        payloads.append(buffer.getvalue())
+    return payloads
+
+
+async def upload(client: httpx.AsyncClient, filename: str, payload: bytes, token: str):
+    files = {"file": (filename, payload)}
+    await client.post("/cv/clean_and_analyze", files=files, headers={"Authorization": f"Bearer {token}"})
+
+
+async def cache_hits(client: httpx.AsyncClient, token: str) -> int:
+    response = await client.get("/cv/ocr_cache/stats", headers={"Authorization": f"Bearer {token}"})
+    response.raise_for_status()
+    stats = response.json()
+    return stats["memory_hits"] + stats["disk_hits"]
+
+
+def summary(label: str, latencies: list):
+    latencies = sorted(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(f"🩺 {label:<12} | n={len(latencies):4d} | p50 {statistics.median(latencies):7.1f} ms | p99 {p99:7.1f} ms")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--token", required=True)
+    parser.add_argument("--file", required=True)
+    parser.add_argument("--uploads", type=int, default=8)
+    parser.add_argument("--interval", type=float, default=0.05)
+    parser.add_argument("--same-bytes", action="store_true", help="upload the file unchanged (OCR cache hits after the first)")
+    args = parser.parse_args()
+
+    filename = os.path.splitext(os.path.basename(args.file))[0] + ".png"
+    if args.same_bytes:
+        filename = os.path.basename(args.file)
+        with open(args.file, "rb") as f:
+            payloads = [f.read()] * args.uploads
+    else:
+        payloads = unique_payloads(args.file, args.uploads)
+
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=300) as client:
+        hits_before = await cache_hits(client, args.token)
+
+        # Baseline: idle server
+        idle, stop = [], asyncio.Event()
+        probe = asyncio.create_task(probe_health(client, stop, idle, args.interval))
+        await asyncio.sleep(2)
+        stop.set()
+        await probe
+
+        # Under load: concurrent OCR uploads
+        loaded, stop = [], asyncio.Event()
+        probe = asyncio.create_task(probe_health(client, stop, loaded, args.interval))
+        start = time.perf_counter()
+        await asyncio.gather(*(upload(client, filename, payload, args.token) for payload in payloads))
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await probe
+        cached = await cache_hits(client, args.token) - hits_before
+
+    if cached and not args.same_bytes:
+        # The server (or another client) answered uploads from the OCR cache: not an OCR load test
+        raise SystemExit(f"❌ {cached} OCR cache hit(s) during the run; results not reported")
+
+    summary("idle", idle)
+    summary("during OCR", loaded)
+    print(f"📄 {args.uploads} uploads finished in {elapsed:.2f}s ({cached} OCR cache hits)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,56 @@
+# backend/benchmarks/bench_log_sink.py
+"""
+Concurrent SymptomLog writes: one session + commit per row (previous
+approach) vs the write-behind log sink, on a scratch SQLite file.
+
+Run from backend/:  DATABASE_URL=sqlite:///bench.db python -m benchmarks.bench_log_sink --threads 32 --rows 5000
+"""
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db import log_sink
+from app.db.base import Base
+from app.db.models import SymptomLog
+from app.ml.batcher import MicroBatcher
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--flush-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}", connect_args={"check_same_thread": False})
+        Base.metadata.create_all(engine)
+        log_sink.SessionLocal = sessionmaker(bind=engine)
+
+        for label, enabled in (("commit per row", False), ("log sink", True)):
+            sink = MicroBatcher("bench", log_sink._write_rows, max_batch_size=500, window_ms=args.flush_ms, enabled=enabled)
+            log_sink.log_sink = sink
+
+            def write(i):
+                # Endpoints that return an id wait for their row
+                return log_sink.write(SymptomLog(symptoms=f"fever cough {i}", predicted_disease="flu")).result()
+
+            start = time.perf_counter()
+            with ThreadPoolExecutor(args.threads) as pool:
+                list(pool.map(write, range(args.rows)))
+            elapsed = time.perf_counter() - start
+            sink.stop()
+            commits = sink.stats()["batches"]
+            print(
+                f"🗄️ {label:<15} {args.rows / elapsed:9.0f} rows/s  "
+                f"{commits:6d} commits ({commits / elapsed:8.1f}/s)  p95 wait {sink.stats()['p95_queue_ms']:.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# backend/benchmarks/bench_mapped_artifacts.py
+"""
+Per-worker load time and memory: pickle.load of the symptom model vs the
+memory-mapped artifact. Each "worker" is a fresh spawned process that loads
+the model and predicts a few times. Memory is the growth in PSS from
+/proc/self/smaps_rollup (Linux only), read while all workers hold their
+model: pages shared through the page cache are split between the workers,
+so PSS x workers is the real total.
+
+Run from backend/:  PYTHONPATH=.. python -m benchmarks.bench_mapped_artifacts --workers 4
+"""
+import argparse
+import multiprocessing as mp
+import os
+import pickle
+import tempfile
+import time
+
+import numpy as np
+
+
+def memory_kb() -> dict:
+    values = {}
+    with open("/proc/self/smaps_rollup") as f:
+        for line in f:
+            parts = line.split()
+            if parts[0] in ("Rss:", "Pss:"):
+                values[parts[0].rstrip(":")] = int(parts[1])
+    return values
+
+
+def load_in_worker(kind: str, pickle_path: str, loaded, results):
+    from app.ml.mapped_artifacts import load_mapped
+
+    before = memory_kb()
+    start = time.perf_counter()
+    if kind == "pickle":
+        with open(pickle_path, "rb") as f:
+            vectorizer, model = pickle.load(f)
+    else:
+        mapped = load_mapped(pickle_path)
+        vectorizer, model = mapped["vectorizer"], mapped["model"]
+    load_ms = (time.perf_counter() - start) * 1000
+    for text in ["fever cough headache", "symptom1 symptom42 symptom4242", "symptom7 symptom77"]:
+        model.predict(vectorizer.transform([text]))
+    # Measure while every worker holds its model, so shared pages are split between them
+    loaded.wait()
+    after = memory_kb()
+    results.put((load_ms, *((after[key] - before[key]) / 1024 for key in ("Pss", "Rss"))))
+    loaded.wait()
+
+
+def build_model(directory: str) -> str:
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from ml.training.export_forests import export_mapped
+
+    rng = np.random.default_rng(0)
+    words = [f"symptom{i}" for i in range(5000)]
+    texts = [" ".join(rng.choice(words, 8)) for _ in range(6000)]
+    labels = rng.integers(0, 40, len(texts)).astype(str)
+    vectorizer = TfidfVectorizer()
+    model = RandomForestClassifier(n_estimators=100, random_state=0).fit(vectorizer.fit_transform(texts), labels)
+
+    path = os.path.join(directory, "symptom_model.pkl")
+    with open(path, "wb") as f:
+        pickle.dump((vectorizer, model), f)
+    export_mapped(os.path.join(directory, "symptom_model.mmap"), model, vectorizer=vectorizer)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = build_model(tmp)
+        print(f"📦 pickle {os.path.getsize(path) / 2**20:.1f} MB")
+        ctx = mp.get_context("spawn")
+        for kind in ("pickle", "mapped"):
+            loaded, results = ctx.Barrier(args.workers), ctx.Queue()
+            workers = [ctx.Process(target=load_in_worker, args=(kind, path, loaded, results)) for _ in range(args.workers)]
+            for worker in workers:
+                worker.start()
+            measured = [results.get() for _ in workers]
+            for worker in workers:
+                worker.join()
+            load_ms, pss_mb, rss_mb = (np.mean(column) for column in zip(*measured))
+            print(
+                f"🧮 {kind:<7} load {load_ms:8.1f} ms  PSS {pss_mb:7.1f} MB/worker  "
+                f"RSS {rss_mb:7.1f} MB/worker  ({args.workers} workers: {pss_mb * args.workers:7.1f} MB total)"
+            )
+
+if __name__ == "__main__":
+    main()
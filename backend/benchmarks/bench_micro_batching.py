@@ -0,0 +1,56 @@
+# backend/benchmarks/bench_micro_batching.py
+"""
+Concurrent single-report analyze_report calls with and without the micro-batcher.
+
+Run from backend/:  PYTHONPATH=.. python -m benchmarks.bench_micro_batching --threads 32 --requests 4000
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from app.ml.batcher import MicroBatcher
+from app.utils import report_analyzer
+
+from .bench_report_classifier import FEATURES, flatten, load_or_fit, make_matrix
+
+
+def run(reports: list, threads: int) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(report_analyzer.analyze_report, reports))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model", default="ml/models/report_classifier.pkl")
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=4000)
+    parser.add_argument("--window-ms", type=float, default=2.0)
+    parser.add_argument("--max-batch", type=int, default=64)
+    args = parser.parse_args()
+
+    model, mlb = load_or_fit(args.model)
+    report_analyzer.report_model.set("bench", {"model": model, "mlb": mlb, "flat_model": flatten(model)})
+    matrix = make_matrix(np.random.default_rng(1), args.requests)
+    reports = [{name: {"value": float(v), "unit": "unknown"} for name, v in zip(FEATURES, row)} for row in matrix]
+
+    for enabled in (False, True):
+        batcher = MicroBatcher(
+            "bench", report_analyzer._analyze_micro_batch,
+            max_batch_size=args.max_batch, window_ms=args.window_ms, enabled=enabled,
+        )
+        report_analyzer.report_batcher = batcher
+        elapsed = run(reports, args.threads)
+        batcher.stop()
+        stats = batcher.stats()
+        print(
+            f"🧮 batching {'on ' if enabled else 'off'}  {args.requests / elapsed:9.0f} reports/s  "
+            f"avg batch {stats['avg_batch_size']:6.2f}  p95 queue {stats['p95_queue_ms']:7.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# backend/benchmarks/bench_pdf_streaming.py
+"""
+Peak RSS of whole-document PDF OCR (convert_from_bytes + every page in RAM)
+vs page-at-a-time streaming OCR, for growing page counts.
+Each run happens in a fresh process so ru_maxrss is not polluted.
+
+Run from backend/:  python -m benchmarks.bench_pdf_streaming --pages 5 20 50
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+
+from benchmarks.samples import make_report_pdf
+
+
+def _run(mode: str, pdf_path: str, queue):
+    from app.services.ocr_service import ocr_pages, ocr_pdf_file
+    from pdf2image import convert_from_bytes
+
+    start = time.perf_counter()
+    if mode == "in_memory":
+        with open(pdf_path, "rb") as f:
+            contents = f.read()
+        images = convert_from_bytes(contents)
+        ocr_pages(images, parallel=False)
+    else:
+        ocr_pdf_file(pdf_path, parallel=False)
+    elapsed = time.perf_counter() - start
+    queue.put((resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, elapsed))
+
+
+def measure(mode: str, pdf_path: str):
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_run, args=(mode, pdf_path, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, nargs="+", default=[5, 20])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for pages in args.pages:
+            pdf_path = make_report_pdf(os.path.join(tmp, f"report_{pages}.pdf"), pages)
+            for mode in ("in_memory", "streaming"):
+                rss_mb, elapsed = measure(mode, pdf_path)
+                print(f"📄 {pages:>3} pages | {mode:<9} | peak RSS {rss_mb:8.1f} MB | {elapsed:6.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# backend/benchmarks/bench_preprocessing.py
+"""
+Tesseract latency and analyte extraction accuracy on sample lab reports,
+raw image vs the shared OCR preprocessing stage.
+
+Run from backend/:  python -m benchmarks.bench_preprocessing --runs 3
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import pytesseract
+from PIL import Image
+
+from app.utils.image_preprocessor import load_image, preprocess_for_ocr
+from app.utils.text_cleaner import clean_text, extract_structured_fields
+from benchmarks.samples import SAMPLE_VALUES, make_phone_photo
+
+
+def accuracy(text: str) -> float:
+    """Fraction of sample analytes whose value was extracted exactly."""
+    structured = extract_structured_fields(clean_text(text))
+    correct = sum(
+        1 for name, (value, _) in SAMPLE_VALUES.items()
+        if name in structured and abs(structured[name]["value"] - value) < 1e-6
+    )
+    return correct / len(SAMPLE_VALUES)
+
+
+def run(path: str, preprocess: bool) -> tuple[float, float]:
+    start = time.perf_counter()
+    if preprocess:
+        image = preprocess_for_ocr(load_image(path))
+    else:
+        image = Image.open(path)
+    text = pytesseract.image_to_string(image)
+    return time.perf_counter() - start, accuracy(text)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        samples = [
+            make_phone_photo(os.path.join(tmp, f"photo_{angle}.jpg"), angle=angle)
+            for angle in (0.0, 1.5, -3.0)
+        ]
+        for preprocess in (False, True):
+            latencies, accuracies = [], []
+            for path in samples:
+                for _ in range(args.runs):
+                    latency, acc = run(path, preprocess)
+                    latencies.append(latency)
+                    accuracies.append(acc)
+            label = "preprocessed" if preprocess else "raw"
+            print(
+                f"🖼️ {label:<12} | mean latency {sum(latencies) / len(latencies):6.2f}s"
+                f" | analyte accuracy {100 * sum(accuracies) / len(accuracies):5.1f}%"
+            )
+
+
+if __name__ == "__main__":
+    main()
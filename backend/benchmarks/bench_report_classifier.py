@@ -0,0 +1,93 @@
+# backend/benchmarks/bench_report_classifier.py
+"""
+Report classifier inference: one-row DataFrame per call (previous approach)
+vs NumPy single-report path vs analyze_reports_batch, each with sklearn and
+with the flattened forest evaluator.
+
+Uses ml/models/report_classifier.pkl when present (run from the repo root
+or pass --model), otherwise a forest of the same shape fitted on synthetic data.
+
+Run from backend/:  PYTHONPATH=.. python -m benchmarks.bench_report_classifier --reports 1000
+"""
+import argparse
+import os
+import pickle
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.ml.flat_forest import FlatForestModel
+from app.utils import report_analyzer
+
+FEATURES = list(report_analyzer.ML_FEATURES)
+
+
+def load_or_fit(path: str):
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.multioutput import MultiOutputClassifier
+    from sklearn.preprocessing import MultiLabelBinarizer
+
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(make_matrix(rng, 2000), columns=FEATURES)
+    labels = [["heart_disease"] if chol > 240 else [] for chol in X.cholesterol]
+    mlb = MultiLabelBinarizer()
+    model = MultiOutputClassifier(RandomForestClassifier(n_estimators=100, random_state=42))
+    return model.fit(X, mlb.fit_transform(labels)), mlb
+
+
+def make_matrix(rng, n: int) -> np.ndarray:
+    return np.column_stack([
+        rng.uniform(60, 250, n), rng.uniform(8, 18, n), rng.uniform(120, 320, n), rng.uniform(3000, 15000, n),
+    ])
+
+
+def dataframe_single(model, mlb, structured: dict):
+    """The old per-call path: one-row DataFrame, then predict."""
+    row = [structured[name]["value"] for name in FEATURES]
+    return mlb.inverse_transform(model.predict(pd.DataFrame([row], columns=FEATURES)))[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model", default="ml/models/report_classifier.pkl")
+    parser.add_argument("--reports", type=int, default=1000)
+    args = parser.parse_args()
+
+    model, mlb = load_or_fit(args.model)
+
+    matrix = make_matrix(np.random.default_rng(1), args.reports)
+    reports = [{name: {"value": float(v), "unit": "unknown"} for name, v in zip(FEATURES, row)} for row in matrix]
+    singles = reports[:200]
+
+    start = time.perf_counter()
+    for report in singles:
+        dataframe_single(model, mlb, report)
+    df_ms = (time.perf_counter() - start) / len(singles) * 1000
+    print(f"🧮 DataFrame single           {df_ms:8.3f} ms/report")
+
+    for label, flat in [("sklearn", None), ("flat forest", flatten(model))]:
+        report_analyzer.report_model.set(label, {"model": model, "mlb": mlb, "flat_model": flat})
+        start = time.perf_counter()
+        for report in singles:
+            report_analyzer.analyze_report(report)
+        single_ms = (time.perf_counter() - start) / len(singles) * 1000
+
+        start = time.perf_counter()
+        report_analyzer.analyze_reports_batch(reports)
+        batch_ms = (time.perf_counter() - start) / len(reports) * 1000
+
+        print(f"🧮 {label:<11} single        {single_ms:8.3f} ms/report ({df_ms / single_ms:6.1f}x)")
+        print(f"🧮 {label:<11} batch {len(reports):<6}  {batch_ms:8.3f} ms/report ({df_ms / batch_ms:6.1f}x)")
+
+
+def flatten(model) -> FlatForestModel:
+    from ml.training.export_forests import flatten_model  # needs the repo root on PYTHONPATH
+
+    return FlatForestModel.from_arrays(flatten_model(model))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# backend/benchmarks/samples.py
+"""Synthetic lab-report pages shared by the OCR benchmarks."""
+from PIL import Image, ImageDraw, ImageFont
+
+SAMPLE_VALUES = {
+    "glucose": (182.0, "mg/dL"),
+    "hemoglobin": (10.4, "g/dL"),
+    "cholesterol": (236.0, "mg/dL"),
+}
+
+
+def sample_report_lines(values: dict = SAMPLE_VALUES) -> list[str]:
+    lines = ["CITY DIAGNOSTICS LAB", "Patient: Test Patient   Age: 45", ""]
+    for name, (value, unit) in values.items():
+        lines.append(f"{name.capitalize()}: {value} {unit}")
+    return lines
+
+
+def make_report_page(size=(1700, 2200), values: dict = SAMPLE_VALUES, font_size: int = 40) -> Image.Image:
+    """Render a white page with the sample analytes in black text."""
+    page = Image.new("RGB", size, "white")
+    draw = ImageDraw.Draw(page)
+    try:
+        font = ImageFont.truetype("DejaVuSans.ttf", font_size)
+    except OSError:
+        font = ImageFont.load_default()
+    y = 120
+    for line in sample_report_lines(values):
+        draw.text((120, y), line, fill="black", font=font)
+        y += int(font_size * 1.8)
+    return page
+
+
+def make_report_pages(count: int, **kwargs) -> list[Image.Image]:
+    return [make_report_page(**kwargs) for _ in range(count)]
+
+
+def make_report_pdf(path: str, pages: int, **kwargs) -> str:
+    """Write a multi-page sample report PDF to `path`."""
+    images = make_report_pages(pages, **kwargs)
+    images[0].save(path, format="PDF", save_all=True, append_images=images[1:], resolution=200)
+    return path
+
+
+def make_phone_photo(path: str, values: dict = SAMPLE_VALUES, angle: float = 2.0, long_side: int = 4032) -> str:
+    """
+    Sample page made to look like a phone photo: large, slightly rotated,
+    unevenly lit, colour JPEG without DPI metadata.
+    """
+    page = make_report_page(values=values)
+    scale = long_side / max(page.size)
+    page = page.resize((int(page.width * scale), int(page.height * scale)))
+    page = page.rotate(angle, expand=True, fillcolor=(235, 230, 220))
+
+    # Light falls off from the top-left corner
+    shade = Image.linear_gradient("L").resize(page.size).point(lambda p: 255 - p // 3)
+    page = Image.composite(page, Image.new("RGB", page.size, (90, 85, 80)), shade)
+    page.save(path, format="JPEG", quality=90)
+    return path
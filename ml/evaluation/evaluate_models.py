@@ -6,6 +6,7 @@ import numpy as np
 from sklearn.metrics import accuracy_score, precision_recall_fscore_support, multilabel_confusion_matrix
 from sklearn.model_selection import train_test_split
 import pickle
+from ml.registry import ModelRegistry
 
 # Ensure outputs directory exists
 os.makedirs("outputs", exist_ok=True)
@@ -19,8 +20,8 @@ def evaluate_report_classifier():
     X = df[["glucose", "hemoglobin", "cholesterol", "wbc"]]
     y_true = df["heart_disease"]  # Binary label
     
-    # Load trained model
-    with open("ml/models/report_classifier.pkl", "rb") as f:
+    # Load the version the API serves (retraining only publishes to the registry)
+    with open(ModelRegistry().current_path("report_classifier", "ml/models/report_classifier.pkl"), "rb") as f:
         model, mlb = pickle.load(f)
     
     # Predict
@@ -54,8 +55,8 @@ def evaluate_symptom_classifier():
         df["symptoms"], df["disease"], test_size=0.2, random_state=42
     )
     
-    # Load model
-    with open("ml/models/symptom_model.pkl", "rb") as f:
+    # Load the version the API serves
+    with open(ModelRegistry().current_path("symptom_model", "ml/models/symptom_model.pkl"), "rb") as f:
         vectorizer, model = pickle.load(f)
     
     # Vectorize and predict
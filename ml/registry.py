@@ -0,0 +1,184 @@
+# ml/registry.py
+"""
+Versioned model registry shared by the training scripts and the API.
+
+Layout under the registry root (default ml/models/registry):
+    manifest.json
+    <model name>/<version>/<artifact files>
+
+manifest.json:
+    {"models": {"report_classifier": {
+        "current": "v3",          # version the API should serve
+        "pinned": false,          # true → new publishes don't move "current"
+        "versions": [{"version": "v1", "created_at": ..., "files": [...], "metadata": {...}}, ...]
+    }}}
+
+Version directories are written under a temporary name and renamed into place,
+and the manifest is replaced atomically, so readers never see partial state.
+"""
+import json
+import os
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+
+DEFAULT_ROOT = "ml/models/registry"
+
+
+class RegistryError(Exception):
+    pass
+
+
+class ModelRegistry:
+    def __init__(self, root: str = DEFAULT_ROOT):
+        self.root = root
+        self.manifest_path = os.path.join(root, "manifest.json")
+
+    # ---------- manifest ----------
+
+    def read_manifest(self) -> dict:
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {"models": {}}
+
+    def _write_manifest(self, manifest: dict):
+        os.makedirs(self.root, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    @contextmanager
+    def _locked(self, timeout: float = 30.0):
+        """Cross-process lock for manifest read-modify-write (training jobs vs admin API)."""
+        os.makedirs(self.root, exist_ok=True)
+        lock_path = os.path.join(self.root, ".manifest.lock")
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                break
+            except FileExistsError:
+                # A lock older than the timeout was left behind by a crashed writer
+                try:
+                    if time.time() - os.path.getmtime(lock_path) > timeout:
+                        os.remove(lock_path)
+                        continue
+                except OSError:
+                    continue
+                if time.monotonic() >= deadline:
+                    raise RegistryError("Timed out waiting for the registry manifest lock")
+                time.sleep(0.05)
+        try:
+            os.close(fd)
+            yield self.read_manifest()
+        finally:
+            os.remove(lock_path)
+
+    def _entry(self, manifest: dict, name: str) -> dict:
+        entry = manifest["models"].get(name)
+        if entry is None:
+            raise RegistryError(f"Unknown model '{name}'")
+        return entry
+
+    @staticmethod
+    def _versions(entry: dict) -> list[str]:
+        return [v["version"] for v in entry["versions"]]
+
+    # ---------- queries ----------
+
+    def models(self) -> dict:
+        return self.read_manifest()["models"]
+
+    def resolve(self, name: str) -> tuple[str, str] | None:
+        """(version, directory) the API should serve for `name`, or None if never published."""
+        entry = self.read_manifest()["models"].get(name)
+        if not entry or not entry.get("current"):
+            return None
+        return entry["current"], os.path.join(self.root, name, entry["current"])
+
+    def current_path(self, name: str, legacy_path: str) -> str:
+        """
+        The file the API serves for `name`: the current version's copy of
+        legacy_path's file, or legacy_path itself if nothing was published.
+        """
+        resolved = self.resolve(name)
+        if resolved is None:
+            return legacy_path
+        return os.path.join(resolved[1], os.path.basename(legacy_path))
+
+    # ---------- changes ----------
+
+    def publish(self, name: str, files: list[str], metadata: dict | None = None, activate: bool = True) -> str:
+        """
+        Copy artifact files (or directories, e.g. a .mmap export) into a new
+        version and (unless pinned or activate=False) make it current.
+        Returns the version id.
+        """
+        model_dir = os.path.join(self.root, name)
+        os.makedirs(model_dir, exist_ok=True)
+        staging = tempfile.mkdtemp(dir=model_dir, prefix=".staging-")
+        try:
+            for path in files:
+                target = os.path.join(staging, os.path.basename(path))
+                if os.path.isdir(path):
+                    shutil.copytree(path, target)
+                else:
+                    shutil.copy2(path, target)
+
+            with self._locked() as manifest:
+                entry = manifest["models"].setdefault(name, {"current": None, "pinned": False, "versions": []})
+                version = f"v{len(entry['versions']) + 1}"
+                while os.path.exists(os.path.join(model_dir, version)):
+                    version = f"v{int(version[1:]) + 1}"
+                os.rename(staging, os.path.join(model_dir, version))
+                entry["versions"].append({
+                    "version": version,
+                    "created_at": time.time(),
+                    "files": [os.path.basename(path) for path in files],
+                    "metadata": metadata or {},
+                })
+                if activate and not entry["pinned"]:
+                    entry["current"] = version
+                self._write_manifest(manifest)
+        finally:
+            if os.path.isdir(staging):
+                shutil.rmtree(staging, ignore_errors=True)
+
+        print(f"📦 Published {name} {version}")
+        return version
+
+    def pin(self, name: str, version: str) -> dict:
+        """Serve `version` and keep serving it when new versions are published."""
+        with self._locked() as manifest:
+            entry = self._entry(manifest, name)
+            if version not in self._versions(entry):
+                raise RegistryError(f"Unknown version '{version}' of model '{name}'")
+            entry["current"], entry["pinned"] = version, True
+            self._write_manifest(manifest)
+            return entry
+
+    def unpin(self, name: str) -> dict:
+        """Go back to serving the latest published version."""
+        with self._locked() as manifest:
+            entry = self._entry(manifest, name)
+            entry["current"], entry["pinned"] = self._versions(entry)[-1], False
+            self._write_manifest(manifest)
+            return entry
+
+    def rollback(self, name: str) -> dict:
+        """Pin the version published before the current one."""
+        with self._locked() as manifest:
+            entry = self._entry(manifest, name)
+            if entry["current"] is None:
+                raise RegistryError(f"'{name}' has no active version; nothing to roll back from")
+            versions = self._versions(entry)
+            index = versions.index(entry["current"])
+            if index == 0:
+                raise RegistryError(f"'{name}' {entry['current']} is the oldest version; nothing to roll back to")
+            entry["current"], entry["pinned"] = versions[index - 1], True
+            self._write_manifest(manifest)
+            return entry
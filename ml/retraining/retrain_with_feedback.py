@@ -3,10 +3,13 @@ import pandas as pd
 import sqlite3
 import pickle
 import os
+import tempfile
 from sklearn.multioutput import MultiOutputClassifier
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.preprocessing import MultiLabelBinarizer
 from ml.config import MODEL_SAVE_DIR, REPORT_FEATURES
+from ml.registry import ModelRegistry
+from ml.training.export_forests import export_mapped
 
 def load_existing_training_data():
     """Load original UCI heart disease data."""
@@ -166,17 +169,25 @@ def retrain_report_model():
     model = MultiOutputClassifier(RandomForestClassifier(n_estimators=100, random_state=42))
     model.fit(X, y_bin)
     
-    # Save retrained model
-    model_path = os.path.join(MODEL_SAVE_DIR, "report_classifier_retrained.pkl")
-    with open(model_path, "wb") as f:
-        pickle.dump((model, mlb), f)
-    
-    # Replace active model
-    active_model_path = os.path.join(MODEL_SAVE_DIR, "report_classifier.pkl")
-    with open(active_model_path, "wb") as f:
-        pickle.dump((model, mlb), f)
+    # Publish as a new registry version instead of overwriting the served pickle;
+    # running APIs load it in the background and swap it in (roll back via /admin/models)
+    with tempfile.TemporaryDirectory() as tmp:
+        model_path = os.path.join(tmp, "report_classifier.pkl")
+        with open(model_path, "wb") as f:
+            pickle.dump((model, mlb), f)
+        mapped_dir = os.path.join(tmp, "report_classifier.mmap")
+        export_mapped(mapped_dir, model, mlb=mlb)
+        version = ModelRegistry(os.path.join(MODEL_SAVE_DIR, "registry")).publish(
+            "report_classifier",
+            [model_path, mapped_dir],
+            metadata={
+                "source": "retrain_with_feedback",
+                "samples": len(combined_df),
+                "feedback_samples": len(feedback_df),
+            },
+        )
     
-    print(f"✅ Model retrained and saved to {active_model_path}")
+    print(f"✅ Model retrained and published as report_classifier {version}")
     return True
 
 if __name__ == "__main__":
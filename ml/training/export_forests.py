@@ -0,0 +1,199 @@
+# ml/training/export_forests.py
+"""
+Flatten trained forests into contiguous arrays for the NumPy evaluator in
+backend/app/ml/flat_forest.py (see there for the layout), written as
+memory-mapped model artifacts (see backend/app/ml/mapped_artifacts.py).
+
+    PYTHONPATH=backend python -m ml.training.export_forests
+
+writes report_classifier.mmap/ and symptom_model.mmap/ next to the pickles.
+"""
+import json
+import os
+import pickle
+import shutil
+import time
+
+import numpy as np
+from sklearn.multioutput import MultiOutputClassifier
+from sklearn.tree import DecisionTreeClassifier
+
+# Format versions and paths come from the loaders, so exporter and loader can't disagree
+from app.ml.flat_forest import FORMAT_VERSION
+from app.ml.mapped_artifacts import FORMAT_VERSION as MAPPED_FORMAT_VERSION, mapped_path
+
+# Exported versions kept next to the out_dir link; the previous one stays for
+# workers that are still opening its files when the link is swapped
+KEEP_MAPPED_VERSIONS = 2
+
+
+def flatten_forest(trees: list, classes) -> dict:
+    """Concatenate the fitted trees' node arrays, with leaves turned into self-loops."""
+    features, thresholds, children, values, roots = [], [], [], [], []
+    offset, depth = 0, 0
+    for tree in trees:
+        t = tree.tree_
+        ids = np.arange(t.node_count)
+        is_leaf = t.children_left == -1
+
+        features.append(np.where(is_leaf, 0, t.feature))
+        thresholds.append(np.where(is_leaf, np.inf, t.threshold))
+        left = np.where(is_leaf, ids, t.children_left) + offset
+        right = np.where(is_leaf, ids, t.children_right) + offset
+        children.append(np.column_stack([left, right]))
+
+        # Leaf class counts/weights → probabilities, as tree.predict_proba does
+        value = t.value[:, 0, :].astype(np.float64)
+        totals = value.sum(axis=1, keepdims=True)
+        values.append(np.divide(value, totals, out=np.zeros_like(value), where=totals > 0))
+
+        roots.append(offset)
+        offset += t.node_count
+        depth = max(depth, t.max_depth)
+
+    return {
+        "feature": np.concatenate(features).astype(np.int32),
+        "threshold": np.concatenate(thresholds).astype(np.float64),
+        "children": np.concatenate(children).astype(np.int32),
+        "value": np.concatenate(values),
+        "roots": np.asarray(roots, dtype=np.int32),
+        "depth": np.asarray(depth),
+        "classes": _plain_array(classes),
+    }
+
+
+def _plain_array(values) -> np.ndarray:
+    # Labels fitted from a pandas column are an object array, which np.save can only pickle
+    values = np.asarray(values)
+    return values.astype(str) if values.dtype == object else values
+
+
+def flatten_model(model) -> dict:
+    """RandomForestClassifier, DecisionTreeClassifier or MultiOutputClassifier of them → arrays."""
+    if isinstance(model, MultiOutputClassifier):
+        outputs = model.estimators_
+        multi_output = True
+    else:
+        outputs = [model]
+        multi_output = False
+
+    arrays = {
+        "format_version": np.asarray(FORMAT_VERSION),
+        "n_outputs": np.asarray(len(outputs)),
+        "n_features": np.asarray(outputs[0].n_features_in_),
+        "multi_output": np.asarray(multi_output),
+    }
+    for i, estimator in enumerate(outputs):
+        if estimator.n_outputs_ != 1:
+            raise ValueError("Only single-output forests can be flattened; wrap them in MultiOutputClassifier")
+        trees = [estimator] if isinstance(estimator, DecisionTreeClassifier) else estimator.estimators_
+        for key, value in flatten_forest(trees, estimator.classes_).items():
+            arrays[f"{i}.{key}"] = value
+    return arrays
+
+
+def _vectorizer_arrays(vectorizer) -> tuple[dict, dict]:
+    """Fitted TfidfVectorizer → (terms/idf arrays, transform settings) for the mapped format."""
+    unsupported = {
+        "analyzer": vectorizer.analyzer != "word",
+        "ngram_range": tuple(vectorizer.ngram_range) != (1, 1),
+        "strip_accents": vectorizer.strip_accents is not None,
+        "preprocessor": vectorizer.preprocessor is not None,
+        "tokenizer": vectorizer.tokenizer is not None,
+    }
+    if any(unsupported.values()):
+        raise ValueError(f"Vectorizer settings not supported by the mapped format: {[k for k, v in unsupported.items() if v]}")
+
+    terms = sorted(vectorizer.vocabulary_, key=vectorizer.vocabulary_.get)
+    if terms != sorted(terms):
+        raise ValueError("Vectorizer vocabulary columns are not in term order")
+    arrays = {"terms": np.asarray(terms, dtype=str)}
+    if vectorizer.use_idf:
+        arrays["idf"] = np.asarray(vectorizer.idf_, dtype=np.float64)
+    settings = {
+        "lowercase": vectorizer.lowercase,
+        "token_pattern": vectorizer.token_pattern,
+        "binary": vectorizer.binary,
+        "sublinear_tf": vectorizer.sublinear_tf,
+        "norm": vectorizer.norm,
+    }
+    return arrays, settings
+
+
+def _prune_versions(parent: str, name: str, current: str):
+    versions = sorted(
+        entry for entry in os.listdir(parent)
+        if entry.startswith(f".{name}-") and os.path.isdir(os.path.join(parent, entry))
+    )
+    for entry in versions[:-KEEP_MAPPED_VERSIONS]:
+        if entry != current:
+            shutil.rmtree(os.path.join(parent, entry), ignore_errors=True)
+
+
+def export_mapped(out_dir: str, model, mlb=None, vectorizer=None):
+    """
+    Write `model` (plus its label binarizer or TF-IDF vectorizer) as a
+    directory of .npy files and a meta.json.
+    Each export goes into a new hidden version directory next to out_dir, and
+    out_dir is a symlink swapped to it with os.replace, so loaders see either
+    the old or the new export, never a missing or half-written one.
+    """
+    meta = {"format_version": MAPPED_FORMAT_VERSION, "arrays": {}}
+    arrays = {f"forest/{key}": value for key, value in flatten_model(model).items()}
+    if mlb is not None:
+        meta["labels"] = _plain_array(mlb.classes_).tolist()
+    if vectorizer is not None:
+        vectorizer_arrays, meta["vectorizer"] = _vectorizer_arrays(vectorizer)
+        arrays.update({f"vectorizer/{key}": value for key, value in vectorizer_arrays.items()})
+
+    out_dir = os.path.abspath(out_dir)
+    parent, name = os.path.split(out_dir)
+    version = f".{name}-{time.time_ns()}"
+    version_dir = os.path.join(parent, version)
+    link_tmp = os.path.join(parent, f".{name}.link-{os.getpid()}")
+    os.makedirs(version_dir)
+    try:
+        for array_name, value in arrays.items():
+            path = os.path.join(version_dir, array_name + ".npy")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            value = np.asarray(value)
+            np.save(path, value if value.ndim == 0 else np.ascontiguousarray(value), allow_pickle=False)
+            meta["arrays"][array_name] = array_name + ".npy"
+        with open(os.path.join(version_dir, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+
+        if os.path.lexists(link_tmp):
+            os.remove(link_tmp)
+        os.symlink(version, link_tmp)  # relative, so the directory can be moved as a whole
+        if os.path.isdir(out_dir) and not os.path.islink(out_dir):
+            # A plain directory from an older exporter: replaced once, not atomically
+            shutil.rmtree(out_dir)
+        os.replace(link_tmp, out_dir)
+    except BaseException:
+        shutil.rmtree(version_dir, ignore_errors=True)
+        if os.path.lexists(link_tmp):
+            os.remove(link_tmp)
+        raise
+    _prune_versions(parent, name, version)
+    print(f"✅ Memory-mapped model saved to {out_dir}")
+
+
+def export_report_classifier():
+    from ml.config import MODEL_SAVE_DIR
+    path = f"{MODEL_SAVE_DIR}/report_classifier.pkl"
+    with open(path, "rb") as f:
+        model, mlb = pickle.load(f)
+    export_mapped(mapped_path(path), model, mlb=mlb)
+
+
+def export_symptom_classifier():
+    from ml.config import MODEL_SAVE_DIR
+    path = f"{MODEL_SAVE_DIR}/symptom_model.pkl"
+    with open(path, "rb") as f:
+        vectorizer, model = pickle.load(f)
+    export_mapped(mapped_path(path), model, vectorizer=vectorizer)
+
+
+if __name__ == "__main__":
+    export_report_classifier()
+    export_symptom_classifier()
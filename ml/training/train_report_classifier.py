@@ -4,6 +4,8 @@ import pickle
 from sklearn.multioutput import MultiOutputClassifier
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.preprocessing import MultiLabelBinarizer
+from ml.registry import ModelRegistry
+from ml.training.export_forests import export_mapped
 from ml.config import (
     PROCESSED_DATA_DIR, MODEL_SAVE_DIR, 
     REPORT_FEATURES, REPORT_MODEL_PARAMS
@@ -33,6 +35,14 @@ def train_report_classifier():
     # Save model + label binarizer
     with open(f"{MODEL_SAVE_DIR}/report_classifier.pkl", "wb") as f:
         pickle.dump((model, mlb), f)
+    export_mapped(f"{MODEL_SAVE_DIR}/report_classifier.mmap", model, mlb=mlb)
+
+    # Publish as a new registry version; running APIs hot-swap to it
+    ModelRegistry().publish(
+        "report_classifier",
+        [f"{MODEL_SAVE_DIR}/report_classifier.pkl", f"{MODEL_SAVE_DIR}/report_classifier.mmap"],
+        metadata={"source": "train_report_classifier", "samples": len(df)},
+    )
     
     print("✅ Report classifier trained and saved!")
     print("Labels:", mlb.classes_)
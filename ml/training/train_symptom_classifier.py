@@ -3,6 +3,8 @@ import pandas as pd
 import pickle
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.ensemble import RandomForestClassifier
+from ml.registry import ModelRegistry
+from ml.training.export_forests import export_mapped
 from ml.config import RAW_DATA_DIR, MODEL_SAVE_DIR, SYMPTOM_MODEL_PARAMS
 
 def train_symptom_classifier():
@@ -22,6 +24,14 @@ def train_symptom_classifier():
     # Save model + vectorizer
     with open(f"{MODEL_SAVE_DIR}/symptom_model.pkl", "wb") as f:
         pickle.dump((vectorizer, model), f)
+    export_mapped(f"{MODEL_SAVE_DIR}/symptom_model.mmap", model, vectorizer=vectorizer)
+
+    # Publish as a new registry version; running APIs hot-swap to it
+    ModelRegistry().publish(
+        "symptom_model",
+        [f"{MODEL_SAVE_DIR}/symptom_model.pkl", f"{MODEL_SAVE_DIR}/symptom_model.mmap"],
+        metadata={"source": "train_symptom_classifier", "samples": len(df)},
+    )
     
     print("✅ Symptom classifier trained and saved!")
 
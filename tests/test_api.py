@@ -1,3 +1,5 @@
+import pytest
+
 def test_upload_report_with_patient(client):
     # First add patient
     patient_resp = client.post(
@@ -18,4 +20,86 @@ def test_upload_report_with_patient(client):
     assert response.status_code == 200
     data = response.json()
     assert data["patient_id"] == patient_id
-    assert "log_id" in data
\ No newline at end of file
+    assert "log_id" in data
+
+def test_symptom_batch_rejects_empty_inputs(client):
+    response = client.post("/symptoms/predict_batch", json={"symptoms": ["fever and cough", "  "]})
+    assert response.status_code == 400
+    assert "index [1]" in response.json()["detail"]
+
+def test_signup_cannot_pick_admin_role(client):
+    response = client.post("/auth/signup", json={"email": "mallory@example.com", "password": "x", "role": "admin"})
+    assert response.status_code == 422
+
+def test_symptom_batch_returns_ranked_top_k_in_input_order(client, monkeypatch):
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from app.api import routes_symptoms  # the module the app's routes were imported from
+
+    texts = ["fever cough chills", "itching skin rash", "chest pain breathless", "sneezing runny nose"] * 5
+    diseases = ["flu", "allergy", "cardiac", "cold"] * 5
+    vectorizer = TfidfVectorizer().fit(texts)
+    model = RandomForestClassifier(n_estimators=20, random_state=0).fit(vectorizer.transform(texts), diseases)
+    bundle = {"vectorizer": vectorizer, "model": model, "flat_model": None}
+    monkeypatch.setattr(routes_symptoms.symptom_model, "_current", ("test", bundle))
+
+    queries = ["skin rash and itching", "fever with cough", "runny nose, sneezing"]
+    response = client.post("/symptoms/predict_batch", json={"symptoms": queries, "top_k": 2})
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["symptoms"] for r in results] == queries
+    assert [r["prediction"] for r in results] == ["allergy", "flu", "cold"]
+    for r in results:
+        probabilities = [p["probability"] for p in r["top_k"]]
+        assert len(probabilities) == 2 and probabilities == sorted(probabilities, reverse=True)
+        assert r["top_k"][0]["disease"] == r["prediction"] and r["log_id"]
+
+@pytest.fixture
+def job_client(client, monkeypatch, tmp_path):
+    from types import SimpleNamespace
+    from app.api.deps import get_current_user
+    from app.core.config import settings
+    from app.services import job_queue  # the modules the app's routes were imported from
+
+    broker = job_queue.RedisBroker(job_queue.InMemoryRedis())
+    monkeypatch.setattr(job_queue, "_broker", broker)
+    monkeypatch.setattr(settings, "JOB_SPOOL_DIR", str(tmp_path))
+    user = SimpleNamespace(id=1, role="doctor")
+    client.app.dependency_overrides[get_current_user] = lambda: user
+    yield client, broker, user
+    client.app.dependency_overrides.pop(get_current_user)
+
+def test_report_job_submit_status_and_result(job_client, tmp_path):
+    client, broker, _ = job_client
+    response = client.post("/cv/jobs/clean_and_analyze", files={"file": ("lab.png", b"png bytes", "image/png")})
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+    assert response.json()["status"] == "queued"
+    assert [p.read_bytes() for p in tmp_path.iterdir()] == [b"png bytes"]  # spooled for the worker
+
+    status = client.get(f"/cv/jobs/{job_id}").json()
+    assert status["status"] == "queued" and status["filename"] == "lab.png"
+    pending = client.get(f"/cv/jobs/{job_id}/result")
+    assert pending.status_code == 202 and pending.json()["status"] == "queued"
+
+    _, payload, token = broker.claim(timeout=1)
+    assert payload["user_id"] == 1
+    assert client.get(f"/cv/jobs/{job_id}").json()["status"] == "running"
+    broker.complete(job_id, token, {"log_id": 42})
+    done = client.get(f"/cv/jobs/{job_id}/result")
+    assert done.status_code == 200 and done.json() == {"log_id": 42}
+
+def test_report_job_failure_and_ownership(job_client):
+    client, broker, user = job_client
+    job_id = client.post("/cv/jobs/clean_and_analyze", files={"file": ("scan.pdf", b"%PDF", "application/pdf")}).json()["job_id"]
+    _, _, token = broker.claim(timeout=1)
+    broker.fail(job_id, token, "unreadable PDF")
+    failed = client.get(f"/cv/jobs/{job_id}/result")
+    assert failed.status_code == 500 and "unreadable PDF" in failed.json()["detail"]
+    assert client.get(f"/cv/jobs/{job_id}").json()["error"] == "unreadable PDF"
+
+    # Patients only see their own jobs; unknown ids look the same
+    user.id, user.role = 2, "patient"
+    assert client.get(f"/cv/jobs/{job_id}").status_code == 404
+    assert client.get(f"/cv/jobs/{job_id}/result").status_code == 404
+    assert client.get("/cv/jobs/missing").status_code == 404
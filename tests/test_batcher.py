@@ -0,0 +1,55 @@
+import threading
+
+import pytest
+
+from backend.app.ml.batcher import MicroBatcher
+
+
+def test_concurrent_requests_share_batches():
+    calls = []
+
+    def double(items):
+        calls.append(list(items))
+        return [item * 2 for item in items]
+
+    batcher = MicroBatcher("test", double, max_batch_size=4, window_ms=200, enabled=True)
+    gate = threading.Barrier(10)
+    results = {}
+
+    def caller(i):
+        gate.wait()
+        results[i] = batcher.predict(i)
+
+    threads = [threading.Thread(target=caller, args=(i,)) for i in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    batcher.stop()
+
+    assert results == {i: i * 2 for i in range(10)}
+    assert len(calls) < 10 and max(map(len, calls)) <= 4
+    stats = batcher.stats()
+    assert stats["items"] == 10 and stats["batches"] == len(calls)
+    assert sum(size * count for size, count in stats["batch_sizes"].items()) == 10
+    assert stats["max_queue_ms"] >= stats["avg_queue_ms"] > 0
+
+
+def test_batch_failure_reaches_every_caller():
+    def broken(items):
+        raise ValueError("model exploded")
+
+    batcher = MicroBatcher("test", broken, window_ms=20, enabled=True)
+    futures = [batcher.submit(i) for i in range(3)]
+    for future in futures:
+        with pytest.raises(ValueError, match="exploded"):
+            future.result(timeout=5)
+    batcher.stop()
+    assert batcher.stats()["errors"] >= 1
+
+
+def test_disabled_runs_inline():
+    batcher = MicroBatcher("test", lambda items: [item.upper() for item in items], enabled=False)
+    assert batcher.predict("fever") == "FEVER"
+    assert batcher._thread is None
+    assert batcher.stats()["batch_sizes"] == {1: 1}
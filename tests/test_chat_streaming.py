@@ -0,0 +1,82 @@
+import threading
+
+import pytest
+
+from backend.app.utils import genai_service
+
+
+class FakeLlama:
+    """Stands in for llama_cpp.Llama: stream=True yields one chunk per token."""
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.closed = threading.Event()
+
+    def __call__(self, prompt, max_tokens, stop, echo, stream=False):
+        assert stream and "User message: hello" in prompt
+
+        def chunks():
+            try:
+                for i, token in enumerate(self.tokens):
+                    last = i == len(self.tokens) - 1
+                    yield {"choices": [{"text": token, "finish_reason": "stop" if last else None}]}
+            finally:
+                self.closed.set()
+
+        return chunks()
+
+
+class FakeHandle:
+    def __init__(self, model):
+        self.model = model
+
+    def get(self):
+        return self.model
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    model = FakeLlama(["Drink", " water", " and", " rest", "."])
+    monkeypatch.setattr(genai_service, "llm", FakeHandle(model))
+    return model
+
+
+def test_tokens_stream_with_timing(fake_llm):
+    events = list(genai_service.stream_health_response("hello"))
+    assert "".join(data["text"] for event, data in events if event == "token") == "Drink water and rest."
+    event, stats = events[-1]
+    assert event == "done" and stats["tokens"] == 5 and stats["finish_reason"] == "stop"
+    assert stats["time_to_first_token_ms"] is not None and stats["total_ms"] >= stats["time_to_first_token_ms"]
+
+
+def test_cancel_stops_generation_and_frees_the_model(fake_llm):
+    cancel = threading.Event()
+    stream = genai_service.stream_health_response("hello", cancel=cancel)
+    assert next(stream) == ("token", {"text": "Drink"})
+    cancel.set()
+    event, stats = next(stream)
+    assert event == "done" and stats["finish_reason"] == "cancelled" and stats["tokens"] == 1
+    assert fake_llm.closed.is_set()
+    assert not genai_service._generation_lock.locked()
+
+
+def test_closing_the_stream_releases_the_lock(fake_llm):
+    stream = genai_service.stream_health_response("hello")
+    next(stream)
+    assert genai_service._generation_lock.locked()
+    stream.close()
+    assert fake_llm.closed.is_set() and not genai_service._generation_lock.locked()
+
+
+def test_cancel_while_queued_skips_the_model(monkeypatch):
+    calls = []
+    monkeypatch.setattr(genai_service, "llm", FakeHandle(lambda *args, **kwargs: calls.append(args)))
+    cancel, events = threading.Event(), []
+    with genai_service._generation_lock:  # another generation is running
+        queued = threading.Thread(target=lambda: events.extend(genai_service.stream_health_response("hello", cancel=cancel)))
+        queued.start()
+        cancel.set()  # the client disconnects while waiting
+    queued.join(timeout=5)
+    assert calls == []  # prompt never evaluated
+    assert [event for event, _ in events] == ["done"]
+    assert events[0][1]["finish_reason"] == "cancelled" and events[0][1]["tokens"] == 0
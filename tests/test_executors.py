@@ -0,0 +1,38 @@
+import asyncio
+import threading
+
+from backend.app.core.executors import iterate_in, run_batch
+
+
+def test_iterate_in_pulls_each_item_on_the_pool():
+    threads, closed = [], threading.Event()
+
+    def pages():
+        try:
+            for page in range(1, 4):
+                threads.append(threading.current_thread().name)
+                yield page
+        finally:
+            closed.set()
+
+    async def consume(limit):
+        received = []
+        stream = iterate_in("ocr", pages())
+        async for page in stream:
+            received.append(page)
+            if len(received) == limit:
+                break
+        await stream.aclose()
+        return received
+
+    assert asyncio.run(consume(limit=None)) == [1, 2, 3]
+    assert all(name.startswith("ocr-pool") for name in threads)
+
+    closed.clear()
+    assert asyncio.run(consume(limit=1)) == [1]  # the client went away after the first page
+    assert closed.wait(timeout=5)
+
+
+def test_batch_coordinators_do_not_use_the_ocr_pool():
+    name = asyncio.run(run_batch(lambda: threading.current_thread().name))
+    assert name.startswith("batch-pool")
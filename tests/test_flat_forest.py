@@ -0,0 +1,38 @@
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.multioutput import MultiOutputClassifier
+
+from backend.app.ml.flat_forest import FlatForestModel
+from ml.training.export_forests import flatten_model
+
+
+def roundtrip(model):
+    return FlatForestModel.from_arrays(flatten_model(model))
+
+
+def test_multi_output_report_classifier_matches_sklearn():
+    rng = np.random.default_rng(0)
+    X = np.column_stack([rng.uniform(60, 250, 400), rng.uniform(8, 18, 400), rng.uniform(120, 320, 400), rng.uniform(3000, 15000, 400)])
+    y = np.column_stack([X[:, 0] > 126, X[:, 2] + rng.normal(0, 30, 400) > 240]).astype(int)
+    model = MultiOutputClassifier(RandomForestClassifier(n_estimators=25, random_state=42)).fit(X, y)
+
+    flat = roundtrip(model)
+    X_test = np.column_stack([rng.uniform(50, 260, 300), rng.uniform(7, 19, 300), rng.uniform(100, 330, 300), rng.uniform(2000, 16000, 300)])
+    np.testing.assert_array_equal(flat.predict(X_test), model.predict(X_test))
+    for ours, theirs in zip(flat.predict_proba(X_test), model.predict_proba(X_test)):
+        np.testing.assert_allclose(ours, theirs)
+    np.testing.assert_array_equal(flat.predict(X_test[0]), model.predict(X_test[:1]))
+
+
+def test_sparse_text_forest_matches_sklearn():
+    texts = ["fever cough", "headache nausea", "chest pain", "fever rash", "cough cold", "nausea vomiting", "chest tightness cough"] * 5
+    labels = ["flu", "migraine", "cardiac", "measles", "cold", "gastro", "asthma"] * 5
+    vectorizer = TfidfVectorizer()
+    model = RandomForestClassifier(n_estimators=20, random_state=1).fit(vectorizer.fit_transform(texts), labels)
+
+    flat = roundtrip(model)
+    queries = vectorizer.transform(["fever and cough", "pain in chest", "rash", "nothing matches"])
+    np.testing.assert_array_equal(flat.predict(queries), model.predict(queries))
+    np.testing.assert_allclose(flat.predict_proba(queries), model.predict_proba(queries))
+    assert list(flat.classes_) == list(model.classes_)
@@ -0,0 +1,64 @@
+import io
+
+from PIL import Image, ImageDraw
+
+from backend.app.utils.image_preprocessor import (
+    MAX_OCR_PIXELS, binarize, estimate_skew, load_image, normalize_dpi, preprocess_for_ocr,
+    target_size, to_grayscale,
+)
+
+
+def make_page(angle=0.0):
+    page = Image.new("RGB", (1700, 2200), "white")
+    draw = ImageDraw.Draw(page)
+    for i in range(12):
+        draw.rectangle((150, 200 + i * 120, 1400, 230 + i * 120), fill="black")
+    return page.rotate(angle, expand=True, fillcolor="white")
+
+
+def test_skew_is_corrected():
+    for angle in (3.0, -2.0):
+        binary = binarize(to_grayscale(make_page(angle)))
+        assert abs(estimate_skew(binary) + angle) <= 0.25
+
+
+def test_large_photo_is_downscaled_to_target_dpi():
+    photo = Image.new("RGB", (3024, 4032), "white")
+    resized = normalize_dpi(photo, target_dpi=300)
+    assert max(resized.size) == 3300
+
+
+def test_output_is_binary_grayscale():
+    out = preprocess_for_ocr(make_page(1.0))
+    assert out.mode == "L"
+    assert set(out.getdata()) <= {0, 255}
+
+
+def test_placeholder_dpi_does_not_upscale_photos():
+    photo = Image.new("RGB", (4032, 3024), "white")
+    photo.info["dpi"] = (72, 72)
+    assert max(target_size(photo, 300)) == 3300  # estimated from the page size instead
+
+
+def test_scale_and_pixel_count_are_capped():
+    thumbnail = Image.new("L", (400, 300), "white")
+    thumbnail.info["dpi"] = (50, 50)
+    assert target_size(thumbnail, 300) == (800, 600)
+    poster = Image.new("L", (6000, 4500), "white")
+    poster.info["dpi"] = (300, 300)
+    width, height = target_size(poster, 300)
+    assert width * height <= MAX_OCR_PIXELS
+
+
+def test_high_dpi_jpeg_is_scaled_to_target_dpi_once():
+    buffer = io.BytesIO()
+    Image.new("RGB", (5100, 6600), "white").save(buffer, "JPEG", dpi=(600, 600))
+    buffer.seek(0)
+    out = preprocess_for_ocr(load_image(buffer, target_dpi=300), do_binarize=False)
+    assert out.size == (2550, 3300)
+
+
+def test_flattening_transparency_keeps_dpi():
+    page = Image.new("RGBA", (100, 100), "white")
+    page.info["dpi"] = (600, 600)
+    assert to_grayscale(page).info["dpi"] == (600, 600)
@@ -0,0 +1,215 @@
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from backend.app.services.job_queue import (
+    SQLiteBroker, RedisBroker, InMemoryRedis, QUEUED, RUNNING, DONE, FAILED
+)
+
+
+@pytest.fixture(params=["sqlite", "redis"])
+def broker(request, tmp_path):
+    if request.param == "sqlite":
+        return SQLiteBroker(str(tmp_path / "jobs.db"), poll_interval=0.01)
+    return RedisBroker(InMemoryRedis())
+
+
+def test_job_lifecycle(broker):
+    job_id = broker.submit({"filename": "lab.pdf"})
+    assert broker.get(job_id)["status"] == QUEUED
+
+    claimed_id, payload, token = broker.claim(timeout=1)
+    assert claimed_id == job_id
+    assert payload == {"filename": "lab.pdf"}
+    assert broker.get(job_id)["status"] == RUNNING
+
+    assert broker.complete(job_id, token, {"log_id": 7})
+    job = broker.get(job_id)
+    assert job["status"] == DONE
+    assert job["result"] == {"log_id": 7}
+
+
+def test_failed_job_keeps_error(broker):
+    job_id = broker.submit({})
+    _, _, token = broker.claim(timeout=1)
+    assert broker.fail(job_id, token, "boom")
+    job = broker.get(job_id)
+    assert job["status"] == FAILED
+    assert job["error"] == "boom"
+
+
+def test_claim_is_fifo_and_times_out(broker):
+    first = broker.submit({"n": 1})
+    second = broker.submit({"n": 2})
+    assert broker.claim(timeout=1)[0] == first
+    assert broker.claim(timeout=1)[0] == second
+    assert broker.claim(timeout=1) is None
+    assert broker.get("missing") is None
+
+
+def test_job_of_dead_worker_is_requeued(broker):
+    broker.visibility_timeout = 0.05
+    job_id = broker.submit({"n": 1})
+    _, _, first_token = broker.claim(timeout=1)
+    # The worker dies here: no heartbeat, no complete/fail, the lease runs out
+    time.sleep(0.1)
+    claimed_id, _, token = broker.claim(timeout=1)
+    assert claimed_id == job_id
+    assert not broker.heartbeat(job_id, first_token)
+    assert not broker.fail(job_id, first_token, "late duplicate")  # the first worker finishing after all
+    assert broker.get(job_id)["status"] == RUNNING
+    assert broker.complete(job_id, token, {"log_id": 1})
+    job = broker.get(job_id)
+    assert job["status"] == DONE
+    assert job["error"] is None
+    assert broker.claim(timeout=1) is None
+
+
+def test_heartbeat_keeps_a_long_job_claimed(broker):
+    broker.visibility_timeout = 0.2
+    job_id = broker.submit({"n": 1})
+    _, _, token = broker.claim(timeout=1)
+    for _ in range(4):
+        time.sleep(0.1)
+        assert broker.heartbeat(job_id, token)
+    assert broker.claim(timeout=0.1) is None  # 0.4s in, still held by the first claim
+    assert broker.complete(job_id, token, {"log_id": 1})
+
+
+def test_redis_claim_is_leased_before_the_status_update(monkeypatch):
+    """A job waiting longer than the timeout isn't requeued between BRPOPLPUSH and its HSET."""
+    client = InMemoryRedis()
+    broker = RedisBroker(client, visibility_timeout=0.5)
+    other = RedisBroker(client, visibility_timeout=0.5)
+    job_id = broker.submit({"n": 1})
+    client.hset(broker._job_key(job_id), mapping={"updated_at": time.time() - 3600})
+    moved = client.brpoplpush
+
+    def brpoplpush_then_other_worker_checks(*args, **kwargs):
+        raw_id = moved(*args, **kwargs)
+        other._requeue_expired()
+        return raw_id
+
+    monkeypatch.setattr(client, "brpoplpush", brpoplpush_then_other_worker_checks)
+    assert broker.claim(timeout=1)[0] == job_id
+    monkeypatch.setattr(client, "brpoplpush", moved)
+    assert other.claim(timeout=1) is None
+
+
+def test_sqlite_jobs_claimed_once(tmp_path):
+    broker = SQLiteBroker(str(tmp_path / "jobs.db"), poll_interval=0.01)
+    submitted = {broker.submit({"n": i}) for i in range(20)}
+    claimed = []
+
+    def worker():
+        while (job := broker.claim(timeout=0.1)) is not None:
+            claimed.append(job[0])
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(claimed) == sorted(submitted)
+
+
+def test_sqlite_claim_reports_lock_errors(tmp_path):
+    broker = SQLiteBroker(str(tmp_path / "jobs.db"), poll_interval=0.01, lock_timeout=0.05)
+    broker.submit({})
+    holder = sqlite3.connect(broker.path, isolation_level=None)
+    holder.execute("BEGIN IMMEDIATE")
+    try:
+        with pytest.raises(sqlite3.OperationalError, match="locked"):
+            broker.claim(timeout=0)
+    finally:
+        holder.execute("ROLLBACK")
+        holder.close()
+    assert broker.claim(timeout=0) is not None
+
+
+def test_worker_survives_broker_errors(tmp_path, monkeypatch):
+    from backend.app.services import job_worker  # needs DATABASE_URL (report pipeline)
+
+    monkeypatch.setattr(job_worker, "CLAIM_RETRY_SECONDS", 0.01)
+    stop = threading.Event()
+    broker = SQLiteBroker(str(tmp_path / "jobs.db"), poll_interval=0.01)
+    job_id = broker.submit({"n": 1})
+    claim, failures = broker.claim, []
+
+    def flaky_claim(timeout=1.0):
+        if len(failures) < 3:
+            failures.append(1)
+            raise sqlite3.OperationalError("database is locked")
+        return claim(timeout=0.01)
+
+    def handle_job(payload):
+        stop.set()
+        return {"log_id": payload["n"]}
+
+    monkeypatch.setattr(broker, "claim", flaky_claim)
+    monkeypatch.setattr(job_worker, "handle_job", handle_job)
+    worker = threading.Thread(target=job_worker.run_worker, args=(stop, broker))
+    worker.start()
+    worker.join(timeout=5)
+    assert not worker.is_alive()
+    assert broker.get(job_id)["result"] == {"log_id": 1}
+
+
+def test_worker_survives_errors_storing_results(tmp_path, monkeypatch):
+    from backend.app.services import job_worker
+
+    monkeypatch.setattr(job_worker, "CLAIM_RETRY_SECONDS", 0.01)
+    stop = threading.Event()
+    broker = SQLiteBroker(str(tmp_path / "jobs.db"), poll_interval=0.01)
+    done_id = broker.submit({"n": 1})
+    failed_id = broker.submit({"n": 2})
+    complete, fail, errors = broker.complete, broker.fail, []
+
+    def flaky(call):
+        def wrapper(*args):
+            if len(errors) < 4:
+                errors.append(1)
+                raise sqlite3.OperationalError("database is locked")
+            return call(*args)
+        return wrapper
+
+    def handle_job(payload):
+        if payload["n"] == 2:
+            stop.set()
+            raise ValueError("unreadable")
+        return {"log_id": payload["n"]}
+
+    monkeypatch.setattr(broker, "complete", flaky(complete))
+    monkeypatch.setattr(broker, "fail", flaky(fail))
+    monkeypatch.setattr(job_worker, "handle_job", handle_job)
+    worker = threading.Thread(target=job_worker.run_worker, args=(stop, broker))
+    worker.start()
+    worker.join(timeout=5)
+    assert not worker.is_alive()
+    assert broker.get(done_id)["status"] == DONE
+    assert broker.get(failed_id)["status"] == FAILED
+
+
+def test_worker_heartbeat_outlives_the_visibility_timeout(tmp_path, monkeypatch):
+    from backend.app.services import job_worker
+
+    stop = threading.Event()
+    broker = SQLiteBroker(str(tmp_path / "jobs.db"), poll_interval=0.01, visibility_timeout=0.3)
+    job_id = broker.submit({"n": 1})
+    stolen = []
+
+    def handle_job(payload):
+        time.sleep(0.8)
+        stolen.append(broker.claim(timeout=0))  # another worker looking for expired leases
+        stop.set()
+        return {"log_id": payload["n"]}
+
+    monkeypatch.setattr(job_worker, "handle_job", handle_job)
+    worker = threading.Thread(target=job_worker.run_worker, args=(stop, broker))
+    worker.start()
+    worker.join(timeout=5)
+    assert stolen == [None]
+    assert broker.get(job_id)["result"] == {"log_id": 1}
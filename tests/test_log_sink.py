@@ -0,0 +1,59 @@
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.db import log_sink
+from backend.app.db.base import Base
+from backend.app.db.models import FeedbackLog, SymptomLog
+from backend.app.ml.batcher import MicroBatcher
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'logs.db'}")
+    Base.metadata.create_all(engine)
+    monkeypatch.setattr(log_sink, "SessionLocal", sessionmaker(bind=engine))
+    sink = MicroBatcher("test_sink", log_sink._write_rows, max_batch_size=100, window_ms=50, enabled=True)
+    monkeypatch.setattr(log_sink, "log_sink", sink)
+    yield engine
+    sink.stop()
+
+
+def count(engine, model) -> int:
+    with engine.connect() as conn:
+        return conn.execute(select(func.count()).select_from(model.__table__)).scalar()
+
+
+def test_rows_share_one_commit_and_get_ids(engine):
+    logs = log_sink.write_all([SymptomLog(symptoms=f"s{i}", predicted_disease="flu") for i in range(20)])
+    assert [log.id for log in logs] == list(range(1, 21))
+    assert logs[3].symptoms == "s3"  # readable after the sink's session closed
+    assert log_sink.log_sink.stats()["batches"] == 1
+
+
+def test_bad_row_only_fails_its_caller(engine):
+    good = log_sink.write(FeedbackLog(log_type="symptom", original_prediction="flu", corrected_label="cold"))
+    bad = log_sink.write(SymptomLog(symptoms="fever", predicted_disease=None))
+    assert good.result(timeout=5).id == 1
+    with pytest.raises(Exception):
+        bad.result(timeout=5)
+    assert count(engine, FeedbackLog) == 1
+
+
+def test_write_all_commits_all_rows_or_none(engine):
+    other = log_sink.write(SymptomLog(symptoms="cough", predicted_disease="cold"))
+    rows = [SymptomLog(symptoms=f"s{i}", predicted_disease="flu") for i in range(150)]  # > max_batch_size
+    assert len(log_sink.write_all(rows)) == 150
+    assert other.result(timeout=5).id is not None
+    assert log_sink.log_sink.stats()["items"] == 2  # the 150 rows were one item, never split
+
+    with pytest.raises(Exception):
+        log_sink.write_all([SymptomLog(symptoms="a", predicted_disease="flu"), SymptomLog(symptoms="b")])
+    assert count(engine, SymptomLog) == 151
+
+
+def test_stop_flushes_queued_rows(engine):
+    for i in range(5):
+        log_sink.write(SymptomLog(symptoms=f"s{i}", predicted_disease="flu"))  # fire and forget
+    log_sink.log_sink.stop()
+    assert count(engine, SymptomLog) == 5
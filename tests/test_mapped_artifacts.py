@@ -0,0 +1,78 @@
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.multioutput import MultiOutputClassifier
+from sklearn.preprocessing import MultiLabelBinarizer
+
+from backend.app.ml.mapped_artifacts import load_mapped, mapped_path
+from ml.training.export_forests import export_mapped
+
+SYMPTOMS = ["fever cough", "headache nausea", "chest pain", "fever chills sweating", "cough cold sneezing", "rash itching"]
+DISEASES = ["flu", "migraine", "cardiac", "malaria", "cold", "allergy"]
+
+
+def save_pickle(path, obj):
+    with open(path, "wb") as f:
+        pickle.dump(obj, f)
+
+
+def test_symptom_model_roundtrip_matches_sklearn(tmp_path):
+    vectorizer = TfidfVectorizer(sublinear_tf=True)
+    X = vectorizer.fit_transform(SYMPTOMS * 10)
+    model = RandomForestClassifier(n_estimators=15, random_state=0).fit(X, pd.Series(DISEASES * 10))
+    pickle_path = str(tmp_path / "symptom_model.pkl")
+    save_pickle(pickle_path, (vectorizer, model))
+    export_mapped(mapped_path(pickle_path), model, vectorizer=vectorizer)
+
+    mapped = load_mapped(pickle_path)
+    assert isinstance(mapped["vectorizer"].terms, np.memmap)
+    assert isinstance(mapped["model"].forests[0].children, np.memmap)
+
+    # "sweatingly" would match "sweating" if cut to the vocabulary's string width
+    texts = ["Fever and COUGH cough", "unknown words only", "", "rash, itching, chest pain", "sweatingly sneezingly"]
+    np.testing.assert_allclose(mapped["vectorizer"].transform(texts).toarray(), vectorizer.transform(texts).toarray())
+    np.testing.assert_array_equal(mapped["model"].predict(mapped["vectorizer"].transform(texts)), model.predict(vectorizer.transform(texts)))
+    assert list(mapped["model"].classes_) == sorted(DISEASES)
+
+
+def test_report_labels_and_stale_export(tmp_path):
+    rng = np.random.default_rng(0)
+    X = rng.uniform([60, 8], [250, 18], size=(200, 2))
+    labels = [(["diabetes"] if g > 126 else []) + (["anemia"] if hb < 12 else []) for g, hb in X]
+    mlb = MultiLabelBinarizer()
+    model = MultiOutputClassifier(RandomForestClassifier(n_estimators=10, random_state=0)).fit(X, mlb.fit_transform(labels))
+    pickle_path = str(tmp_path / "report_classifier.pkl")
+    save_pickle(pickle_path, (model, mlb))
+    export_mapped(mapped_path(pickle_path), model, mlb=mlb)
+
+    mapped = load_mapped(pickle_path)
+    assert mapped["vectorizer"] is None
+    X_test = np.array([[200.0, 9.0], [90.0, 14.0]])
+    assert mapped["labels"].inverse_transform(mapped["model"].predict(X_test)) == mlb.inverse_transform(model.predict(X_test))
+
+    # Retrained pickle without a re-export → fall back to the pickle
+    meta = os.path.join(mapped_path(pickle_path), "meta.json")
+    os.utime(pickle_path, (os.path.getmtime(meta) + 10,) * 2)
+    assert load_mapped(pickle_path) is None
+
+
+def test_reexport_swaps_the_link_and_keeps_the_previous_version(tmp_path):
+    X = np.array([[0.0], [1.0], [2.0], [3.0]])
+    model = RandomForestClassifier(n_estimators=3, random_state=0).fit(X, ["a", "a", "b", "b"])
+    pickle_path = str(tmp_path / "clf.pkl")
+    save_pickle(pickle_path, model)
+    out_dir = mapped_path(pickle_path)
+    os.makedirs(out_dir)  # plain directory left by an older exporter
+
+    for _ in range(3):
+        export_mapped(out_dir, model)
+        assert os.path.islink(out_dir)
+        assert load_mapped(pickle_path) is not None
+
+    versions = sorted(entry for entry in os.listdir(tmp_path) if entry.startswith(".clf.mmap-"))
+    assert len(versions) == 2
+    assert os.readlink(out_dir) == versions[-1]
@@ -0,0 +1,117 @@
+import pytest
+
+from backend.app.ml import model_store
+from ml.registry import ModelRegistry, RegistryError
+
+
+def artifact(tmp_path, content: str):
+    path = tmp_path / "model.txt"
+    path.write_text(content)
+    return str(path)
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    registry = ModelRegistry(str(tmp_path / "registry"))
+    monkeypatch.setattr(model_store, "registry", registry)
+    return registry
+
+
+def test_publish_pin_rollback_unpin(registry, tmp_path):
+    assert registry.resolve("clf") is None
+    assert registry.publish("clf", [artifact(tmp_path, "one")]) == "v1"
+    assert registry.publish("clf", [artifact(tmp_path, "two")], metadata={"samples": 10}) == "v2"
+    assert registry.resolve("clf")[0] == "v2"
+
+    assert registry.rollback("clf")["current"] == "v1"
+    with pytest.raises(RegistryError):
+        registry.rollback("clf")
+    registry.publish("clf", [artifact(tmp_path, "three")])
+    assert registry.resolve("clf")[0] == "v1"  # rollback pins
+
+    registry.pin("clf", "v2")
+    assert registry.unpin("clf")["current"] == "v3"
+    with pytest.raises(RegistryError):
+        registry.pin("clf", "v9")
+    assert registry.models()["clf"]["versions"][1]["metadata"] == {"samples": 10}
+
+
+def test_rollback_without_active_version_is_rejected(registry, tmp_path):
+    registry.publish("clf", [artifact(tmp_path, "one")], activate=False)
+    with pytest.raises(RegistryError, match="no active version"):
+        registry.rollback("clf")
+
+
+def test_publish_copies_artifact_directories(registry, tmp_path):
+    mapped = tmp_path / "clf.mmap"
+    (mapped / "forest").mkdir(parents=True)
+    (mapped / "forest" / "roots.npy").write_bytes(b"arrays")
+    registry.publish("clf", [str(mapped)])
+    _, directory = registry.resolve("clf")
+    with open(f"{directory}/clf.mmap/forest/roots.npy", "rb") as f:
+        assert f.read() == b"arrays"
+
+
+def test_current_path_follows_the_served_version(registry, tmp_path):
+    legacy = artifact(tmp_path, "legacy")
+    assert registry.current_path("clf", legacy) == legacy
+    registry.publish("clf", [artifact(tmp_path, "one")])
+    with open(registry.current_path("clf", legacy)) as f:
+        assert f.read() == "one"
+
+
+def test_handle_swaps_to_current_version(registry, tmp_path, monkeypatch):
+    monkeypatch.setattr(model_store, "_handles", [])
+    legacy = artifact(tmp_path, "legacy")
+
+    def loader(path):
+        with open(path) as f:
+            content = f.read()
+        if content == "broken":
+            raise ValueError("corrupt artifact")
+        return content
+
+    handle = model_store.ModelHandle("clf", legacy, loader)
+    assert handle.refresh() and handle.current == ("legacy", "legacy")
+
+    registry.publish("clf", [artifact(tmp_path, "one")])
+    assert model_store.ModelWatcher(interval=0).check_now() == ["clf"]
+    assert handle.current == ("v1", "one")
+    assert not handle.refresh()
+
+    registry.publish("clf", [artifact(tmp_path, "broken")])
+    assert not handle.refresh()
+    assert handle.current == ("v1", "one")  # keeps serving the last good version
+    assert handle.status()["failed_version"] == "v2"
+
+    registry.rollback("clf")
+    registry.unpin("clf")
+    registry.publish("clf", [artifact(tmp_path, "three")])
+    assert handle.refresh() and handle.get() == "three"
+
+
+def test_models_load_on_first_use_and_warm_up(registry, tmp_path, monkeypatch):
+    monkeypatch.setattr(model_store, "_handles", [])
+    monkeypatch.setattr(model_store, "_lazy_models", [])
+    monkeypatch.setattr(model_store, "_warm_up", {"state": "idle", "pending": [], "done": []})
+    handle = model_store.ModelHandle("clf", artifact(tmp_path, "legacy"), lambda path: open(path).read())
+    assert handle.state() == "not_loaded"
+    assert model_store.ModelWatcher(interval=0).check_now() == []  # unused handles aren't loaded by the watcher
+
+    attempts = []
+
+    def missing_model():
+        attempts.append(1)
+        raise FileNotFoundError("models/chat.gguf")
+
+    chat = model_store.LazyModel("chat", missing_model, retry_seconds=60)
+    thread = model_store.start_warm_up(model_store.model_tasks(["clf", "chat"]))
+    thread.join(timeout=5)
+
+    state = model_store.readiness()
+    assert state["ready"] and state["warm_up"]["done"] == ["clf", "chat"]
+    assert state["models"]["clf"]["state"] == "ready" and handle.get() == "legacy"
+    assert state["models"]["chat"]["state"] == "failed"
+    with pytest.raises(model_store.ModelUnavailable):
+        chat.get()
+    assert len(attempts) == 1  # within retry_seconds the failure is remembered, not retried
@@ -0,0 +1,75 @@
+from backend.app.services.ocr_cache import OCRCache, cache_key, content_digest
+
+
+def test_key_depends_on_engine_and_options():
+    digest = content_digest(b"same upload")
+    assert cache_key(digest, "tesseract") != cache_key(digest, "easyocr")
+    assert cache_key(digest, "tesseract", {"kind": "pdf"}) != cache_key(digest, "tesseract", {"kind": "image"})
+    assert cache_key(digest, "tesseract", {"a": 1, "b": 2}) == cache_key(digest, "tesseract", {"b": 2, "a": 1})
+
+
+def test_pdf_key_depends_on_raster_and_text_layer_settings(monkeypatch):
+    from backend.app.services import report_pipeline  # needs DATABASE_URL
+
+    digest = content_digest(b"scan")
+    key = report_pipeline._ocr_cache_key(digest, "scan.pdf", use_easyocr=False)
+    monkeypatch.setattr(report_pipeline.settings, "PDF_RASTER_DPI", 300)
+    dpi_key = report_pipeline._ocr_cache_key(digest, "scan.pdf", use_easyocr=False)
+    monkeypatch.setattr(report_pipeline.settings, "PDF_TEXT_MIN_CHARS", 50)
+    assert len({key, dpi_key, report_pipeline._ocr_cache_key(digest, "scan.pdf", use_easyocr=False)}) == 3
+
+
+def test_memory_lru_eviction():
+    cache = OCRCache(max_entries=2)
+    cache.set("a", {"raw_text": "A"})
+    cache.set("b", {"raw_text": "B"})
+    cache.get("a")                      # "b" is now least recently used
+    cache.set("c", {"raw_text": "C"})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"raw_text": "A"}
+    stats = cache.stats()
+    assert stats["memory_evictions"] == 1
+    assert stats["memory_hits"] == 2
+    assert stats["misses"] == 1
+
+
+def test_disk_tier_survives_memory_eviction(tmp_path):
+    cache = OCRCache(max_entries=1, disk_dir=str(tmp_path), disk_max_bytes=1024 * 1024)
+    cache.set("a", {"raw_text": "A"})
+    cache.set("b", {"raw_text": "B"})
+
+    assert cache.get("a") == {"raw_text": "A"}
+    assert cache.stats()["disk_hits"] == 1
+
+
+def test_failed_disk_write_leaves_no_temp_file(tmp_path):
+    cache = OCRCache(max_entries=1, disk_dir=str(tmp_path), disk_max_bytes=1024 * 1024)
+    cache.set("a", {"raw_text": "A", "pages": {1, 2}})  # sets aren't JSON serialisable
+    assert list(tmp_path.iterdir()) == []
+    assert cache.get("a") is not None  # still served from memory
+
+
+def test_disk_size_cap(tmp_path):
+    cache = OCRCache(max_entries=0, disk_dir=str(tmp_path), disk_max_bytes=100)
+    for i in range(5):
+        cache.set(f"k{i}", {"raw_text": "x" * 40})
+
+    total = sum(p.stat().st_size for p in tmp_path.glob("*.json"))
+    assert total <= 100
+    assert cache.stats()["disk_evictions"] >= 3
+
+
+def test_disk_index_tracks_sizes_across_restarts(tmp_path):
+    cache = OCRCache(max_entries=0, disk_dir=str(tmp_path), disk_max_bytes=100)
+    cache.set("a", {"raw_text": "x" * 30})
+    cache.set("b", {"raw_text": "y" * 30})
+    on_disk = sum(p.stat().st_size for p in tmp_path.glob("*.json"))
+    assert cache.stats()["disk_bytes"] == on_disk
+
+    reopened = OCRCache(max_entries=0, disk_dir=str(tmp_path), disk_max_bytes=100)
+    assert reopened.stats()["disk_entries"] == 2
+    assert reopened.get("b") == {"raw_text": "y" * 30}
+    reopened.set("c", {"raw_text": "z" * 30})  # evicts "a", the least recently used
+    assert reopened.get("a") is None
+    assert {p.stem for p in tmp_path.glob("*.json")} == {"b", "c"}
@@ -0,0 +1,62 @@
+import os
+import time
+
+import pytest
+from PIL import Image
+
+from backend.app.services import ocr_service
+
+
+def page_index(image) -> str:
+    # Module level so the process pool can pickle it; later pages finish first
+    index = image.getpixel((0, 0))
+    time.sleep(0.02 * (5 - index))
+    return f"{index}:{os.getpid()}"
+
+
+def pdf_page_number(pdf_path, page_number, dpi, poppler_path) -> str:
+    time.sleep(0.02 * (6 - page_number))
+    return f"page {page_number}"
+
+
+def pages(count: int) -> list:
+    return [Image.new("L", (4, 4), color=i) for i in range(count)]
+
+
+@pytest.fixture
+def fresh_pool(monkeypatch):
+    ocr_service.shutdown_ocr_workers()
+    monkeypatch.setattr(ocr_service.settings, "OCR_PROCESS_WORKERS", 3)
+    monkeypatch.setattr(ocr_service.settings, "OCR_PARALLEL_MIN_PAGES", 3)
+    monkeypatch.setattr(ocr_service, "_tesseract_page", page_index)
+    monkeypatch.setattr(ocr_service, "_ocr_pdf_page", pdf_page_number)
+    yield
+    ocr_service.shutdown_ocr_workers()
+
+
+def test_parallel_pages_come_back_in_page_order(fresh_pool):
+    texts = ocr_service.ocr_pages(pages(5), parallel=True)
+    assert [text.split(":")[0] for text in texts] == ["0", "1", "2", "3", "4"]
+    assert all(text.split(":")[1] != str(os.getpid()) for text in texts)  # OCR'd in pool workers
+
+
+def test_min_pages_switches_between_inline_and_pool(fresh_pool):
+    texts = ocr_service.ocr_pages(pages(2), parallel=True)
+    assert [text.split(":")[1] for text in texts] == [str(os.getpid())] * 2
+    assert ocr_service._process_pool is None  # below OCR_PARALLEL_MIN_PAGES no pool is started
+
+    ocr_service.ocr_pages(pages(3), parallel=True)
+    assert ocr_service._process_pool is not None
+
+
+def test_parallel_pdf_pages_stream_in_order(fresh_pool):
+    texts = list(ocr_service.iter_ocr_pdf_file("scan.pdf", parallel=True, page_numbers=[1, 2, 4, 5]))
+    assert texts == ["page 1", "page 2", "page 4", "page 5"]
+
+
+def test_shutdown_resets_the_pool(fresh_pool):
+    first = ocr_service.get_process_pool()
+    assert ocr_service.get_process_pool() is first
+    ocr_service.shutdown_ocr_workers()
+    assert ocr_service._process_pool is None
+    assert ocr_service.get_process_pool() is not first
@@ -0,0 +1,55 @@
+from backend.app.services import ocr_service
+
+
+def test_only_pages_without_text_are_ocrd(monkeypatch):
+    layer = ["Glucose: 110 mg/dL fasting sample collected", "", "   \n", "Cholesterol: 180 mg/dL total lipid panel"]
+    ocr_calls = []
+
+    def fake_ocr(pdf_path, page_numbers=None, **kwargs):
+        ocr_calls.append(list(page_numbers))
+        return iter([f"ocr page {n}" for n in page_numbers])
+
+    monkeypatch.setattr(ocr_service, "pdf_page_count", lambda path, poppler_path=None: 4)
+    monkeypatch.setattr(ocr_service, "extract_text_layer", lambda path, poppler_path=None: layer)
+    monkeypatch.setattr(ocr_service, "iter_ocr_pdf_file", fake_ocr)
+
+    results = ocr_service.read_pdf("report.pdf", use_text_layer=True)
+
+    assert ocr_calls == [[2, 3]]
+    assert [source for _, source in results] == ["text_layer", "ocr", "ocr", "text_layer"]
+    assert results[1][0] == "ocr page 2"
+
+
+def test_falls_back_to_ocr_when_text_layer_unavailable(monkeypatch):
+    monkeypatch.setattr(ocr_service, "pdf_page_count", lambda path, poppler_path=None: 2)
+    monkeypatch.setattr(ocr_service, "extract_text_layer", lambda path, poppler_path=None: None)
+    monkeypatch.setattr(
+        ocr_service, "iter_ocr_pdf_file",
+        lambda pdf_path, page_numbers=None, **kwargs: iter(["a" for _ in page_numbers]),
+    )
+
+    results = ocr_service.read_pdf("scan.pdf", use_text_layer=True)
+    assert [source for _, source in results] == ["ocr", "ocr"]
+
+
+def test_easyocr_pdf_pages_are_read_in_batched_groups(monkeypatch):
+    from PIL import Image
+
+    batches = []
+
+    def fake_read_pages(images):
+        batches.append([image.info["page"] for image in images])
+        return [f"page {image.info['page']}" for image in images]
+
+    def fake_rasterize(pdf_path, page_number, dpi, poppler_path=None):
+        image = Image.new("L", (10, 10))
+        image.info["page"] = page_number
+        return image
+
+    monkeypatch.setattr(ocr_service.settings, "EASYOCR_PDF_PAGE_GROUP", 2)
+    monkeypatch.setattr(ocr_service, "rasterize_page", fake_rasterize)
+    monkeypatch.setattr(ocr_service.easyocr_pool, "read_pages", fake_read_pages)
+
+    texts = ocr_service.ocr_pdf_file("scan.pdf", use_easyocr=True, page_numbers=[1, 3, 4, 6, 7])
+    assert texts == ["page 1", "page 3", "page 4", "page 6", "page 7"]
+    assert batches == [[1, 3], [4, 6], [7]]
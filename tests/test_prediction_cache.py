@@ -0,0 +1,51 @@
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from backend.app.ml.prediction_cache import PredictionCache, canonical_symptoms
+
+
+def test_texts_sharing_a_key_get_the_same_prediction():
+    assert canonical_symptoms("Fever, COUGH and cough") == canonical_symptoms("cough and fever cough") == "and cough cough fever"
+    assert canonical_symptoms("fever cough") != canonical_symptoms("fever cough cough")  # term counts matter
+    assert canonical_symptoms("  ?  ") == ""
+
+    train = ["fever cough headache", "cough sore throat", "itching skin rash", "fever fever chills", "rash and fever"]
+    vectorizer = TfidfVectorizer().fit(train)
+    model = RandomForestClassifier(n_estimators=20, random_state=0).fit(
+        vectorizer.transform(train), ["flu", "cold", "allergy", "malaria", "measles"]
+    )
+    for text in ["Fever, COUGH and cough!", "rash; fever... rash", "sore THROAT cough cough"]:
+        original = vectorizer.transform([text])
+        keyed = vectorizer.transform([canonical_symptoms(text)])
+        assert (original != keyed).nnz == 0
+        assert (model.predict_proba(original) == model.predict_proba(keyed)).all()
+
+
+def test_lru_eviction_and_saved_time():
+    cache = PredictionCache(max_entries=2)
+    calls = []
+
+    def compute(value):
+        return lambda: calls.append(value) or value
+
+    assert cache.predict("a", "v1", compute("flu")) == "flu"
+    assert cache.predict("b", "v1", compute("cold")) == "cold"
+    assert cache.predict("a", "v1", compute("other")) == "flu"  # hit, "a" now most recent
+    cache.predict("c", "v1", compute("malaria"))  # evicts "b"
+    assert cache.get("b", "v1") is None
+    assert calls == ["flu", "cold", "malaria"]
+
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 4 and stats["evictions"] == 1
+    assert stats["hit_ratio"] == 0.2
+    assert stats["saved_inference_ms"] >= 0
+
+
+def test_model_version_change_invalidates():
+    cache = PredictionCache()
+    cache.predict("fever", "v1", lambda: "flu")
+    assert cache.get("fever", "v1") == "flu"
+    assert cache.get("fever", "v2") is None
+    cache.put("fever", "v1", "flu", 0.01)  # late result from the old version is dropped
+    assert cache.get("fever", "v2") is None
+    assert cache.stats()["invalidations"] == 1
@@ -0,0 +1,34 @@
+from backend.app.utils.reference_ranges import REFERENCE_RANGES, RuleEngine, rule_engine
+
+
+def types(findings):
+    return {f["type"]: f["message"] for f in findings}
+
+
+def test_sex_and_age_specific_ranges():
+    values = {"hemoglobin": 13.0, "creatinine": 1.2, "hdl": 45.0}
+    general, male, female = rule_engine.evaluate([values] * 3, sexes=[None, "Male", "F"], ages=[None, 40, 40])
+    assert rule_engine.evaluate([values], sexes=["Male"], ages=[40]) == [male]
+    assert general == []
+    assert types(male) == {"hemoglobin": "Hemoglobin 13.0 → Possible anemia risk"}
+    assert set(types(female)) == {"creatinine", "hdl"}
+
+
+def test_age_band_without_age_uses_general_row():
+    child_values = {"cholesterol": 180.0, "wbc": 13000.0}
+    adult, child = rule_engine.evaluate([child_values] * 2, ages=[None, 8])
+    assert set(types(adult)) == {"wbc"}
+    assert set(types(child)) == {"cholesterol"}
+    assert rule_engine.evaluate([child_values], ages=[8]) == [child]
+
+
+def test_batch_matches_one_by_one_and_keeps_order():
+    reports = [{"glucose": 150.0}, {}, {"tsh": 6.2, "glucose": 60.0}, {"ldl": 90.0}]
+    batch = rule_engine.evaluate(reports)
+    assert batch == [rule_engine.evaluate([report])[0] for report in reports]
+    assert [f["type"] for f in batch[2]] == ["glucose", "tsh"]  # table order
+
+
+def test_new_analyte_is_a_table_row():
+    engine = RuleEngine(REFERENCE_RANGES + [("ferritin", "ng/mL", "any", None, None, 30, 400, "Low iron stores", "High ferritin")])
+    assert engine.evaluate([{"ferritin": 12.0}])[0][0]["message"] == "ferritin 12.0 → Low iron stores"
@@ -1,3 +1,5 @@
+import pytest
+
 from backend.app.utils.report_analyzer import analyze_report
 
 def test_normal_values():
@@ -18,4 +20,67 @@ def test_abnormal_glucose():
 def test_abnormal_hemoglobin():
     data = {"hemoglobin": "10 g/dL"}
     result = analyze_report(data)
-    assert any(f["type"] == "hemoglobin" and f["is_abnormal"] for f in result)
\ No newline at end of file
+    assert any(f["type"] == "hemoglobin" and f["is_abnormal"] for f in result)
+
+
+def test_mixed_units_use_canonical_thresholds():
+    # 7.8 mmol/L is ~140 mg/dL: high, not hypoglycemic
+    result = analyze_report({"glucose": {"value": 7.8, "unit": "mmol/l"}, "hemoglobin": "95 g/L"})
+    glucose = next(f for f in result if f["type"] == "glucose")
+    assert "diabetes" in glucose["message"]
+    assert any(f["type"] == "hemoglobin" and f["value"] == 9.5 for f in result)
+
+
+@pytest.fixture
+def trained_classifier(monkeypatch):
+    """Small stand-in for ml/models/report_classifier.pkl, fitted on a DataFrame like the real one."""
+    import numpy as np
+    import pandas as pd
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.multioutput import MultiOutputClassifier
+    from sklearn.preprocessing import MultiLabelBinarizer
+    from backend.app.utils import report_analyzer
+
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame({
+        "glucose": rng.uniform(60, 250, 300),
+        "hemoglobin": rng.uniform(8, 18, 300),
+        "cholesterol": rng.uniform(120, 320, 300),
+        "wbc": rng.uniform(3000, 15000, 300),
+    })
+    labels = [(["diabetes"] if g > 126 else []) + (["anemia"] if hb < 12 else []) for g, hb in zip(X.glucose, X.hemoglobin)]
+    mlb = MultiLabelBinarizer()
+    model = MultiOutputClassifier(RandomForestClassifier(n_estimators=10, random_state=42)).fit(X, mlb.fit_transform(labels))
+
+    monkeypatch.setattr(report_analyzer.report_model, "_current", ("test", {"model": model, "mlb": mlb, "flat_model": None}))
+    return report_analyzer
+
+
+def test_batch_inference_matches_single_report(trained_classifier):
+    reports = [
+        {"glucose": {"value": 210.0, "unit": "mg/dl"}, "hemoglobin": {"value": 9.0, "unit": "g/dl"}},
+        {"glucose": {"value": 90.0, "unit": "mg/dl"}},
+        {},
+        {"glucose": "12 mmol/L"},
+    ]
+    batch = trained_classifier.analyze_reports_batch(reports)
+    assert batch == [analyze_report(report) for report in reports]
+    assert {f["type"] for f in batch[0]} == {"diabetes", "anemia"}
+    assert {f["type"]: f["value"] for f in batch[0]} == {"diabetes": 210.0, "anemia": 9.0}
+    assert batch[2][0]["is_abnormal"] is False
+    assert trained_classifier.analyze_reports_batch([]) == []
+
+
+def test_bad_report_only_fails_its_own_caller(trained_classifier):
+    good = {"glucose": {"value": 210.0, "unit": "mg/dl"}}
+    results = trained_classifier._analyze_micro_batch([(good, None, None), ({"glucose": {"value": "n/a"}}, None, None)])
+    assert results[0] == analyze_report(good)
+    assert isinstance(results[1], trained_classifier.ItemError)
+
+
+def test_feature_name_warning_is_silenced_only_around_predict(trained_classifier, recwarn):
+    import warnings
+
+    trained_classifier.analyze_reports_batch([{"glucose": {"value": 210.0, "unit": "mg/dl"}}] * 200)  # sklearn path
+    assert not [w for w in recwarn if "valid feature names" in str(w.message)]
+    assert not any(f[1] is not None and f[1].pattern.startswith("X does not have") for f in warnings.filters)
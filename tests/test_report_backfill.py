@@ -0,0 +1,67 @@
+import json
+
+import pytest
+from sqlalchemy import create_engine, insert, select
+
+from backend.app.db.base import Base
+from backend.app.db.models import Patient, ReportLog
+from backend.app.services.report_backfill import load_checkpoint, run_backfill
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'reports.db'}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(ReportLog.__table__), [
+            {"filename": f"r{i}.pdf", "raw_text": f"Glucose: {7 + i} mmol/L", "structured_output": "{}", "analysis": "[]"}
+            for i in range(7)
+        ])
+    return engine
+
+
+def structured_by_id(engine):
+    table = ReportLog.__table__
+    with engine.connect() as conn:
+        rows = conn.execute(select(table.c.id, table.c.structured_output).order_by(table.c.id))
+        return {row_id: json.loads(output) for row_id, output in rows}
+
+
+def test_backfill_resumes_from_checkpoint(engine, tmp_path):
+    checkpoint = str(tmp_path / "checkpoint.json")
+
+    state = run_backfill(engine, batch_size=3, checkpoint_path=checkpoint, max_batches=1)
+    assert state["last_id"] == 3
+    assert load_checkpoint(checkpoint)["last_id"] == 3
+    outputs = structured_by_id(engine)
+    assert outputs[1]["glucose"]["unit"] == "mg/dl"
+    assert outputs[4] == {}
+
+    state = run_backfill(engine, batch_size=3, checkpoint_path=checkpoint)
+    assert state == {"last_id": 7, "rows_read": 7, "rows_updated": 7}
+    assert all(output["glucose"]["reported"]["unit"] == "mmol/l" for output in structured_by_id(engine).values())
+
+
+def test_backfill_process_pool_and_dry_run(engine, tmp_path):
+    checkpoint = str(tmp_path / "checkpoint.json")
+
+    run_backfill(engine, batch_size=2, checkpoint_path=checkpoint, dry_run=True)
+    assert set(map(json.dumps, structured_by_id(engine).values())) == {"{}"}
+
+    state = run_backfill(engine, batch_size=2, workers=2, checkpoint_path=checkpoint)
+    assert state["rows_updated"] == 7
+    assert structured_by_id(engine)[7]["glucose"]["value"] == round(13 * 18.016, 2)
+
+
+def test_backfill_uses_patient_sex_and_age(engine, tmp_path):
+    with engine.begin() as conn:
+        patient_id = conn.execute(insert(Patient.__table__).values(name="A", age=40, gender="Male")).inserted_primary_key[0]
+        conn.execute(insert(ReportLog.__table__).values(filename="hb.pdf", raw_text="Hemoglobin 13.0 g/dL", patient_id=patient_id))
+        conn.execute(insert(ReportLog.__table__).values(filename="hb2.pdf", raw_text="Hemoglobin 13.0 g/dL"))
+
+    run_backfill(engine, batch_size=100, checkpoint_path=str(tmp_path / "checkpoint.json"))
+    table = ReportLog.__table__
+    with engine.connect() as conn:
+        analyses = [json.loads(a) for (a,) in conn.execute(select(table.c.analysis).where(table.c.id > 7).order_by(table.c.id))]
+    assert analyses[0][0]["type"] == "hemoglobin"  # below the adult male range
+    assert analyses[1][0]["is_abnormal"] is False  # within the general range
@@ -0,0 +1,92 @@
+import json
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.app.db import log_sink
+from backend.app.db.base import Base
+from backend.app.db.models import Patient, ReportLog
+from backend.app.ml.batcher import MicroBatcher
+from backend.app.services import report_pipeline
+
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'reports.db'}")
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(log_sink, "SessionLocal", factory)
+    monkeypatch.setattr(report_pipeline, "SessionLocal", factory)
+    sink = MicroBatcher("test_sink", log_sink._write_rows, max_batch_size=100, window_ms=50, enabled=True)
+    monkeypatch.setattr(log_sink, "log_sink", sink)
+    yield factory
+    sink.stop()
+
+
+def spooled(tmp_path, files: dict) -> list[tuple[str, str, str]]:
+    batch = []
+    for name, text in files.items():
+        path = tmp_path / name
+        path.write_text(text)
+        batch.append((str(path), name, f"digest-{name}"))
+    return batch
+
+
+def test_bad_file_fails_alone_and_logs_map_back_in_order(session_factory, tmp_path, monkeypatch):
+    def fake_extract(path, filename, digest, use_easyocr=False):
+        with open(path) as f:
+            text = f.read()
+        if text == "corrupt":
+            raise ValueError("cannot read image")
+        return text, [{"page": 1, "source": "ocr"}]
+
+    commits = []
+    commit = log_sink._commit
+
+    def counting_commit(rows):
+        commits.append([row.filename for row in rows])
+        commit(rows)
+
+    monkeypatch.setattr(report_pipeline, "extract_text_from_path", fake_extract)
+    monkeypatch.setattr(log_sink, "_commit", counting_commit)
+    with session_factory() as db:
+        patient = Patient(name="Asha", age=52, gender="Female")
+        db.add(patient)
+        db.commit()
+        patient_id = patient.id
+
+    files = spooled(tmp_path, {
+        "glucose.png": "Glucose: 180 mg/dL",
+        "broken.png": "corrupt",
+        "hemoglobin.png": "Hemoglobin 10.5 g/dL",
+    })
+    results = report_pipeline.process_report_batch(files, patient_id=patient_id)
+
+    assert [r["filename"] for r in results] == ["glucose.png", "broken.png", "hemoglobin.png"]
+    assert [r["status"] for r in results] == ["ok", "error", "ok"]
+    assert results[1]["error"] == "cannot read image" and "log_id" not in results[1]
+    assert commits == [["glucose.png", "hemoglobin.png"]]  # one write_all transaction
+
+    with session_factory() as db:
+        for result in (results[0], results[2]):
+            log = db.get(ReportLog, result["log_id"])
+            assert log.filename == result["filename"]
+            assert log.patient_id == patient_id
+            assert json.loads(log.structured_output) == result["structured_output"]
+    assert "glucose" in results[0]["structured_output"]
+    assert "hemoglobin" in results[2]["structured_output"]
+
+
+def test_failed_commit_stores_none_of_the_batch(session_factory, tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        report_pipeline, "extract_text_from_path",
+        lambda path, filename, digest, use_easyocr=False: ("Glucose: 99 mg/dL", []),
+    )
+    files = spooled(tmp_path, {"a.png": "", "b.png": ""})
+    files[1] = (files[1][0], None, files[1][2])  # filename is NOT NULL: the second insert fails
+
+    with pytest.raises(Exception):
+        report_pipeline.process_report_batch(files)
+    with session_factory() as db:
+        assert db.query(ReportLog).count() == 0
@@ -0,0 +1,29 @@
+from types import SimpleNamespace
+
+from backend.app.services import report_pipeline
+
+
+def test_partial_events_merge_fields_page_by_page(monkeypatch):
+    pages = [
+        "Glucose: 110 mg/dL fasting sample",
+        "Hemoglobin 13.5 g/dL",
+        "Glucose repeat 150 mg/dL, Cholesterol 180 mg/dL",
+    ]
+    monkeypatch.setattr(report_pipeline.settings, "OCR_CACHE_ENABLED", False)
+    monkeypatch.setattr(report_pipeline, "iter_pdf", lambda path, use_easyocr=False: (
+        (number, text, "text_layer") for number, text in enumerate(pages, start=1)
+    ))
+    monkeypatch.setattr(report_pipeline, "patient_profile", lambda patient_id: {})
+    monkeypatch.setattr(
+        report_pipeline, "save_report_log",
+        lambda filename, raw_text, cleaned, structured, results, patient_id: SimpleNamespace(id=1, patient_id=patient_id),
+    )
+
+    events = list(report_pipeline.stream_report_file("report.pdf", "report.pdf", "digest"))
+    partials = [data["structured_output"] for event, data in events if event == "partial"]
+    assert [sorted(fields) for fields in partials] == [
+        ["glucose"], ["glucose", "hemoglobin"], ["cholesterol", "glucose", "hemoglobin"]
+    ]
+    assert partials[-1]["glucose"]["value"] == 110.0  # first mention wins, as for the whole text
+    analysis = next(data for event, data in events if event == "analysis")
+    assert partials[-1] == analysis["structured_output"]
@@ -0,0 +1,75 @@
+from backend.app.utils import text_cleaner
+from backend.app.utils.text_cleaner import (
+    clean_text,
+    clean_texts,
+    extract_structured_fields,
+    extract_structured_fields_many,
+    from_columns,
+)
+
+
+def extract(raw):
+    return extract_structured_fields(clean_text(raw))
+
+
+def test_original_fields_still_extracted():
+    data = extract("Glucose: 180 mg/dL\nHemoglobin 10.5 g/dL\nCholesterol - 240 mg/dl")
+    assert data["glucose"] == {"value": 180.0, "unit": "mg/dl"}
+    assert data["hemoglobin"] == {"value": 10.5, "unit": "g/dl"}
+    assert data["cholesterol"] == {"value": 240.0, "unit": "mg/dl"}
+
+
+def test_extended_analytes():
+    data = extract("WBC: 12500 cells/uL  HbA1c 7.2 %  Creatinine 1.3 mg/dL  TSH 4.1 uIU/mL  Triglycerides 210 mg/dL")
+    assert data["wbc"]["value"] == 12500.0
+    assert data["hba1c"] == {"value": 7.2, "unit": "%"}
+    assert data["creatinine"]["value"] == 1.3
+    assert data["tsh"]["value"] == 4.1
+    assert data["triglycerides"]["value"] == 210.0
+    assert "hemoglobin" not in data  # "hba1c" must not be read as "hb"
+
+
+def test_lipid_aliases_do_not_steal_values():
+    data = extract("Total Cholesterol 220 mg/dL HDL Cholesterol 38 mg/dL LDL Cholesterol 160 mg/dL")
+    assert data["cholesterol"]["value"] == 220.0
+    assert data["hdl"]["value"] == 38.0
+    assert data["ldl"]["value"] == 160.0
+
+
+def test_first_mention_wins_and_unknown_unit():
+    data = extract("glucose 95 glucose 300 mg/dl")
+    assert data["glucose"] == {"value": 95.0, "unit": "unknown"}
+
+
+def test_alias_without_value_is_skipped():
+    assert extract("Glucose: pending, Hemoglobin: 13 g/dL") == {"hemoglobin": {"value": 13.0, "unit": "g/dl"}}
+
+
+def test_batch_matches_single_document_path():
+    raw = ["Glucose: 180 mg/dL", "Hemoglobin\t10.5 g / dL", "nothing here", "Café HbA1c 7.2 %"]
+    cleaned = clean_texts(raw)
+    assert cleaned == [clean_text(text) for text in raw]
+
+    columns = extract_structured_fields_many(cleaned)
+    assert columns["glucose"]["value"] == [180.0, None, None, None]
+    assert columns["hba1c"]["unit"] == [None, None, None, "%"]
+    assert from_columns(columns) == [extract_structured_fields(text) for text in cleaned]
+
+
+def test_batch_process_pool_keeps_order():
+    raw = [f"Glucose {i} mg/dL" for i in range(40)]
+    cleaned = clean_texts(raw, workers=2, parallel_min=10)
+    pool = text_cleaner._process_pools[2]
+    columns = extract_structured_fields_many(cleaned, workers=2, parallel_min=10)
+    assert columns["glucose"]["value"] == [float(i) for i in range(40)]
+    assert text_cleaner._process_pools[2] is pool  # started once, reused by the next batch
+    text_cleaner.shutdown_batch_workers()
+    assert text_cleaner._process_pools == {}
+
+
+def test_values_converted_to_canonical_units():
+    data = extract("Glucose 7.0 mmol/L Hemoglobin 135 g/L WBC 12.5 x10^3/uL HbA1c 53 mmol/mol")
+    assert data["glucose"] == {"value": 126.11, "unit": "mg/dl", "reported": {"value": 7.0, "unit": "mmol/l"}}
+    assert data["hemoglobin"]["value"] == 13.5
+    assert data["wbc"]["value"] == 12500.0
+    assert data["hba1c"] == {"value": 7.0, "unit": "%", "reported": {"value": 53.0, "unit": "mmol/mol"}}
@@ -0,0 +1,58 @@
+import asyncio
+import hashlib
+
+import pytest
+from fastapi import HTTPException
+
+from backend.app.api import uploads
+
+
+class FakeUpload:
+    """Just enough of UploadFile: async read(size) over in-memory bytes, recording each read."""
+
+    def __init__(self, data: bytes, filename: str = "scan.pdf"):
+        self.data = data
+        self.filename = filename
+        self.reads = []
+
+    async def read(self, size: int = -1) -> bytes:
+        self.reads.append(size)
+        chunk = self.data[:size] if size >= 0 else self.data
+        self.data = self.data[len(chunk):]
+        return chunk
+
+
+@pytest.fixture
+def small_limits(monkeypatch, tmp_path):
+    monkeypatch.setattr(uploads.settings, "MAX_UPLOAD_MB", 1)
+    monkeypatch.setattr(uploads.settings, "UPLOAD_CHUNK_KB", 64)
+    monkeypatch.setattr(uploads.settings, "UPLOAD_SPOOL_DIR", str(tmp_path))
+    return tmp_path
+
+
+def test_spool_upload_copies_in_chunks_and_returns_digest(small_limits):
+    data = bytes(range(256)) * 3000  # 750 KB
+    upload = FakeUpload(data)
+    path, digest = asyncio.run(uploads.spool_upload(upload))
+
+    assert path.startswith(str(small_limits)) and path.endswith(".pdf")
+    with open(path, "rb") as f:
+        assert f.read() == data
+    assert digest == hashlib.sha256(data).hexdigest()
+    assert set(upload.reads) == {64 * 1024}  # never the whole file at once
+
+
+def test_spool_upload_over_the_limit_is_413_and_leaves_no_file(small_limits):
+    upload = FakeUpload(b"x" * (1024 * 1024 + 1))
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(uploads.spool_upload(upload))
+    assert exc.value.status_code == 413
+    assert list(small_limits.iterdir()) == []
+    assert len(upload.reads) == 17  # stopped at the chunk that crossed 1 MB
+
+
+def test_read_upload_enforces_the_same_limit(small_limits):
+    assert asyncio.run(uploads.read_upload(FakeUpload(b"x" * 1024 * 1024))) == b"x" * 1024 * 1024
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(uploads.read_upload(FakeUpload(b"x" * (1024 * 1024 + 1))))
+    assert exc.value.status_code == 413